@@ -0,0 +1,12 @@
+def main() -> None:
+    # Só gera/atualiza o artefato de agregados (outputs/trips_2025_aggregates.json):
+    # EDA, gráficos e relatório leem dele. Fonte: CSV limpo ou, com
+    # CYCLISTIC_SOURCE=monthly, os meses em data_raw/ (só os alterados são relidos).
+    from agg_store import AGG_PATH, load_aggregates, thousands
+
+    agg = load_aggregates()
+    print(f"✅ Agregados: {AGG_PATH} ({thousands(agg['rows'])} viagens)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,35 @@
-import pandas as pd
-from pathlib import Path
+def main() -> None:
+    from agg_store import load_aggregates
+    from trip_aggregates import (
+        ride_counts,
+        avg_duration_by_member,
+        duration_quantiles,
+        hour_member_matrix,
+    )
 
-DATA_PATH = Path("outputs/trips_2025_clean.csv")
+    # Agregados calculados numa única leitura de outputs/trips_2025_clean.csv
+    # (salvos em outputs/trips_2025_aggregates.json e reutilizados pelos gráficos)
+    agg = load_aggregates()
 
-cols = ["member_casual", "ride_length_sec", "day_of_week"]
-df = pd.read_csv(DATA_PATH, usecols=cols)
+    print("Fonte:", agg["source"])
+    print("Viagens:", agg["rows"])
 
-df.info()
+    print("\nDistribuição:")
+    print(ride_counts(agg))
 
-print("\nDistribuição:")
-print(df["member_casual"].value_counts())
+    print("\nDuração média:")
+    print(avg_duration_by_member(agg))
 
-print("\nDuração média:")
-print(df.groupby("member_casual")["ride_length_sec"].mean())
+    # a média é puxada por viagens muito longas: mediana e percentis (sketch, erro de rank ~1%)
+    print("\nDuração (min) — p50/p90/p99 por tipo de usuário:")
+    print((duration_quantiles(agg, "member_casual") / 60).round(1))
 
-# Carregar hora também
-cols = ["member_casual", "ride_length_sec", "day_of_week", "started_at"]
-df = pd.read_csv("outputs/trips_2025_clean.csv", usecols=cols)
+    print("\nDuração (min) — p50/p90/p99 por dia da semana:")
+    print((duration_quantiles(agg, "day_of_week") / 60).round(1))
 
-df["started_at"] = pd.to_datetime(df["started_at"])
-df["hour"] = df["started_at"].dt.hour
+    print("\nUso por hora:")
+    print(hour_member_matrix(agg))
 
-print("\nUso por hora:")
-print(
-    df.groupby(["hour", "member_casual"])
-      .size()
-      .unstack()
-)
 
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,32 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+import sys
 from pathlib import Path
 
-DATA_PATH = Path("outputs/trips_2025_clean.csv")
-
-# Carregar apenas colunas necessárias
-cols = ["member_casual", "ride_length_sec", "day_of_week", "started_at"]
-df = pd.read_csv(DATA_PATH, usecols=cols)
-
-df["started_at"] = pd.to_datetime(df["started_at"])
-df["hour"] = df["started_at"].dt.hour
-
-# ==============================
-# 1) Duração média
-# ==============================
-avg_duration = df.groupby("member_casual")["ride_length_sec"].mean() / 60
-
-plt.figure(figsize=(6,4))
-avg_duration.plot(kind="bar")
-plt.title("Duração média (minutos)")
-plt.ylabel("Minutos")
-plt.xticks(rotation=0)
-plt.tight_layout()
-plt.savefig("outputs/duracao_media.png")
-plt.close()
-
-# ==============================
-# 2) Uso por hora
-# ==============================
-hour_usage = df.groupby(["hour", "member_casual"]).size().unstack()
-
-plt.figure(figsize=(10,5))
-hour_usage.plot()
-plt.title("Uso por Hora do Dia")
-plt.xlabel("Hora")
-plt.ylabel("Quantidade de Viagens")
-plt.tight_layout()
-plt.savefig("outputs/uso_por_hora.png")
-plt.close()
-
-# ==============================
-# 3) Uso por dia da semana
-# ==============================
-weekday_usage = df.groupby(["day_of_week", "member_casual"]).size().unstack()
-
-# Reordenar dias
-order = ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
-weekday_usage = weekday_usage.reindex(order)
-
-plt.figure(figsize=(8,5))
-weekday_usage.plot(kind="bar")
-plt.title("Uso por Dia da Semana")
-plt.ylabel("Quantidade de Viagens")
-plt.xticks(rotation=45)
-plt.tight_layout()
-plt.savefig("outputs/uso_por_dia.png")
-plt.close()
-
-print("Gráficos salvos na pasta outputs.")
+OUT_DIR = Path("outputs")
+
+# raiz do repositório (pasta common/ compartilhada entre os estudos de caso)
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+
+def main() -> None:
+    # agregados prontos (não relê as viagens se o artefato estiver atualizado)
+    from agg_store import load_aggregates
+    from report_charts import chart_jobs
+    from common.charts import render_charts
+
+    OUT_DIR.mkdir(exist_ok=True)
+    agg = load_aggregates()
+
+    # ==============================
+    # Duração média, uso por hora, uso por dia da semana e distribuição da duração
+    # (as mesmas funções de report_charts.py geram os gráficos do relatório);
+    # desenhados em paralelo, só os que tiveram os dados alterados
+    # ==============================
+    status = render_charts(list(chart_jobs(agg, OUT_DIR).values()))
+    for name, st in status.items():
+        print(f"  {name}: {st}")
+
+    print("Gráficos salvos na pasta outputs.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+import hashlib
+import json
+import re
+import struct
+import sys
+import time
+from html import escape
+from importlib.metadata import version
+from pathlib import Path
+
+# raiz do repositório (pasta common/ compartilhada entre os estudos de caso)
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+# só leitura do artefato aqui: pandas/matplotlib entram apenas se o relatório for refeito
+from agg_store import load_aggregates, thousands
+
+OUT_DIR = Path("outputs")
+REPORT_PATH = OUT_DIR / "relatorio_cyclistic.html"
+# imagens com hash do conteúdo no nome: mudou o gráfico, muda o arquivo (sem cache velho no navegador)
+ASSETS_DIR = OUT_DIR / "report_assets"
+
+# hash dos agregados + do código que gera texto e imagens, gravado no próprio HTML
+HASH_META = "aggregates-hash"
+SRC_DIR = Path(__file__).resolve().parent
+COMMON_DIR = SRC_DIR.parents[1] / "common"
+REPORT_SOURCES = [
+    SRC_DIR / "05_report.py",
+    SRC_DIR / "report_charts.py",
+    SRC_DIR / "trip_aggregates.py",
+    COMMON_DIR / "charts.py",
+    COMMON_DIR / "density.py",
+    COMMON_DIR / "sketches.py",
+]
+# bibliotecas que desenham as imagens (versão lida dos metadados, sem importar)
+REPORT_LIBS = ["matplotlib"]
+WEEKEND = ["Saturday", "Sunday"]
+# horários de deslocamento casa–trabalho (commute)
+COMMUTE_HOURS = [7, 8, 9, 16, 17, 18]
+COMMUTE_LABEL = "7–9h e 16–18h"
+# diferenças menores que isso não viram conclusão no texto (pontos percentuais / minutos)
+MIN_SHARE_GAP = 1.0
+MIN_DURATION_GAP = 1.0
+
+
+# ==============================
+# Regenerar só quando os agregados (ou o código/bibliotecas do relatório) mudarem
+# ==============================
+def report_hash(agg: dict) -> str:
+    h = hashlib.sha256(json.dumps(agg, sort_keys=True).encode("utf-8"))
+    for source in REPORT_SOURCES:
+        h.update(source.read_bytes())
+    for lib in REPORT_LIBS:
+        h.update(f"{lib}={version(lib)}".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def is_current(digest: str, report_path: Path = REPORT_PATH) -> bool:
+    """Relatório existe, foi gerado com o mesmo hash e todas as imagens citadas ainda existem."""
+    if not report_path.exists():
+        return False
+    html = report_path.read_text(encoding="utf-8")
+    stamp = re.search(rf'<meta name="{HASH_META}" content="([0-9a-f]+)">', html)
+    images = re.findall(r'<img src="([^"]+)"', html)
+    return (
+        stamp is not None
+        and stamp.group(1) == digest
+        and all((report_path.parent / src).exists() for src in images)
+    )
+
+
+def write_chart(name: str, png: bytes) -> tuple:
+    """Grava o PNG como <nome>-<hash>.png (remove versões antigas); devolve (caminho relativo, largura, altura)."""
+    ASSETS_DIR.mkdir(parents=True, exist_ok=True)
+    path = ASSETS_DIR / f"{name}-{hashlib.sha256(png).hexdigest()[:12]}.png"
+    for old in ASSETS_DIR.glob(f"{name}-*.png"):
+        if old != path:
+            old.unlink()
+    if not path.exists():
+        # o nome já diz que o arquivo está atualizado: nunca pode ficar pela metade
+        from common.charts import write_atomic
+
+        write_atomic(path, png)
+    # largura/altura do cabeçalho IHDR: o navegador reserva o espaço antes de carregar (lazy)
+    width, height = struct.unpack(">II", png[16:24])
+    return path.relative_to(OUT_DIR).as_posix(), width, height
+
+
+# ==============================
+# Números do texto (tudo vem do artefato de agregados)
+# ==============================
+def insights(agg: dict) -> dict:
+    from trip_aggregates import (
+        WEEKDAY_ORDER,
+        avg_duration_by_member,
+        duration_quantiles,
+        hour_member_matrix,
+        ride_counts,
+        weekday_member_matrix,
+    )
+
+    avg_min = avg_duration_by_member(agg) / 60
+    median_min = duration_quantiles(agg, "member_casual")["p50"] / 60
+    hours = hour_member_matrix(agg)
+    weekdays = weekday_member_matrix(agg).reindex(WEEKDAY_ORDER).fillna(0)
+    weekend_share = weekdays.loc[WEEKEND].sum() / weekdays.sum() * 100
+    commute_share = hours.reindex(COMMUTE_HOURS).sum() / hours.sum() * 100
+    return {
+        "rides": ride_counts(agg),
+        "avg_min": avg_min,
+        "median_min": median_min,
+        "longest": avg_min.idxmax(),
+        "shortest": avg_min.idxmin(),
+        # duas horas de maior uso por tipo de usuário
+        "peaks": {m: sorted(hours[m].nlargest(2).index) for m in hours.columns},
+        "weekend_share": weekend_share,
+        "commute_share": commute_share,
+        # quem mais usa nos horários de deslocamento / no fim de semana
+        "commuter": commute_share.idxmax(),
+        "leisure": weekend_share.idxmax(),
+    }
+
+
+def _per_member(values, fmt: str) -> str:
+    return " vs ".join(f"<b>{escape(str(m))}</b> {fmt.format(v)}" for m, v in values.items())
+
+
+def _name(member) -> str:
+    return f"<b>{escape(str(member))}</b>"
+
+
+def _gap(values) -> float:
+    return float(values.max() - values.min())
+
+
+# ==============================
+# Interpretação (tirada dos números; muda junto com os dados)
+# ==============================
+def profile_text(info: dict) -> str:
+    if len(info["rides"]) < 2:
+        return "só há um tipo de usuário nos dados, então não há perfis para comparar."
+    commuter, leisure = info["commuter"], info["leisure"]
+    if _gap(info["commute_share"]) < MIN_SHARE_GAP and _gap(info["weekend_share"]) < MIN_SHARE_GAP:
+        return (
+            f"os tipos de usuário têm quase a mesma fatia de viagens em {COMMUTE_LABEL} e no fim de semana: "
+            "os dados não separam um perfil de transporte de um de lazer."
+        )
+    if commuter == leisure:
+        return (
+            f"{_name(commuter)} lidera tanto nos horários de deslocamento ({COMMUTE_LABEL}) quanto no "
+            "fim de semana: os dados não separam um perfil de transporte de um de lazer."
+        )
+    return (
+        f"{_name(commuter)} usa mais como transporte (mais viagens em {COMMUTE_LABEL}); "
+        f"{_name(leisure)} usa mais como lazer (mais viagens no fim de semana). "
+        "Isso direciona campanhas diferentes."
+    )
+
+
+def duration_text(info: dict) -> str:
+    if _gap(info["avg_min"]) < MIN_DURATION_GAP:
+        return "a duração média é parecida entre os tipos de usuário: ela sozinha não distingue lazer de deslocamento."
+    return (
+        f"as viagens mais longas de {_name(info['longest'])} sugerem lazer e as mais curtas de "
+        f"{_name(info['shortest'])} sugerem deslocamento."
+    )
+
+
+def hours_text(info: dict) -> str:
+    peaks = "; ".join(f"{_name(m)} às {h[0]}h e {h[1]}h" for m, h in info["peaks"].items() if len(h) == 2)
+    text = (
+        f"picos de uso: {peaks}. As faixas de commute ({COMMUTE_LABEL}) concentram "
+        f"{_per_member(info['commute_share'], '{:.0f}%')} das viagens"
+    )
+    if _gap(info["commute_share"]) < MIN_SHARE_GAP:
+        return text + "."
+    return text + f" — uso de commute mais forte em {_name(info['commuter'])}."
+
+
+def weekday_text(info: dict) -> str:
+    # 2 de 7 dias: ~29% das viagens cairiam no fim de semana se o uso fosse uniforme
+    uniform = len(WEEKEND) / 7 * 100
+
+    def versus(share: float) -> str:
+        if abs(share - uniform) < MIN_SHARE_GAP:
+            return "perto"
+        return "acima" if share > uniform else "abaixo"
+
+    parts = [
+        f"{_name(m)} {share:.0f}% ({versus(share)} dos {uniform:.0f}% de um uso uniforme)"
+        for m, share in info["weekend_share"].items()
+    ]
+    text = f"fim de semana: {'; '.join(parts)}."
+    if _gap(info["weekend_share"]) < MIN_SHARE_GAP:
+        return text
+    return text + f" O maior peso no fim de semana é de {_name(info['leisure'])}."
+
+
+def duration_bullet(info: dict) -> str:
+    averages = _per_member(info["avg_min"], "{:.1f} min")
+    if _gap(info["avg_min"]) < MIN_DURATION_GAP:
+        return f"Duração média parecida entre os tipos de usuário: {averages}."
+    return f"{_name(info['longest'])} tem as viagens <b>mais longas</b> em média: {averages}."
+
+
+def build_html(agg: dict, charts: dict, digest: str) -> str:
+    info = insights(agg)
+
+    def img(name: str, alt: str) -> str:
+        src, width, height = charts[name]
+        return f'<img src="{src}" alt="{alt}" width="{width}" height="{height}" loading="lazy" decoding="async">'
+
+    peaks = "; ".join(f"{_name(m)} às {h[0]}h e {h[1]}h" for m, h in info["peaks"].items() if len(h) == 2)
+    return f"""
+<!DOCTYPE html>
+<html lang="pt-br">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <meta name="{HASH_META}" content="{digest}">
+  <title>Relatório Cyclistic — 12 meses (2025)</title>
+  <style>
+    body {{
+      font-family: Arial, sans-serif;
+      margin: 40px;
+      color: #111;
+      line-height: 1.5;
+    }}
+    h1, h2 {{ margin-bottom: 8px; }}
+    .subtitle {{ color: #444; margin-top: 0; }}
+    .card {{
+      border: 1px solid #ddd;
+      border-radius: 10px;
+      padding: 16px;
+      margin: 18px 0;
+    }}
+    .insight {{
+      background: #f7f7f7;
+      border-left: 5px solid #222;
+      padding: 10px 14px;
+      margin-top: 10px;
+    }}
+    img {{
+      max-width: 100%;
+      height: auto;
+      border: 1px solid #eee;
+      border-radius: 8px;
+      margin-top: 10px;
+    }}
+    .small {{ color: #666; font-size: 0.95rem; }}
+    ul {{ margin-top: 8px; }}
+  </style>
+</head>
+<body>
+  <h1>Relatório Cyclistic — Análise 12 meses (2025)</h1>
+  <p class="subtitle">Objetivo: entender diferenças de comportamento entre <b>casual</b> e <b>member</b> para apoiar estratégias de conversão.</p>
+
+  <div class="card">
+    <h2>Principais insights</h2>
+    <ul>
+      <li>Viagens analisadas: {thousands(agg["rows"])} ({_per_member(info["rides"].map(thousands), "{}")}).</li>
+      <li>{duration_bullet(info)}</li>
+      <li>Picos de uso: {peaks}.</li>
+      <li>Fim de semana: {_per_member(info["weekend_share"], "{:.0f}%")} das viagens.</li>
+    </ul>
+    <div class="insight">
+      <b>Interpretação:</b> {profile_text(info)}
+    </div>
+  </div>
+
+  <div class="card">
+    <h2>1) Duração média (minutos)</h2>
+    <p class="small">Comparação direta entre member e casual. Mediana: {_per_member(info["median_min"], "{:.1f} min")}.</p>
+    {img("duracao_media", "Duração média")}
+    <div class="insight">
+      <b>O que isso indica:</b> {duration_text(info)}
+    </div>
+  </div>
+
+  <div class="card">
+    <h2>2) Uso por hora do dia</h2>
+    <p class="small">Quantidade de viagens por hora para cada tipo de usuário.</p>
+    {img("uso_por_hora", "Uso por hora")}
+    <div class="insight">
+      <b>O que isso indica:</b> {hours_text(info)}
+    </div>
+  </div>
+
+  <div class="card">
+    <h2>3) Uso por dia da semana</h2>
+    <p class="small">Comparação entre dias úteis e fim de semana.</p>
+    {img("uso_por_dia", "Uso por dia da semana")}
+    <div class="insight">
+      <b>O que isso indica:</b> {weekday_text(info)}
+    </div>
+  </div>
+
+  <div class="card">
+    <h2>4) Distribuição da duração (até 60 min)</h2>
+    <p class="small">Viagens por faixa de 2 minutos para cada tipo de usuário.</p>
+    {img("distribuicao_duracao", "Distribuição da duração")}
+  </div>
+
+  <div class="card">
+    <h2>Recomendações (exemplo)</h2>
+    <p class="small">Comentário fixo (não calculado dos dados), a revisar junto com os números acima.</p>
+    <ul>
+      <li>Campanhas de upgrade para <b>casual</b> focadas em <b>fim de semana</b> (benefícios para lazer).</li>
+      <li>Oferta de plano com vantagens em <b>horários de pico</b> (commute) para aumentar retenção.</li>
+      <li>Mensagens personalizadas por comportamento: “lazer” vs “deslocamento”.</li>
+    </ul>
+  </div>
+
+  <p class="small">Arquivo gerado automaticamente via Python a partir de {escape(str(agg["source"]))}. Basta abrir este HTML no navegador.</p>
+</body>
+</html>
+"""
+
+
+# ==============================
+# Relatório
+# ==============================
+def main() -> None:
+    t0 = time.perf_counter()
+    agg = load_aggregates()
+    digest = report_hash(agg)
+
+    if is_current(digest):
+        print(f"♻️ Relatório já atualizado (agregados sem mudança): {REPORT_PATH}")
+    else:
+        from report_charts import chart_jobs
+        from common.charts import render_pngs
+
+        OUT_DIR.mkdir(exist_ok=True)
+        jobs = chart_jobs(agg)
+        # gráficos desenhados em paralelo (common/charts.py)
+        charts = {name: write_chart(name, png) for name, png in zip(jobs, render_pngs(list(jobs.values())))}
+        REPORT_PATH.write_text(build_html(agg, charts, digest), encoding="utf-8")
+        print("✅ Relatório criado:", REPORT_PATH)
+        print("Abra o arquivo no navegador para visualizar.")
+
+    print(f"⏱️ {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import json
+import os
+from pathlib import Path
+
+# Artefato de agregados em disco (JSON): caminhos, versão e checagem de atualização.
+# Sem pandas: scripts que só releem o artefato pronto (ex.: 05_report.py sem
+# mudanças) não pagam a importação; o recálculo fica em trip_aggregates.py.
+
+DATA_PATH = Path("outputs/trips_2025_clean.csv")
+AGG_PATH = Path("outputs/trips_2025_aggregates.json")
+
+# arquivos mensais originais da Divvy (ex.: data_raw/202501-divvy-tripdata.csv)
+RAW_DIR = Path("data_raw")
+MONTH_GLOB = "*-divvy-tripdata.csv"
+
+# parciais por mês: outputs/partials/<arquivo>.json + manifesto com o hash de cada fonte
+PARTIALS_DIR = Path("outputs/partials")
+MANIFEST_PATH = PARTIALS_DIR / "manifest.json"
+
+# formato do artefato/parciais; artefatos de versão diferente são recalculados
+AGG_VERSION = 4
+
+# origem dos agregados: CSV limpo (padrão) ou arquivos mensais (CYCLISTIC_SOURCE=monthly)
+SOURCE_ENV = "CYCLISTIC_SOURCE"
+SOURCES = ("clean", "monthly")
+
+
+def source_mode() -> str:
+    mode = os.environ.get(SOURCE_ENV, "clean")
+    if mode not in SOURCES:
+        raise ValueError(f"{SOURCE_ENV}={mode!r}: use um de {SOURCES}")
+    return mode
+
+
+def thousands(n: int) -> str:
+    """Inteiro com separador de milhar pt-BR (ex.: 1.234.567)."""
+    return f"{n:,}".replace(",", ".")
+
+
+def write_json(path: Path, data: dict) -> None:
+    # arquivo temporário + rename: quem lê em paralelo (pipeline) nunca vê JSON pela metade
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    tmp.replace(path)
+
+
+def _read_json(path: Path) -> dict | None:
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+
+def save_aggregates(agg: dict, agg_path: Path = AGG_PATH) -> None:
+    agg_path.parent.mkdir(exist_ok=True)
+    write_json(agg_path, agg)
+
+
+def is_stale(agg: dict, data_path: Path = DATA_PATH) -> bool:
+    # artefato de outra fonte (ex.: modo mensal): nunca vale para o CSV limpo
+    if agg.get("source") != str(data_path):
+        return True
+    # sem o CSV bruto por perto, o artefato salvo é a única fonte
+    if not Path(data_path).exists():
+        return False
+    stat = Path(data_path).stat()
+    return (
+        agg.get("version") != AGG_VERSION
+        or agg.get("source_size") != stat.st_size
+        or agg.get("source_mtime_ns") != stat.st_mtime_ns
+    )
+
+
+# ==============================
+# Manifesto dos meses (arquivo → hash do conteúdo)
+# ==============================
+def partial_path(source: Path) -> Path:
+    return PARTIALS_DIR / f"{source.stem}.json"
+
+
+def load_manifest() -> dict:
+    return _read_json(MANIFEST_PATH) or {}
+
+
+def month_is_current(entry: dict | None, source: Path, sha: str | None = None) -> bool:
+    # parcial gravado num formato antigo: recalcula o mês
+    if entry is None or entry.get("version") != AGG_VERSION or not partial_path(source).exists():
+        return False
+    if sha is not None:
+        return entry["sha256"] == sha
+    stat = source.stat()
+    return entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+
+
+def saved_monthly(raw_dir: Path = RAW_DIR, agg_path: Path = AGG_PATH) -> dict | None:
+    """Artefato anual salvo, se nenhum mês mudou desde a última junção (tamanho + mtime); senão None."""
+    manifest = load_manifest()
+    sources = sorted(raw_dir.glob(MONTH_GLOB))
+    if {s.name for s in sources} != set(manifest):
+        return None
+    if not all(month_is_current(manifest[s.name], s) for s in sources):
+        return None
+    agg = _read_json(agg_path)
+    months = {name: entry["sha256"] for name, entry in manifest.items()}
+    if agg is None or agg.get("version") != AGG_VERSION or agg.get("months") != months:
+        return None
+    return agg
+
+
+def load_aggregates(data_path: Path = DATA_PATH, agg_path: Path = AGG_PATH, mode: str | None = None) -> dict:
+    """Lê o artefato de agregados; recalcula (uma leitura do CSV) se faltar ou estiver desatualizado.
+
+    `mode` (padrão: variável CYCLISTIC_SOURCE, senão "clean") escolhe a fonte:
+    "clean" lê outputs/trips_2025_clean.csv; "monthly" usa o modo incremental
+    (monthly_ingest.py) sobre data_raw/*-divvy-tripdata.csv, relendo só meses
+    novos ou alterados. pandas só é importado quando há algo a recalcular.
+    """
+    mode = mode or source_mode()
+    if mode == "monthly":
+        if not any(RAW_DIR.glob(MONTH_GLOB)):
+            raise FileNotFoundError(f"{SOURCE_ENV}=monthly, mas não há arquivos {RAW_DIR / MONTH_GLOB}")
+        agg = saved_monthly(agg_path=agg_path)
+        if agg is not None:
+            print(f"🔁 Meses recalculados: 0 | reaproveitados: {len(agg['months'])}")
+        else:
+            from monthly_ingest import update_monthly
+            agg = update_monthly(agg_path=agg_path)
+    else:
+        agg = _read_json(agg_path)
+        if agg is None or is_stale(agg, data_path):
+            from trip_aggregates import compute_aggregates
+            agg = compute_aggregates(data_path)
+            save_aggregates(agg, agg_path)
+
+    print(f"📂 Fonte dos agregados ({mode}): {agg['source']}")
+    return agg
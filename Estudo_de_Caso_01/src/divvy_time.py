@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+# com pyarrow os bytes são lidos direto dos buffers Arrow (sem objetos Python)
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# formato fixo dos arquivos Divvy: "2025-01-31 17:45:03" (às vezes com ".123" no fim)
+DIVVY_FORMAT = "%Y-%m-%d %H:%M:%S"
+WIDTH = 19
+
+# posições dos separadores e dos dígitos em "AAAA-MM-DD HH:MM:SS"
+SEPARATORS = {4: b"-", 7: b"-", 10: b" ", 13: b":", 16: b":"}
+DIGITS = [i for i in range(WIDTH) if i not in SEPARATORS]
+
+
+def _arrow_bytes(started_at: pd.Series):
+    arr = pa.array(started_at, from_pandas=True)
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    if not (pa.types.is_string(arr.type) or pa.types.is_large_string(arr.type)):
+        return None
+
+    _, offsets, data = arr.buffers()
+    off_type = np.int64 if pa.types.is_large_string(arr.type) else np.int32
+    offs = np.frombuffer(offsets, dtype=off_type)[arr.offset:arr.offset + len(arr) + 1]
+    data = np.frombuffer(data, dtype=np.uint8) if data is not None else np.zeros(1, dtype=np.uint8)
+
+    long_enough = (np.diff(offs) >= WIDTH) & arr.is_valid().to_numpy(zero_copy_only=False)
+    starts = np.where(long_enough, offs[:-1], 0)
+    if len(data) < WIDTH:
+        data = np.zeros(WIDTH, dtype=np.uint8)
+    # uma linha por posição do texto (acesso contíguo); .T volta ao formato (n, 19)
+    b = np.empty((WIDTH, len(arr)), dtype=np.uint8)
+    for i in range(WIDTH):
+        b[i] = data[starts + i]
+    return b.T, long_enough
+
+
+def _as_bytes(started_at: pd.Series):
+    """Matriz (n, 19) de bytes + máscara das linhas que seguem o formato Divvy."""
+    found = _arrow_bytes(started_at) if pa is not None else None
+    if found is not None:
+        b, ok = found
+    else:
+        raw = started_at.to_numpy(dtype=object)
+        try:
+            b = raw.astype(f"S{WIDTH}").view(np.uint8).reshape(-1, WIDTH)
+        except UnicodeEncodeError:
+            return None, np.zeros(len(raw), dtype=bool)
+        ok = np.ones(len(raw), dtype=bool)
+
+    for pos, sep in SEPARATORS.items():
+        ok &= b[:, pos] == ord(sep)
+    for pos in DIGITS:
+        ok &= (b[:, pos] - ord("0")) < 10  # uint8: abaixo de "0" dá a volta
+    return b, ok
+
+
+def _num(b: np.ndarray, start: int, stop: int) -> np.ndarray:
+    out = np.zeros(len(b), dtype=np.int32)
+    for i in range(start, stop):
+        out = out * 10 + (b[:, i].astype(np.int32) - ord("0"))
+    return out
+
+
+def _fallback(started_at: pd.Series) -> pd.Series:
+    # linhas fora do padrão: parse completo só nelas
+    return pd.to_datetime(started_at, errors="coerce", format="mixed")
+
+
+def parse_hour(started_at: pd.Series) -> pd.Series:
+    """Hora (0–23) de started_at sem converter a coluna inteira para datetime."""
+    if pd.api.types.is_datetime64_any_dtype(started_at):
+        return started_at.dt.hour.astype("Int8").rename("hour")
+
+    b, ok = _as_bytes(started_at)
+    if b is not None and ok.all():
+        return pd.Series(_num(b, 11, 13).astype(np.int8), index=started_at.index, name="hour")
+
+    hour = pd.Series(pd.NA, index=started_at.index, dtype="Int8", name="hour")
+    if b is not None:
+        hour[ok] = _num(b[ok], 11, 13)
+    hour[~ok] = _fallback(started_at[~ok]).dt.hour.astype("Int8")
+    return hour
+
+
+def parse_timestamp(values: pd.Series) -> pd.Series:
+    """Data e hora (segundos) de started_at/ended_at a partir dos dígitos do formato fixo."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+
+    b, ok = _as_bytes(values)
+    out = pd.Series(pd.NaT, index=values.index, dtype="datetime64[s]", name=values.name)
+    if b is not None and ok.any():
+        parts = pd.DataFrame({
+            "year": _num(b[ok], 0, 4),
+            "month": _num(b[ok], 5, 7),
+            "day": _num(b[ok], 8, 10),
+            "hour": _num(b[ok], 11, 13),
+            "minute": _num(b[ok], 14, 16),
+            "second": _num(b[ok], 17, 19),
+        })
+        out[ok] = pd.to_datetime(parts, errors="coerce").to_numpy()
+    if not ok.all():
+        out[~ok] = _fallback(values[~ok])
+    return out
+
+
+def parse_date(started_at: pd.Series) -> pd.Series:
+    """Data (meia-noite) de started_at a partir dos dígitos AAAA-MM-DD."""
+    if pd.api.types.is_datetime64_any_dtype(started_at):
+        return started_at.dt.normalize().rename("date")
+
+    b, ok = _as_bytes(started_at)
+    date = pd.Series(pd.NaT, index=started_at.index, dtype="datetime64[s]", name="date")
+    if b is not None and ok.any():
+        parts = pd.DataFrame({
+            "year": _num(b[ok], 0, 4),
+            "month": _num(b[ok], 5, 7),
+            "day": _num(b[ok], 8, 10),
+        })
+        date[ok] = pd.to_datetime(parts, errors="coerce").to_numpy()
+    if not ok.all():
+        date[~ok] = _fallback(started_at[~ok]).dt.normalize()
+    return date
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# raiz do repositório (pasta common/ compartilhada entre os estudos de caso)
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from common.parallel import default_workers, ordered_map
+from common.schema import apply_schema
+from agg_store import (
+    AGG_PATH,
+    AGG_VERSION,
+    MANIFEST_PATH,
+    MONTH_GLOB,
+    PARTIALS_DIR,
+    RAW_DIR,
+    load_manifest,
+    month_is_current,
+    partial_path,
+    save_aggregates,
+    write_json,
+)
+from divvy_time import parse_timestamp
+from trip_aggregates import CHUNK_SIZE, add_hour, aggregate_frames, merge_aggregates
+
+# colunas dos arquivos mensais da Divvy usadas na limpeza
+RAW_COLS = ["started_at", "ended_at", "member_casual"]
+
+# processos para recalcular meses em paralelo (CYCLISTIC_WORKERS=1 força modo serial)
+WORKERS = default_workers("CYCLISTIC_WORKERS")
+
+
+# ==============================
+# Limpeza + agregação de um mês
+# ==============================
+def clean_trips(raw: pd.DataFrame) -> pd.DataFrame:
+    """Arquivo mensal da Divvy → mesmas colunas do trips_2025_clean.csv, tipadas como no modo anual.
+
+    Nenhuma linha é descartada aqui e o resultado passa pelo mesmo add_hour +
+    apply_schema do CSV limpo: com as mesmas viagens no CSV limpo, os dois modos
+    geram os mesmos agregados (tests/test_monthly_ingest.py).
+    """
+    start = parse_timestamp(raw["started_at"])
+    end = parse_timestamp(raw["ended_at"])
+
+    trips = pd.DataFrame({
+        "member_casual": raw["member_casual"],
+        "ride_length_sec": (end - start).dt.total_seconds(),
+        "day_of_week": start.dt.day_name(),
+        "started_at": start,
+    })
+    return apply_schema(add_hour(trips), "trips")
+
+
+def month_partial(path: Path) -> dict:
+    chunks = pd.read_csv(path, usecols=RAW_COLS, chunksize=CHUNK_SIZE)
+    return aggregate_frames(clean_trips(chunk) for chunk in chunks)
+
+
+def compute_partials(sources: list, workers: int = WORKERS) -> list:
+    """Um mês por processo; o resultado segue a ordem de `sources` (saída determinística)."""
+    return ordered_map(month_partial, sources, workers)
+
+
+# ==============================
+# Manifesto (arquivo → hash do conteúdo)
+# ==============================
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def update_monthly(raw_dir: Path = RAW_DIR, agg_path: Path = AGG_PATH, workers: int = WORKERS) -> dict:
+    """Recalcula só os meses novos/alterados e junta todos os parciais no artefato anual."""
+    PARTIALS_DIR.mkdir(parents=True, exist_ok=True)
+    old = load_manifest()
+    manifest = {}
+    todo = []
+
+    for source in sorted(raw_dir.glob(MONTH_GLOB)):
+        entry = old.get(source.name)
+        stat = source.stat()
+        # tamanho + mtime iguais: nem precisa recalcular o hash
+        if month_is_current(entry, source):
+            manifest[source.name] = entry
+            continue
+
+        sha = file_sha256(source)
+        manifest[source.name] = {
+            "sha256": sha, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "version": AGG_VERSION,
+        }
+        if not month_is_current(entry, source, sha):
+            todo.append(source)
+
+    for source, summary in zip(todo, compute_partials(todo, workers)):
+        partial = {"source": source.name, "sha256": manifest[source.name]["sha256"], **summary}
+        write_json(partial_path(source), partial)
+
+    # meses que saíram da pasta: descartar o parcial
+    for name in set(old) - set(manifest):
+        partial_path(Path(name)).unlink(missing_ok=True)
+
+    write_json(MANIFEST_PATH, manifest)
+
+    partials = [
+        json.loads(partial_path(Path(name)).read_text(encoding="utf-8"))
+        for name in manifest
+    ]
+    agg = {
+        "source": str(raw_dir / MONTH_GLOB),
+        "months": {name: entry["sha256"] for name, entry in manifest.items()},
+        **merge_aggregates(partials),
+    }
+    save_aggregates(agg, agg_path)
+
+    print(f"🔁 Meses recalculados: {len(todo)} | reaproveitados: {len(manifest) - len(todo)}")
+    return agg
+
+
+if __name__ == "__main__":
+    update_monthly()
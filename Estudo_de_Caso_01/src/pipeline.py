@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+CASE_DIR = Path(__file__).resolve().parents[1]
+SRC = CASE_DIR / "src"
+OUTPUTS = CASE_DIR / "outputs"
+
+sys.path.append(str(CASE_DIR.parent))
+from common.pipeline import Pipeline, Stage, helper_modules
+
+AGG = OUTPUTS / "trips_2025_aggregates.json"
+CHART_NAMES = ["duracao_media", "uso_por_hora", "uso_por_dia", "distribuicao_duracao"]
+
+# 00_aggregate gera/atualiza os agregados (CSV limpo, ou meses em data_raw/ com CYCLISTIC_SOURCE=monthly);
+# EDA, gráficos e relatório só leem o artefato, então rodam ao mesmo tempo
+STAGES = [
+    Stage(
+        SRC / "00_aggregate.py",
+        inputs=[OUTPUTS / "trips_2025_clean.csv", CASE_DIR / "data_raw"],
+        outputs=[AGG],
+        env=["CYCLISTIC_SOURCE"],
+    ),
+    Stage(SRC / "03_eda.py", inputs=[AGG]),
+    Stage(SRC / "04_visualization.py", inputs=[AGG], outputs=[OUTPUTS / f"{n}.png" for n in CHART_NAMES]),
+    Stage(
+        SRC / "05_report.py",
+        inputs=[AGG],
+        outputs=[OUTPUTS / "relatorio_cyclistic.html", OUTPUTS / "report_assets"],
+    ),
+]
+
+
+def main() -> None:
+    # --force: roda todas as etapas mesmo atualizadas
+    pipeline = Pipeline(STAGES, root=CASE_DIR, code=helper_modules(SRC) + [CASE_DIR.parent / "common"])
+    ok = pipeline.run(force="--force" in sys.argv[1:])
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
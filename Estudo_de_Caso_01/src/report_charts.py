@@ -0,0 +1,91 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# raiz do repositório (pasta common/ compartilhada entre os estudos de caso)
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from common.charts import ChartJob, pyplot
+from trip_aggregates import (
+    WEEKDAY_ORDER,
+    avg_duration_by_member,
+    duration_distribution,
+    hour_member_matrix,
+    weekday_member_matrix,
+)
+
+
+# ==============================
+# Dados de cada gráfico (a partir do artefato de agregados, sem reler as viagens)
+# ==============================
+def avg_duration_data(agg: dict):
+    return avg_duration_by_member(agg) / 60
+
+
+def weekday_usage_data(agg: dict):
+    return weekday_member_matrix(agg).reindex(WEEKDAY_ORDER)
+
+
+def duration_distribution_data(agg: dict):
+    # até 60 min, faixas de 2 min (histogramas por tipo de usuário vêm prontos no artefato)
+    duration_dist = duration_distribution(agg, np.arange(0, 61, 2) * 60)
+    duration_dist.index = duration_dist.index // 60
+    return duration_dist
+
+
+# ==============================
+# Desenho (rodam nos processos do common/charts.py: só recebem os dados;
+# matplotlib só é importado aqui dentro, quando algum gráfico é refeito)
+# ==============================
+def avg_duration_chart(avg_duration):
+    fig, ax = pyplot().subplots(figsize=(6, 4))
+    avg_duration.plot(kind="bar", ax=ax)
+    ax.set_title("Duração média (minutos)")
+    ax.set_ylabel("Minutos")
+    ax.tick_params(axis="x", rotation=0)
+    return fig
+
+
+def hour_usage_chart(hour_usage):
+    fig, ax = pyplot().subplots(figsize=(10, 5))
+    hour_usage.plot(ax=ax)
+    ax.set_title("Uso por Hora do Dia")
+    ax.set_xlabel("Hora")
+    ax.set_ylabel("Quantidade de Viagens")
+    return fig
+
+
+def weekday_usage_chart(weekday_usage):
+    fig, ax = pyplot().subplots(figsize=(8, 5))
+    weekday_usage.plot(kind="bar", ax=ax)
+    ax.set_title("Uso por Dia da Semana")
+    ax.set_ylabel("Quantidade de Viagens")
+    ax.tick_params(axis="x", rotation=45)
+    return fig
+
+
+def duration_distribution_chart(duration_dist):
+    fig, ax = pyplot().subplots(figsize=(10, 5))
+    duration_dist.plot(drawstyle="steps-post", ax=ax)
+    ax.set_title("Distribuição da Duração das Viagens (até 60 min)")
+    ax.set_xlabel("Minutos")
+    ax.set_ylabel("Quantidade de Viagens")
+    return fig
+
+
+# nome do arquivo (sem extensão) → (dados a partir dos agregados, desenho)
+CHARTS = {
+    "duracao_media": (avg_duration_data, avg_duration_chart),
+    "uso_por_hora": (hour_member_matrix, hour_usage_chart),
+    "uso_por_dia": (weekday_usage_data, weekday_usage_chart),
+    "distribuicao_duracao": (duration_distribution_data, duration_distribution_chart),
+}
+
+
+def chart_jobs(agg: dict, out_dir: Path | None = None) -> dict:
+    """Um ChartJob por gráfico (com out_dir, salvo em <out_dir>/<nome>.png)."""
+    return {
+        name: ChartJob(plot, data(agg), None if out_dir is None else Path(out_dir) / f"{name}.png")
+        for name, (data, plot) in CHARTS.items()
+    }
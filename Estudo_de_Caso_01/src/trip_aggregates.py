@@ -0,0 +1,250 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# raiz do repositório (pasta common/ compartilhada entre os estudos de caso)
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from common.columnar_cache import CacheWriter, has_columns, iter_chunks, read_table
+from common.schema import WEEKDAY_ORDER, apply_schema, memory_bytes, print_memory_report
+from common.sketches import QuantileSketch, StreamingHistogram, merge_groups, quantile_table, sketch_groups
+from divvy_time import parse_hour
+# caminhos, versão e leitura/gravação do artefato (sem pandas) ficam em agg_store.py
+from agg_store import AGG_VERSION, DATA_PATH
+
+# colunas necessárias para todas as análises (EDA, gráficos e relatório)
+COLS = ["member_casual", "ride_length_sec", "day_of_week", "started_at"]
+
+# no cache Parquet a hora já vem pronta (started_at não precisa ser relido)
+CACHE_COLS = ["member_casual", "ride_length_sec", "day_of_week", "hour"]
+
+
+# leitura em blocos: memória de pico fixa, independente do tamanho do arquivo
+CHUNK_SIZE = 500_000
+
+# contadores/somas que podem ser somados bloco a bloco sem perder exatidão
+FOLD_KEYS = ["rides", "duration_sum", "duration_count", "hour_member", "weekday_member"]
+
+# distribuição da duração: buckets de 1 s, alargados automaticamente acima de 8192 buckets
+DURATION_HIST_RESOLUTION = 1.0
+DURATION_HIST_BUCKETS = 8192
+
+# quantis da duração (sketch KLL; erro de rank ~1% com k=200)
+QUANTILE_K = 200
+QUANTILE_GROUPS = ["member_casual", "day_of_week"]
+
+
+# ==============================
+# Agregação (uma única leitura do CSV)
+# ==============================
+def add_hour(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Bloco com as colunas COLS do CSV limpo → colunas CACHE_COLS (hora via divvy_time.parse_hour)."""
+    chunk = chunk.assign(hour=parse_hour(chunk["started_at"]))
+    return chunk[CACHE_COLS]
+
+
+def _partial(df: pd.DataFrame) -> dict:
+    # ride_length_sec fica em float32 na memória, mas a soma é acumulada em float64
+    duration = df["ride_length_sec"].astype("float64").groupby(df["member_casual"], observed=True)
+    return {
+        "rows": len(df),
+        "rides": df.groupby("member_casual", observed=True).size(),
+        "duration_sum": duration.sum(),
+        "duration_count": duration.count(),
+        "hour_member": df.groupby(["hour", "member_casual"], observed=True).size(),
+        "weekday_member": df.groupby(["day_of_week", "member_casual"], observed=True).size(),
+        "duration_hist": {
+            m: _duration_hist(s)
+            for m, s in df["ride_length_sec"].groupby(df["member_casual"], observed=True)
+        },
+        "duration_sketch": {
+            by: sketch_groups(df["ride_length_sec"], df[by], QUANTILE_K) for by in QUANTILE_GROUPS
+        },
+    }
+
+
+def _duration_hist(values=()) -> StreamingHistogram:
+    hist = StreamingHistogram(DURATION_HIST_RESOLUTION, DURATION_HIST_BUCKETS)
+    hist.update(values)
+    return hist
+
+
+def _fold(acc: dict | None, part: dict) -> dict:
+    if acc is None:
+        return part
+    out = {"rows": acc["rows"] + part["rows"]}
+    for key in FOLD_KEYS:
+        out[key] = acc[key].add(part[key], fill_value=0)
+    out["duration_hist"] = merge_groups(acc["duration_hist"], part["duration_hist"])
+    out["duration_sketch"] = {
+        by: merge_groups(acc["duration_sketch"][by], part["duration_sketch"][by]) for by in QUANTILE_GROUPS
+    }
+    return out
+
+
+def _summarize(acc: dict | None) -> dict:
+    if acc is None:  # nenhuma linha lida
+        acc = _partial(pd.DataFrame(columns=CACHE_COLS))
+    return {
+        "version": AGG_VERSION,
+        "rows": int(acc["rows"]),
+        "rides": {m: int(n) for m, n in acc["rides"].items()},
+        "duration_sum": {m: float(v) for m, v in acc["duration_sum"].items()},
+        "duration_count": {m: int(v) for m, v in acc["duration_count"].items()},
+        # matrizes guardadas como registros [chave, member_casual, viagens]
+        "hour_member": [[int(h), m, int(n)] for (h, m), n in acc["hour_member"].items()],
+        "weekday_member": [[d, m, int(n)] for (d, m), n in acc["weekday_member"].items()],
+        "duration_hist": {m: acc["duration_hist"][m].to_dict() for m in sorted(acc["duration_hist"])},
+        "duration_sketch": {
+            by: {key: sketch.to_dict() for key, sketch in sorted(acc["duration_sketch"][by].items())}
+            for by in QUANTILE_GROUPS
+        },
+    }
+
+
+def aggregate_frames(frames) -> dict:
+    """Dobra blocos já tipados (colunas CACHE_COLS) em um único dicionário de agregados."""
+    acc = None
+    for frame in frames:
+        acc = _fold(acc, _partial(frame))
+    return _summarize(acc)
+
+
+def _as_partial(agg: dict) -> dict:
+    # caminho inverso de _summarize: volta para Series que podem ser somadas
+    def records(key, name):
+        df = pd.DataFrame(agg[key], columns=[name, "member_casual", "n"])
+        return df.set_index([name, "member_casual"])["n"]
+
+    return {
+        "rows": agg["rows"],
+        "rides": pd.Series(agg["rides"], dtype="int64"),
+        "duration_sum": pd.Series(agg["duration_sum"], dtype="float64"),
+        "duration_count": pd.Series(agg["duration_count"], dtype="int64"),
+        "hour_member": records("hour_member", "hour"),
+        "weekday_member": records("weekday_member", "day_of_week"),
+        "duration_hist": {m: StreamingHistogram.from_dict(h) for m, h in agg["duration_hist"].items()},
+        "duration_sketch": {
+            by: {key: QuantileSketch.from_dict(d) for key, d in agg["duration_sketch"][by].items()}
+            for by in QUANTILE_GROUPS
+        },
+    }
+
+
+def merge_aggregates(aggs: list) -> dict:
+    """Soma agregados parciais (ex.: um por mês) no mesmo formato do artefato anual."""
+    acc = None
+    for agg in aggs:
+        acc = _fold(acc, _as_partial(agg))
+    return _summarize(acc)
+
+
+def hourly_cache(data_path: Path) -> Path:
+    """Cache Parquet só com CACHE_COLS (ex.: outputs/trips_2025_clean_hourly.parquet).
+
+    É uma projeção com coluna derivada, não o cache completo do CSV: fica em
+    arquivo próprio para que read_table(data_path) continue lendo o CSV inteiro.
+    """
+    data_path = Path(data_path)
+    return data_path.with_name(f"{data_path.stem}_hourly.parquet")
+
+
+def compute_aggregates(data_path: Path = DATA_PATH, chunksize: int | None = CHUNK_SIZE) -> dict:
+    """Uma leitura dos dados; com chunksize, soma parciais bloco a bloco (mesmo resultado do modo em memória).
+
+    Usa o cache Parquet de hourly_cache() quando atualizado; caso contrário
+    lê o CSV e aproveita a mesma passada para gravar esse cache
+    (já com a coluna `hour`, para que as próximas execuções não parseiem datas).
+    """
+    cache = hourly_cache(data_path)
+    cached = has_columns(data_path, CACHE_COLS, cache)
+    cols = CACHE_COLS if cached else COLS
+    if chunksize is None:
+        chunks = [read_table(data_path, columns=cols, cache=cache if cached else None)]
+    else:
+        chunks = iter_chunks(data_path, columns=cols, chunksize=chunksize, cache=cache if cached else None)
+
+    writer = None if cached else CacheWriter(data_path, cache)
+    mem = {"before": 0, "after": 0}
+
+    def prepared():
+        for chunk in chunks:
+            if not cached:
+                chunk = add_hour(chunk)
+            # categóricas ordenadas + float32/int8 (o cache já sai tipado)
+            mem["before"] += memory_bytes(chunk)
+            chunk = apply_schema(chunk, "trips")
+            mem["after"] += memory_bytes(chunk)
+            if writer is not None:
+                writer.write(chunk)
+            yield chunk
+
+    try:
+        summary = aggregate_frames(prepared())
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    if writer is not None:
+        writer.close()
+    if not cached:  # vindo do cache Parquet os tipos já estão compactos
+        print_memory_report("trips", mem["before"], mem["after"])
+
+    stat = Path(data_path).stat()
+    return {
+        "source": str(data_path),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        **summary,
+    }
+
+
+# ==============================
+# Visões prontas para EDA / gráficos / relatório
+# ==============================
+def ride_counts(agg: dict) -> pd.Series:
+    s = pd.Series(agg["rides"], dtype="int64").sort_values(ascending=False)
+    s.index.name = "member_casual"
+    return s.rename("count")
+
+
+def avg_duration_by_member(agg: dict) -> pd.Series:
+    total = pd.Series(agg["duration_sum"], dtype="float64")
+    count = pd.Series(agg["duration_count"], dtype="int64")
+    s = (total / count).sort_index()
+    s.index.name = "member_casual"
+    return s.rename("ride_length_sec")
+
+
+def _matrix(records: list, index_name: str) -> pd.DataFrame:
+    df = pd.DataFrame(records, columns=[index_name, "member_casual", "n"])
+    return (
+        df.pivot(index=index_name, columns="member_casual", values="n")
+          .sort_index()
+    )
+
+
+def hour_member_matrix(agg: dict) -> pd.DataFrame:
+    return _matrix(agg["hour_member"], "hour")
+
+
+def weekday_member_matrix(agg: dict) -> pd.DataFrame:
+    return _matrix(agg["weekday_member"], "day_of_week")
+
+
+def duration_distribution(agg: dict, edges) -> pd.DataFrame:
+    """Viagens por faixa de duração (bordas em segundos) × member_casual."""
+    hists = {m: StreamingHistogram.from_dict(h) for m, h in agg.get("duration_hist", {}).items()}
+    df = pd.DataFrame({m: h.histogram(edges)[0] for m, h in sorted(hists.items())}, index=edges[:-1])
+    df.index.name = "ride_length_sec"
+    return df
+
+
+def duration_quantiles(agg: dict, by: str = "member_casual") -> pd.DataFrame:
+    """p50/p90/p99 de ride_length_sec por `by` (member_casual ou day_of_week), em segundos."""
+    sketches = {key: QuantileSketch.from_dict(d) for key, d in agg["duration_sketch"][by].items()}
+    df = quantile_table(sketches)
+    df = df.reindex(WEEKDAY_ORDER).dropna(how="all") if by == "day_of_week" else df.sort_index()
+    df.index.name = by
+    return df
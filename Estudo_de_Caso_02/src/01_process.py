@@ -1,74 +1,99 @@
+import sys
 from pathlib import Path
-import pandas as pd
 
 # raiz do projeto: .../02. Estudo de Caso
 BASE_DIR = Path(__file__).resolve().parents[1]
 
+# raiz do repositório (pasta common/ compartilhada)
+sys.path.append(str(BASE_DIR.parent))
+
 RAW = BASE_DIR / "data_raw"
 CLEAN = BASE_DIR / "data_clean"
-CLEAN.mkdir(exist_ok=True)
-
-activity_path = RAW / "dailyActivity_merged.csv"
-sleep_path = RAW / "minuteSleep_merged.csv"
-
-print("BASE_DIR:", BASE_DIR)
-print("Procurando em:", RAW)
-
-if not activity_path.exists():
-    raise FileNotFoundError(f"Não achei: {activity_path}")
-if not sleep_path.exists():
-    raise FileNotFoundError(f"Não achei: {sleep_path}")
-
-# ✅ separador correto: ;
-activity = pd.read_csv(activity_path, sep=";", encoding="utf-8")
-sleep = pd.read_csv(sleep_path, sep=";", encoding="utf-8")
-
-
-# padronizar nomes
-activity.columns = activity.columns.str.strip()
-sleep.columns = sleep.columns.str.strip()
-
-# converter datas
-activity["ActivityDate"] = pd.to_datetime(activity["ActivityDate"], errors="coerce")
-
-sleep["date"] = pd.to_datetime(sleep["date"], errors="coerce")
-sleep["ActivityDate"] = pd.to_datetime(sleep["date"].dt.date)
-
-# ---------------------------------------------------
-# AGREGAR MINUTE SLEEP → DAILY SLEEP
-# value == 1 significa dormindo
-# ---------------------------------------------------
-daily_sleep = (
-    sleep[sleep["value"] == 1]
-    .groupby(["Id", "ActivityDate"])
-    .size()
-    .reset_index(name="TotalMinutesAsleep")
-)
-
-# ---------------------------------------------------
-# MERGE (atividade diária + sono agregado)
-# ---------------------------------------------------
-df = activity.merge(
-    daily_sleep,
-    on=["Id", "ActivityDate"],
-    how="left"
-)
-
-df["TotalMinutesAsleep"] = df["TotalMinutesAsleep"].fillna(0)
-
-# features úteis
-df["weekday"] = df["ActivityDate"].dt.day_name()
-df["month"] = df["ActivityDate"].dt.to_period("M").astype(str)
-
-out = CLEAN / "fitbit_daily_clean.csv"
-df.to_csv(out, index=False)
-
-print("✅ Base limpa criada:", out)
-print("Linhas:", len(df), "| Colunas:", len(df.columns))
-print("Usuários únicos:", df["Id"].nunique())
-
-print("Colunas activity:", activity.columns.tolist())
-print("Colunas sleep:", sleep.columns.tolist())
-
 
 
+def main() -> None:
+    # numpy/pandas e helpers só ao rodar (importar o módulo não carrega nada pesado)
+    import numpy as np
+    import pandas as pd
+
+    from common.columnar_cache import write_table
+    from common.schema import apply_schema
+    from common.shards import write_shards
+    from fitbit_index import build_user_index, merge_join, save_user_index, user_day_keys
+    from fitbit_shards import shards_dir
+    from fitbit_sleep import daily_sleep_from_minutes, read_header
+
+    CLEAN.mkdir(exist_ok=True)
+
+    activity_path = RAW / "dailyActivity_merged.csv"
+    sleep_path = RAW / "minuteSleep_merged.csv"
+
+    print("BASE_DIR:", BASE_DIR)
+    print("Procurando em:", RAW)
+
+    if not activity_path.exists():
+        raise FileNotFoundError(f"Não achei: {activity_path}")
+    if not sleep_path.exists():
+        raise FileNotFoundError(f"Não achei: {sleep_path}")
+
+    # ✅ separador correto: ;
+    activity = pd.read_csv(activity_path, sep=";", encoding="utf-8")
+
+    # padronizar nomes
+    activity.columns = activity.columns.str.strip()
+
+    # converter datas
+    activity["ActivityDate"] = pd.to_datetime(activity["ActivityDate"], errors="coerce")
+
+    # ---------------------------------------------------
+    # AGREGAR MINUTE SLEEP → DAILY SLEEP
+    # value == 1 significa dormindo
+    # (leitura em blocos: o arquivo minuto a minuto nunca fica inteiro na memória)
+    # ---------------------------------------------------
+    daily_sleep = daily_sleep_from_minutes(sleep_path)
+
+    # ---------------------------------------------------
+    # MERGE (atividade diária + sono agregado)
+    # chave compacta (Id, dia) nos dois lados, ordenados → merge-join
+    # ---------------------------------------------------
+    id_values = np.union1d(activity["Id"].unique(), daily_sleep["Id"].unique())
+    activity_keys = user_day_keys(activity["Id"], activity["ActivityDate"], id_values)
+    sleep_keys = user_day_keys(daily_sleep["Id"], daily_sleep["ActivityDate"], id_values)
+
+    # base limpa em ordem (Id, dia): cada usuário vira uma faixa contígua de linhas
+    # (o dailyActivity original já vem nessa ordem, então a saída não muda)
+    order = np.argsort(activity_keys, kind="stable")
+    df = activity.iloc[order].reset_index(drop=True)
+
+    sleep_order = np.argsort(sleep_keys, kind="stable")
+    df["TotalMinutesAsleep"] = merge_join(
+        activity_keys[order],
+        sleep_keys[sleep_order],
+        daily_sleep["TotalMinutesAsleep"].to_numpy()[sleep_order],
+    )
+
+    df["TotalMinutesAsleep"] = df["TotalMinutesAsleep"].fillna(0)
+
+    # features úteis
+    df["weekday"] = df["ActivityDate"].dt.day_name()
+    df["month"] = df["ActivityDate"].dt.to_period("M").astype(str)
+
+    out = CLEAN / "fitbit_daily_clean.csv"
+    # CSV + cache Parquet tipado (ActivityDate já como data, weekday/month categóricas)
+    write_table(df, out, schema="fitbit_daily")
+    # faixas de linhas por usuário p/ médias por usuário no EDA sem groupby (o dashboard lê os shards)
+    save_user_index(build_user_index(df), out)
+    # cópia particionada por hash do Id: leitura de poucos usuários abre só os shards deles
+    manifest = write_shards(apply_schema(df, "fitbit_daily"), shards_dir(out), key="Id", source_path=out)
+
+    print("✅ Base limpa criada:", out)
+    print("Linhas:", len(df), "| Colunas:", len(df.columns))
+    print("Usuários únicos:", df["Id"].nunique())
+    print(f"Shards por usuário: {len(manifest['shards'])} ({manifest['format']}) em {shards_dir(out)}")
+
+    print("Colunas activity:", activity.columns.tolist())
+    print("Colunas sleep:", read_header(sleep_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,87 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import sys
 from pathlib import Path
 
 # Caminho do dataset limpo
 BASE_DIR = Path(__file__).resolve().parents[1]
 DATA_PATH = BASE_DIR / "data_clean" / "fitbit_daily_clean.csv"
 
-df = pd.read_csv(DATA_PATH)
+sys.path.append(str(BASE_DIR.parent))
 
-print("\n================ RESUMO GERAL ================")
-df.info()
 
-print("\n================ PASSOS POR USUÁRIO ================")
-print(df.groupby("Id")["TotalSteps"].mean().sort_values(ascending=False).head())
+def main() -> None:
+    # pandas só ao rodar o EDA; matplotlib/seaborn só se algum gráfico mudou
+    from common.charts import ChartJob, render_charts
+    from common.density import DensityGrid, use_density
+    from common.schema import apply_schema
+    from common.sketches import StreamingHistogram, sketch_groups
+    from fitbit_charts import steps_hist_chart, steps_vs_calories_chart, steps_vs_calories_density_chart
+    from fitbit_index import load_user_index, per_user_mean
+    from fitbit_shards import load_daily, users_from_env
+    from fitbit_stats import QUANTILE_COL, SCATTER_COLS, SCATTER_STEP, weekday_quantiles
 
-print("\n================ CORRELAÇÃO PASSOS x SONO ================")
-print(df[["TotalSteps", "TotalMinutesAsleep"]].corr())
+    # só as colunas usadas na análise (Parquet se atualizado, senão CSV)
+    cols = ["Id", "weekday", "TotalSteps", "TotalMinutesAsleep", "Calories", "SedentaryMinutes", "VeryActiveMinutes"]
+    # FITBIT_USERS=id1,id2 restringe a análise a esses usuários (lê só os shards deles)
+    user_filter = users_from_env()
+    df = load_daily(DATA_PATH, columns=cols, users=user_filter)
+    df = apply_schema(df, "fitbit_daily", report=True)
 
-print("\n================ CORRELAÇÃO PASSOS x CALORIAS ================")
-print(df[["TotalSteps", "Calories"]].corr())
+    # faixas de linhas por usuário gravadas pelo 01_process (None se desatualizado)
+    user_index = None if user_filter else load_user_index(DATA_PATH, df)
 
-print("\n================ MÉDIAS DE ATIVIDADE ================")
-print("SedentaryMinutes média:", df["SedentaryMinutes"].mean())
-print("VeryActiveMinutes média:", df["VeryActiveMinutes"].mean())
+    print("\n================ RESUMO GERAL ================")
+    df.info()
 
-# ================= VISUALIZAÇÕES =================
+    print("\n================ PASSOS POR USUÁRIO ================")
+    if user_index is not None:
+        steps_by_user = per_user_mean(df, user_index, "TotalSteps")
+    else:
+        steps_by_user = df.groupby("Id")["TotalSteps"].mean()
+    print(steps_by_user.sort_values(ascending=False).head())
 
-sns.set(style="whitegrid")
+    print("\n================ CORRELAÇÃO PASSOS x SONO ================")
+    print(df[["TotalSteps", "TotalMinutesAsleep"]].corr())
 
-# Passos vs Calorias
-plt.figure(figsize=(8,5))
-sns.scatterplot(data=df, x="TotalSteps", y="Calories")
-plt.title("Relação entre Passos e Calorias")
-plt.tight_layout()
-plt.savefig(BASE_DIR / "outputs" / "steps_vs_calories.png")
-plt.close()
+    print("\n================ CORRELAÇÃO PASSOS x CALORIAS ================")
+    print(df[["TotalSteps", "Calories"]].corr())
 
-# Distribuição de passos
-plt.figure(figsize=(8,5))
-sns.histplot(df["TotalSteps"], bins=30)
-plt.title("Distribuição de Passos Diários")
-plt.tight_layout()
-plt.savefig(BASE_DIR / "outputs" / "distribuicao_passos.png")
-plt.close()
+    print("\n================ PASSOS: P50/P90/P99 POR DIA DA SEMANA ================")
+    # mesmos sketches do dashboard (erro de rank ~1%): a média sozinha esconde a cauda
+    print(weekday_quantiles(sketch_groups(df[QUANTILE_COL], df["weekday"])).round(0))
 
-print("\n✅ Visualizações salvas na pasta outputs/")
+    print("\n================ MÉDIAS DE ATIVIDADE ================")
+    print("SedentaryMinutes média:", df["SedentaryMinutes"].mean())
+    print("VeryActiveMinutes média:", df["VeryActiveMinutes"].mean())
 
+    # ================= VISUALIZAÇÕES =================
+    # dados de cada gráfico calculados aqui; o desenho (fitbit_charts.py) roda em paralelo
+    # e só para os gráficos cujos dados mudaram
 
+    # mesma estrutura de histograma do dashboard (buckets de 1 passo; 30 faixas iguais entre mín e máx)
+    steps_hist = StreamingHistogram(resolution=1, max_buckets=65_536)
+    steps_hist.update(df["TotalSteps"])
+
+    # Passos vs Calorias: acima de SCATTER_DENSITY_THRESHOLD linhas vira grade de densidade
+    # (mesmas células do dashboard), desenhada como imagem
+    if use_density(len(df)):
+        scatter_grid = DensityGrid(SCATTER_STEP)
+        scatter_grid.update(df[SCATTER_COLS[0]], df[SCATTER_COLS[1]])
+        scatter = (steps_vs_calories_density_chart, scatter_grid.grid())
+    else:
+        scatter = (steps_vs_calories_chart, df[list(SCATTER_COLS)])
+
+    out_dir = BASE_DIR / "outputs"
+    status = render_charts([
+        # Passos vs Calorias
+        ChartJob(*scatter, out_dir / "steps_vs_calories.png"),
+        # Distribuição de passos
+        ChartJob(steps_hist_chart, steps_hist.histogram(30), out_dir / "distribuicao_passos.png"),
+    ])
+    for name, st in status.items():
+        print(f"  {name}: {st}")
+
+    print("\n✅ Visualizações salvas na pasta outputs/")
+
+
+if __name__ == "__main__":
+    main()
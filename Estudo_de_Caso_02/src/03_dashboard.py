@@ -1,114 +1,160 @@
-import pandas as pd
 from pathlib import Path
+import base64
 import json
-import numpy as np
+import sys
 
 # -------- paths --------
 BASE_DIR = Path(__file__).resolve().parents[1]
 DATA_PATH = BASE_DIR / "data_clean" / "fitbit_daily_clean.csv"
 OUT_DIR = BASE_DIR / "outputs"
-OUT_DIR.mkdir(exist_ok=True)
-
-# -------- load --------
-df = pd.read_csv(DATA_PATH)
-
-# garantir tipos
-df["ActivityDate"] = pd.to_datetime(df["ActivityDate"], errors="coerce")
-df = df.dropna(subset=["ActivityDate"])
-
-# -------- KPIs --------
-users = int(df["Id"].nunique())
-days = int(df["ActivityDate"].nunique())
-avg_steps = float(df["TotalSteps"].mean())
-avg_cal = float(df["Calories"].mean())
-avg_sleep = float(df["TotalMinutesAsleep"].mean())
-avg_sedent = float(df["SedentaryMinutes"].mean())
-avg_very_active = float(df["VeryActiveMinutes"].mean())
-
-corr_steps_sleep = float(df[["TotalSteps", "TotalMinutesAsleep"]].corr().iloc[0, 1])
-corr_steps_cal = float(df[["TotalSteps", "Calories"]].corr().iloc[0, 1])
-
-# -------- aggregations --------
-weekday_order = ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
-
-steps_weekday = (
-    df.groupby("weekday")["TotalSteps"].mean()
-    .reindex(weekday_order)
-    .fillna(0)
-)
-
-sleep_weekday = (
-    df.groupby("weekday")["TotalMinutesAsleep"].mean()
-    .reindex(weekday_order)
-    .fillna(0)
-)
-
-# scatter: downsample para não pesar
-scatter = df[["TotalSteps", "Calories", "TotalMinutesAsleep", "SedentaryMinutes", "VeryActiveMinutes"]].copy()
-if len(scatter) > 3000:
-    scatter = scatter.sample(3000, random_state=42)
-
-scatter_steps_cal = [{"x": int(x), "y": int(y)} for x, y in zip(scatter["TotalSteps"], scatter["Calories"])]
-
-# histogram (passos)
-bins = np.linspace(df["TotalSteps"].min(), df["TotalSteps"].max(), 16)
-hist_counts, hist_edges = np.histogram(df["TotalSteps"], bins=bins)
-hist_labels = [f"{int(hist_edges[i])}–{int(hist_edges[i+1])}" for i in range(len(hist_edges)-1)]
-
-# tabela resumo por usuário
-user_summary = (
-    df.groupby("Id")
-      .agg(
-          dias=("ActivityDate", "nunique"),
-          passos_medios=("TotalSteps", "mean"),
-          calorias_medias=("Calories", "mean"),
-          sono_medio_min=("TotalMinutesAsleep", "mean"),
-          sedentario_medio_min=("SedentaryMinutes", "mean"),
-          muito_ativo_medio_min=("VeryActiveMinutes", "mean")
-      )
-      .reset_index()
-)
-
-# arredondar p/ ficar bonito
-user_summary["passos_medios"] = user_summary["passos_medios"].round(0).astype(int)
-user_summary["calorias_medias"] = user_summary["calorias_medias"].round(0).astype(int)
-user_summary["sono_medio_min"] = user_summary["sono_medio_min"].round(1)
-user_summary["sedentario_medio_min"] = user_summary["sedentario_medio_min"].round(1)
-user_summary["muito_ativo_medio_min"] = user_summary["muito_ativo_medio_min"].round(1)
-
-# para tabela no HTML
-table_rows = user_summary.to_dict(orient="records")
-
-data_payload = {
-    "kpis": {
-        "users": users,
-        "days": days,
-        "avg_steps": round(avg_steps, 0),
-        "avg_cal": round(avg_cal, 0),
-        "avg_sleep": round(avg_sleep, 1),
-        "avg_sedent": round(avg_sedent, 1),
-        "avg_very_active": round(avg_very_active, 1),
-        "corr_steps_sleep": round(corr_steps_sleep, 3),
-        "corr_steps_cal": round(corr_steps_cal, 3),
-    },
-    "steps_weekday": {
-        "labels": weekday_order,
-        "values": [float(v) for v in steps_weekday.values],
-    },
-    "sleep_weekday": {
-        "labels": weekday_order,
-        "values": [float(v) for v in sleep_weekday.values],
-    },
-    "scatter_steps_cal": scatter_steps_cal,
-    "hist_steps": {
-        "labels": hist_labels,
-        "values": hist_counts.tolist(),
-    },
-    "table": table_rows,
-}
-
-# -------- HTML (Chart.js via CDN) --------
-html = f"""<!DOCTYPE html>
+
+sys.path.append(str(BASE_DIR.parent))
+
+# linhas por bloco: só um bloco + os acumuladores ficam em memória
+CHUNK_SIZE = 500_000
+
+# scatter: amostra de até 3000 pontos sorteada durante a leitura (memória O(amostra))
+SCATTER_POINTS = 3000
+
+
+def main() -> None:
+    # pandas e os acumuladores só ao gerar o dashboard
+    import pandas as pd
+
+    from common.columnar_cache import iter_chunks
+    from common.density import use_density
+    from common.sampling import ReservoirSampler
+    from common.schema import WEEKDAY_ORDER
+    from fitbit_shards import load_daily, users_from_env
+    from fitbit_stats import DailyStats
+
+    OUT_DIR.mkdir(exist_ok=True)
+
+    # -------- load + agregação (uma passada só) --------
+    cols = [
+        "Id", "ActivityDate", "weekday", "TotalSteps", "Calories",
+        "TotalMinutesAsleep", "SedentaryMinutes", "VeryActiveMinutes",
+    ]
+    # FITBIT_USERS=id1,id2 restringe a análise a esses usuários (lê só os shards deles)
+    user_filter = users_from_env()
+    if user_filter:
+        chunks = [load_daily(DATA_PATH, columns=cols, users=user_filter)]
+    else:
+        chunks = iter_chunks(DATA_PATH, columns=cols, chunksize=CHUNK_SIZE)
+
+    stats = DailyStats()
+    sampler = ReservoirSampler(SCATTER_POINTS, seed=42)
+    for chunk in chunks:
+        # garantir tipos (no cache Parquet já vem como data)
+        chunk["ActivityDate"] = pd.to_datetime(chunk["ActivityDate"], errors="coerce")
+        chunk = chunk.dropna(subset=["ActivityDate"])
+
+        stats.update(chunk)
+        # passou do limite: o scatter vira grade de densidade e a amostra não é usada
+        if sampler is not None and use_density(stats.rows):
+            sampler = None
+        if sampler is not None:
+            sampler.update(chunk[["TotalSteps", "Calories"]])
+
+    # -------- KPIs --------
+    means = stats.means()
+    users = stats.n_users()
+    days = stats.n_days()
+    avg_steps = float(means["TotalSteps"])
+    avg_cal = float(means["Calories"])
+    avg_sleep = float(means["TotalMinutesAsleep"])
+    avg_sedent = float(means["SedentaryMinutes"])
+    avg_very_active = float(means["VeryActiveMinutes"])
+
+    corr_steps_sleep = stats.corr("steps_sleep")
+    corr_steps_cal = stats.corr("steps_cal")
+
+    # -------- aggregations --------
+    weekday_order = WEEKDAY_ORDER
+
+    steps_weekday = stats.weekday_means("TotalSteps")
+    sleep_weekday = stats.weekday_means("TotalMinutesAsleep")
+
+    # p50/p90/p99 de passos (sketches da mesma passada; erro de rank ~1%)
+    steps_quantiles = stats.steps_quantiles().round(0)
+
+    # acima de SCATTER_DENSITY_THRESHOLD linhas: grade de densidade de todas as linhas (mesma
+    # passada) no lugar da amostra, como PNG embutido (Chart.js não tem heatmap)
+    scatter_density = None
+    if sampler is None:
+        # matplotlib só é carregado neste caso
+        from common.charts import ChartJob, render_png
+        from fitbit_charts import steps_vs_calories_density_chart
+
+        png = render_png(ChartJob(steps_vs_calories_density_chart, stats.scatter_density()))
+        scatter_density = "data:image/png;base64," + base64.b64encode(png).decode("ascii")
+        scatter_steps_cal = {"x": [], "y": []}
+    else:
+        # scatter em colunas (x[], y[]): o JS monta os pontos
+        scatter = sampler.result()
+        scatter_steps_cal = {
+            "x": scatter["TotalSteps"].astype("int64").tolist(),
+            "y": scatter["Calories"].astype("int64").tolist(),
+        }
+
+    # histogram (passos)
+    hist_counts, hist_edges = stats.histogram(15)
+    hist_labels = [f"{int(hist_edges[i])}–{int(hist_edges[i+1])}" for i in range(len(hist_edges)-1)]
+
+    # tabela resumo por usuário
+    user_summary = stats.user_summary({
+        "passos_medios": "TotalSteps",
+        "calorias_medias": "Calories",
+        "sono_medio_min": "TotalMinutesAsleep",
+        "sedentario_medio_min": "SedentaryMinutes",
+        "muito_ativo_medio_min": "VeryActiveMinutes",
+    })
+
+    # arredondar p/ ficar bonito
+    user_summary["passos_medios"] = user_summary["passos_medios"].round(0).astype(int)
+    user_summary["calorias_medias"] = user_summary["calorias_medias"].round(0).astype(int)
+    user_summary["sono_medio_min"] = user_summary["sono_medio_min"].round(1)
+    user_summary["sedentario_medio_min"] = user_summary["sedentario_medio_min"].round(1)
+    user_summary["muito_ativo_medio_min"] = user_summary["muito_ativo_medio_min"].round(1)
+
+    # para tabela no HTML
+    table_rows = user_summary.to_dict(orient="records")
+
+    data_payload = {
+        "kpis": {
+            "users": users,
+            "days": days,
+            "avg_steps": round(avg_steps, 0),
+            "avg_cal": round(avg_cal, 0),
+            "avg_sleep": round(avg_sleep, 1),
+            "avg_sedent": round(avg_sedent, 1),
+            "avg_very_active": round(avg_very_active, 1),
+            "corr_steps_sleep": round(corr_steps_sleep, 3),
+            "corr_steps_cal": round(corr_steps_cal, 3),
+        },
+        "steps_weekday": {
+            "labels": weekday_order,
+            "values": [float(v) for v in steps_weekday.values],
+        },
+        "sleep_weekday": {
+            "labels": weekday_order,
+            "values": [float(v) for v in sleep_weekday.values],
+        },
+        "steps_quantiles": {
+            "labels": steps_quantiles.index.tolist(),
+            **{p: [None if pd.isna(v) else int(v) for v in steps_quantiles[p]] for p in steps_quantiles.columns},
+        },
+        "scatter_steps_cal": scatter_steps_cal,
+        "scatter_density": scatter_density,
+        "hist_steps": {
+            "labels": hist_labels,
+            "values": hist_counts.tolist(),
+        },
+        "table": table_rows,
+    }
+
+    # -------- HTML (Chart.js via CDN) --------
+    html = f"""<!DOCTYPE html>
 <html lang="pt-br">
 <head>
   <meta charset="UTF-8" />
@@ -166,12 +212,23 @@ html = f"""<!DOCTYPE html>
       <p class="small">Mostra concentração de usuários em faixas de atividade.</p>
     </div>
     <div class="panel">
-      <h3>Passos vs Calorias (amostra)</h3>
+      <h3 id="scatterTitle">Passos vs Calorias (amostra)</h3>
       <canvas id="chartScatter"></canvas>
       <p class="small">Visualiza relação moderada entre passos e calorias.</p>
     </div>
   </div>
 
+  <h2 style="margin-top:20px;">Passos por dia da semana: mediana e percentis</h2>
+  <p class="small">p50 = metade dos dias fica abaixo; p90/p99 = dias mais ativos. Estimados por sketch (erro de rank ~1%).</p>
+  <div style="border:1px solid #e6e6e6; border-radius: 12px;">
+    <table id="tblQuantiles">
+      <thead>
+        <tr><th>Dia</th><th>p50</th><th>p90</th><th>p99</th></tr>
+      </thead>
+      <tbody></tbody>
+    </table>
+  </div>
+
   <h2 style="margin-top:20px;">Tabela: resumo por usuário</h2>
   <div class="tools">
     <input id="search" placeholder="Filtrar por Id (ex: 8877...)"/>
@@ -224,6 +281,13 @@ html = f"""<!DOCTYPE html>
     document.getElementById("corr1").textContent = k.corr_steps_sleep;
     document.getElementById("corr2").textContent = k.corr_steps_cal;
 
+    // ---------- Quantis de passos ----------
+    const q = DATA.steps_quantiles;
+    const fmtSteps = v => v === null ? "—" : v.toLocaleString('pt-BR');
+    document.querySelector("#tblQuantiles tbody").innerHTML = q.labels.map((d, i) =>
+      `<tr><td>${{d}}</td><td>${{fmtSteps(q.p50[i])}}</td><td>${{fmtSteps(q.p90[i])}}</td><td>${{fmtSteps(q.p99[i])}}</td></tr>`
+    ).join("");
+
     // ---------- Insights automáticos ----------
     const insight = document.getElementById("insightBox");
     const corrSleep = k.corr_steps_sleep;
@@ -284,24 +348,33 @@ html = f"""<!DOCTYPE html>
       }}
     }});
 
-    // Scatter passos vs calorias
-    new Chart(document.getElementById("chartScatter"), {{
-      type: 'scatter',
-      data: {{
-        datasets: [{{
-          label: "Passos vs Calorias",
-          data: DATA.scatter_steps_cal
-        }}]
-      }},
-      options: {{
-        responsive: true,
-        plugins: {{ legend: {{ display:false }} }},
-        scales: {{
-          x: {{ title: {{ display:true, text:"TotalSteps" }} }},
-          y: {{ title: {{ display:true, text:"Calories" }} }}
+    // Scatter passos vs calorias (base grande: imagem da grade de densidade no lugar do canvas)
+    if (DATA.scatter_density) {{
+      const img = document.createElement("img");
+      img.src = DATA.scatter_density;
+      img.alt = "Densidade de passos vs calorias";
+      img.style.width = "100%";
+      document.getElementById("chartScatter").replaceWith(img);
+      document.getElementById("scatterTitle").textContent = "Passos vs Calorias (densidade, todas as linhas)";
+    }} else {{
+      new Chart(document.getElementById("chartScatter"), {{
+        type: 'scatter',
+        data: {{
+          datasets: [{{
+            label: "Passos vs Calorias",
+            data: DATA.scatter_steps_cal.x.map((x, i) => ({{ x, y: DATA.scatter_steps_cal.y[i] }}))
+          }}]
+        }},
+        options: {{
+          responsive: true,
+          plugins: {{ legend: {{ display:false }} }},
+          scales: {{
+            x: {{ title: {{ display:true, text:"TotalSteps" }} }},
+            y: {{ title: {{ display:true, text:"Calories" }} }}
+          }}
         }}
-      }}
-    }});
+      }});
+    }}
 
     // ---------- Table (filter + sort) ----------
     let rows = DATA.table.slice();
@@ -356,7 +429,11 @@ html = f"""<!DOCTYPE html>
 </html>
 """
 
-out_path = OUT_DIR / "dashboard_bellabeat.html"
-out_path.write_text(html, encoding="utf-8")
+    out_path = OUT_DIR / "dashboard_bellabeat.html"
+    out_path.write_text(html, encoding="utf-8")
+
+    print("✅ Dashboard criado:", out_path)
+
 
-print("✅ Dashboard criado:", out_path)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+from common.charts import pyplot
+from common.density import draw_density
+
+
+def _pyplot():
+    # pyplot + seaborn (import lento) só quando um gráfico é desenhado, com o
+    # estilo do EDA aplicado no processo que desenha (também nos do common/charts.py)
+    import seaborn as sns
+
+    plt = pyplot()
+    sns.set(style="whitegrid")
+    return plt, sns
+
+
+# ==============================
+# Desenho: recebem só os dados já calculados no 02_eda.py
+# ==============================
+def steps_vs_calories_chart(df):
+    plt, sns = _pyplot()
+    fig, ax = plt.subplots(figsize=(8, 5))
+    sns.scatterplot(data=df, x="TotalSteps", y="Calories", ax=ax)
+    ax.set_title("Relação entre Passos e Calorias")
+    return fig
+
+
+def steps_vs_calories_density_chart(grid):
+    # (contagens, bordas x, bordas y) da DensityGrid: imagem, não um ponto por linha
+    counts, x_edges, y_edges = grid
+    plt, sns = _pyplot()
+    fig, ax = plt.subplots(figsize=(8, 5))
+    draw_density(ax, counts, x_edges, y_edges)
+    ax.grid(False)
+    ax.set_xlabel("TotalSteps")
+    ax.set_ylabel("Calories")
+    ax.set_title("Relação entre Passos e Calorias (densidade)")
+    return fig
+
+
+def steps_hist_chart(hist):
+    # (contagens, bordas) do StreamingHistogram: mesmas faixas do dashboard
+    counts, edges = hist
+    plt, sns = _pyplot()
+    fig, ax = plt.subplots(figsize=(8, 5))
+    sns.histplot(x=edges[:-1], weights=counts, bins=len(counts), binrange=(edges[0], edges[-1]), ax=ax)
+    ax.set_xlabel("TotalSteps")
+    ax.set_title("Distribuição de Passos Diários")
+    return fig
@@ -0,0 +1,139 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# chave compacta (Id, dia) num int64: código do usuário nos 32 bits altos,
+# dia (ordinal desde 1970, deslocado p/ ficar positivo) nos 32 bits baixos
+DAY_BITS = 32
+DAY_OFFSET = 1 << 31
+# data ausente: último "dia" possível do usuário (ordena no fim e nunca casa com o sono)
+DAY_MISSING = (1 << DAY_BITS) - 1
+
+
+def index_path(csv_path: Path) -> Path:
+    # fitbit_daily_clean.csv → fitbit_daily_clean.index.json
+    return Path(csv_path).with_suffix(".index.json")
+
+
+# ==============================
+# Chaves (Id, dia)
+# ==============================
+def day_ordinal(dates: pd.Series) -> np.ndarray:
+    values = pd.to_datetime(dates).to_numpy("datetime64[D]")
+    days = values.astype(np.int64) + DAY_OFFSET
+    days[np.isnat(values)] = DAY_MISSING
+    return days
+
+
+def user_day_keys(ids: pd.Series, dates: pd.Series, id_values: np.ndarray) -> np.ndarray:
+    """Chave int64 por linha; `id_values` (Ids ordenados) define o código de cada usuário."""
+    codes = np.searchsorted(id_values, ids.to_numpy()).astype(np.int64)
+    return (codes << DAY_BITS) | day_ordinal(dates)
+
+
+def merge_join(left_keys: np.ndarray, right_keys: np.ndarray, right_values: np.ndarray) -> np.ndarray:
+    """Left join por chave: `left_keys` ordenadas, `right_keys` ordenadas e únicas; sem par vira NaN.
+
+    Merge-join: os dois lados são intercalados numa varredura linear (sem
+    tabela hash sobre duas colunas e sem busca binária por linha); cada
+    chave da esquerda casa com a última chave da direita vista até ela.
+    """
+    if len(left_keys) and not (np.diff(left_keys) >= 0).all():
+        raise ValueError("merge_join: chaves do lado esquerdo precisam estar ordenadas")
+    if len(right_keys) and not (np.diff(right_keys) > 0).all():
+        raise ValueError("merge_join: chaves do lado direito precisam ser ordenadas e únicas")
+
+    out = np.full(len(left_keys), np.nan)
+    if len(right_keys) == 0 or len(left_keys) == 0:
+        return out
+
+    # sort estável de int64 é timsort: com duas sequências já ordenadas vira uma
+    # única intercalação linear; no empate a direita (que vem antes) fica primeiro
+    m = len(right_keys)
+    merged = np.argsort(np.r_[right_keys, left_keys], kind="stable")
+    from_right = merged < m
+    last_right = np.maximum.accumulate(np.where(from_right, merged, -1))[~from_right]
+    left_pos = merged[~from_right] - m
+
+    seen = last_right >= 0
+    hit = np.zeros(len(left_pos), dtype=bool)
+    hit[seen] = right_keys[last_right[seen]] == left_keys[left_pos[seen]]
+    out[left_pos[hit]] = right_values[last_right[hit]]
+    return out
+
+
+# ==============================
+# Índice por usuário (gravado ao lado da base limpa)
+# ==============================
+def build_user_index(df: pd.DataFrame) -> dict:
+    """Faixas de linhas [início, fim) de cada Id; `df` precisa estar ordenado por (Id, dia)."""
+    ids = df["Id"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else np.array([], dtype=int)
+    return {
+        "rows": int(len(df)),
+        "ids": ids[starts].tolist(),
+        "offsets": np.r_[starts, len(ids)].astype(int).tolist(),
+    }
+
+
+def save_user_index(index: dict, csv_path: Path) -> None:
+    stat = Path(csv_path).stat()
+    payload = {"source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns, **index}
+    index_path(csv_path).write_text(json.dumps(payload), encoding="utf-8")
+
+
+def load_user_index(csv_path: Path, df: pd.DataFrame | None = None) -> dict | None:
+    """Índice atualizado para o CSV (e, se `df` vier, com o mesmo número de linhas); senão None."""
+    path = index_path(csv_path)
+    if not path.exists():
+        return None
+    index = json.loads(path.read_text(encoding="utf-8"))
+
+    csv_path = Path(csv_path)
+    if csv_path.exists():
+        stat = csv_path.stat()
+        if (index["source_size"], index["source_mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+            return None
+    if df is not None and len(df) != index["rows"]:
+        return None  # linhas filtradas depois da leitura: faixas não valem mais
+    return index
+
+
+# ==============================
+# Consultas sem reagrupar o frame inteiro
+# ==============================
+def user_rows(index: dict, users) -> np.ndarray:
+    """Posições das linhas dos `users` (na ordem da base) direto pelas faixas do índice; Ids ausentes ficam de fora."""
+    ids = np.asarray(index["ids"], dtype=np.int64)
+    offsets = np.asarray(index["offsets"], dtype=np.int64)
+    users = np.unique(np.asarray(users, dtype=np.int64))
+    pos = np.searchsorted(ids, users)
+    found = pos < len(ids)
+    found[found] = ids[pos[found]] == users[found]
+    ranges = [np.arange(offsets[p], offsets[p + 1]) for p in pos[found]]
+    return np.concatenate(ranges) if ranges else np.array([], dtype=np.int64)
+
+
+def user_day_rows(df: pd.DataFrame, index: dict, user_id: int, day) -> np.ndarray:
+    """Posições das linhas de um (Id, dia): faixa do usuário + busca binária nos dias (ordenados dentro dela)."""
+    rows = user_rows(index, [user_id])
+    if len(rows) == 0:
+        return rows
+    days = day_ordinal(df["ActivityDate"].iloc[rows])
+    target = day_ordinal(pd.Series([day]))[0]
+    return rows[np.searchsorted(days, target, "left"):np.searchsorted(days, target, "right")]
+
+
+def per_user_mean(df: pd.DataFrame, index: dict, col: str) -> pd.Series:
+    """Equivalente a df.groupby("Id")[col].mean() usando as faixas contíguas do índice."""
+    values = df[col].to_numpy(dtype="float64", na_value=np.nan)
+    starts = np.asarray(index["offsets"][:-1])
+    valid = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(valid, values, 0.0), starts) if len(starts) else np.array([])
+    counts = np.add.reduceat(valid.astype(np.int64), starts) if len(starts) else np.array([])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    return pd.Series(means, index=pd.Index(index["ids"], name="Id"), name=col)
+
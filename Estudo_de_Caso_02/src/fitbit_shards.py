@@ -0,0 +1,48 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+
+# common/ entra no sys.path pelos scripts (BASE_DIR.parent)
+from common.columnar_cache import read_table
+from common.shards import load_manifest, read_shards
+from fitbit_index import load_user_index, user_rows
+
+# filtro de usuários: FITBIT_USERS=1503960366,1624580081 python src/03_dashboard.py
+USERS_ENV = "FITBIT_USERS"
+
+
+def shards_dir(csv_path: Path) -> Path:
+    # fitbit_daily_clean.csv → fitbit_daily_clean_shards/
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f"{csv_path.stem}_shards")
+
+
+def users_from_env() -> list | None:
+    raw = os.environ.get(USERS_ENV, "").strip()
+    if not raw:
+        return None
+    return [int(u) for u in raw.replace(";", ",").split(",") if u.strip()]
+
+
+def load_daily(csv_path: Path, columns: list | None = None, users: list | None = None) -> pd.DataFrame:
+    """Base diária inteira, ou só os `users` pedidos lendo apenas os shards deles."""
+    if not users:
+        return read_table(csv_path, columns=columns)
+
+    manifest = load_manifest(shards_dir(csv_path), csv_path)
+    if manifest is not None:
+        df = read_shards(shards_dir(csv_path), manifest, users, columns)
+    else:
+        # shards ausentes/desatualizados: lê tudo e recorta pelas faixas do índice (sem índice, filtra)
+        print("⚠️ Shards por usuário desatualizados: lendo a base inteira (rode 01_process.py)")
+        df = read_table(csv_path, columns=columns)
+        index = load_user_index(csv_path, df)
+        if index is not None:
+            df = df.iloc[user_rows(index, users)].reset_index(drop=True)
+        else:
+            df = df[df["Id"].isin(users)].reset_index(drop=True)
+
+    if df.empty:
+        raise ValueError(f"Nenhum dos usuários pedidos ({USERS_ENV}) está na base: {users}")
+    return df
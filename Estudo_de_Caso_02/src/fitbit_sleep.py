@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pandas as pd
+
+# minuteSleep é o maior arquivo de entrada: lido em blocos de CHUNK_SIZE linhas
+CHUNK_SIZE = 1_000_000
+
+SLEEP_COLS = ["Id", "date", "value"]
+
+# formato da coluna `date` do minuteSleep (ex.: 4/12/2016 11:33:00 PM)
+SLEEP_DATE_FORMAT = "%m/%d/%Y %I:%M:%S %p"
+
+
+def read_header(path: Path) -> list:
+    return pd.read_csv(path, sep=";", encoding="utf-8", nrows=0).columns.str.strip().tolist()
+
+
+def parse_sleep_dates(s: pd.Series) -> pd.Series:
+    """Converte `date` com o formato fixo; só as linhas que não batem caem na inferência."""
+    parsed = pd.to_datetime(s, format=SLEEP_DATE_FORMAT, errors="coerce")
+    bad = parsed.isna() & s.notna()
+    if bad.any():
+        parsed[bad] = pd.to_datetime(s[bad], format="mixed", errors="coerce")
+    return parsed
+
+
+def sleep_day(s: pd.Series) -> pd.Series:
+    """Dia (datetime64 à meia-noite) de cada linha, sem criar um objeto date por minuto.
+
+    O dia cabe nos 10 primeiros caracteres ("12/31/2016" é o mais longo):
+    cada prefixo distinto é convertido uma vez e espalhado pelos códigos do
+    factorize. Linhas fora do padrão voltam para o parser completo + normalize.
+    """
+    codes, uniques = pd.factorize(s.str.slice(0, 10))
+    day_part = pd.Series(uniques).str.split(" ", n=1).str[0]
+    days = pd.to_datetime(day_part, format=SLEEP_DATE_FORMAT.split(" ")[0], errors="coerce")
+
+    out = pd.Series(days.to_numpy().take(codes), index=s.index, name=s.name)
+    out[codes < 0] = pd.NaT  # valor ausente no factorize
+
+    bad = out.isna() & s.notna()
+    if bad.any():
+        out[bad] = parse_sleep_dates(s[bad]).dt.normalize()
+    return out
+
+
+def _daily_counts(chunk: pd.DataFrame) -> pd.Series:
+    # value == 1 significa dormindo: filtra antes de converter as datas
+    asleep = chunk[chunk["value"] == 1]
+    day = sleep_day(asleep["date"]).rename("ActivityDate")
+    return asleep.groupby([asleep["Id"], day]).size()
+
+
+def daily_sleep_from_minutes(path: Path, chunksize: int = CHUNK_SIZE) -> pd.DataFrame:
+    """Minutos dormidos por (Id, dia) lendo o arquivo minuto a minuto em streaming.
+
+    Só o acumulador diário fica em memória; o resultado é igual ao
+    groupby(["Id", "ActivityDate"]).size() sobre o arquivo inteiro.
+    """
+    chunks = pd.read_csv(
+        path,
+        sep=";",
+        encoding="utf-8",
+        usecols=lambda c: c.strip() in SLEEP_COLS,
+        chunksize=chunksize,
+    )
+
+    total = None
+    for chunk in chunks:
+        chunk.columns = chunk.columns.str.strip()
+        counts = _daily_counts(chunk)
+        # um mesmo dia pode começar num bloco e terminar no seguinte: soma as contagens
+        total = counts if total is None else total.add(counts, fill_value=0)
+
+    if total is None:
+        return pd.DataFrame({
+            "Id": pd.Series(dtype="int64"),
+            "ActivityDate": pd.Series(dtype="datetime64[ns]"),
+            "TotalMinutesAsleep": pd.Series(dtype="int64"),
+        })
+
+    return (
+        total.astype("int64")
+             .sort_index()
+             .reset_index(name="TotalMinutesAsleep")
+    )
@@ -0,0 +1,237 @@
+import numpy as np
+import pandas as pd
+
+from common.density import DensityGrid
+from common.schema import WEEKDAY_ORDER
+from common.sketches import QuantileSketch, StreamingHistogram, merge_groups, quantile_table, sketch_groups
+from fitbit_index import DAY_MISSING, day_ordinal
+
+# colunas com média (KPIs e tabela por usuário)
+MEAN_COLS = ["TotalSteps", "Calories", "TotalMinutesAsleep", "SedentaryMinutes", "VeryActiveMinutes"]
+# pares para correlação de Pearson
+CORR_PAIRS = {
+    "steps_sleep": ("TotalSteps", "TotalMinutesAsleep"),
+    "steps_cal": ("TotalSteps", "Calories"),
+}
+# médias por dia da semana
+WEEKDAY_COLS = ["TotalSteps", "TotalMinutesAsleep"]
+HIST_COL = "TotalSteps"
+# passos são inteiros: buckets de 1 passo mantêm o histograma exato até 65k valores distintos
+HIST_MAX_BUCKETS = 65_536
+
+# p50/p90/p99 de passos (geral e por dia da semana) via QuantileSketch: erro de rank ~1%
+QUANTILE_COL = "TotalSteps"
+
+# scatter passos × calorias como grade de densidade: células de 100 passos × 10 kcal
+SCATTER_COLS = ("TotalSteps", "Calories")
+SCATTER_STEP = (100, 10)
+
+# dias distintos por usuário: bitmask de 64 dias por (Id, bloco)
+DAYS_PER_MASK = 64
+
+
+class _PairMoments:
+    """n, médias, somas de quadrados centradas e produto cruzado de um par (x, y).
+
+    Blocos são combinados pela fórmula de Chan et al. (estável, sem somar x² cru).
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = self.mean_y = 0.0
+        self.m2_x = self.m2_y = self.c_xy = 0.0
+
+    def update(self, x: np.ndarray, y: np.ndarray) -> None:
+        ok = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[ok], y[ok]
+        n_b = len(x)
+        if n_b == 0:
+            return
+        mx, my = x.mean(), y.mean()
+        dx, dy = x - mx, y - my
+        m2x, m2y, cxy = dx @ dx, dy @ dy, dx @ dy
+
+        n = self.n + n_b
+        delta_x, delta_y = mx - self.mean_x, my - self.mean_y
+        w = self.n * n_b / n
+        self.m2_x += m2x + delta_x * delta_x * w
+        self.m2_y += m2y + delta_y * delta_y * w
+        self.c_xy += cxy + delta_x * delta_y * w
+        self.mean_x += delta_x * n_b / n
+        self.mean_y += delta_y * n_b / n
+        self.n = n
+
+    def corr(self) -> float:
+        den = np.sqrt(self.m2_x * self.m2_y)
+        return float(self.c_xy / den) if self.n > 1 and den > 0 else float("nan")
+
+
+def weekday_quantiles(sketches: dict) -> pd.DataFrame:
+    """Tabela dia da semana × p50/p90/p99 (ordem de WEEKDAY_ORDER; dias sem dados ficam NaN)."""
+    return quantile_table(sketches).reindex(WEEKDAY_ORDER)
+
+
+def _or_reduce(ids: np.ndarray, blocks: np.ndarray, masks: np.ndarray):
+    # junta bitmasks repetidos de (Id, bloco) com OR
+    if len(ids) == 0:
+        return ids, blocks, masks
+    order = np.lexsort((blocks, ids))
+    ids, blocks, masks = ids[order], blocks[order], masks[order]
+    starts = np.flatnonzero(np.r_[True, (ids[1:] != ids[:-1]) | (blocks[1:] != blocks[:-1])])
+    return ids[starts], blocks[starts], np.bitwise_or.reduceat(masks, starts)
+
+
+def _popcount(masks: np.ndarray) -> np.ndarray:
+    return np.unpackbits(masks.astype(np.uint64).view(np.uint8)).reshape(-1, 64).sum(axis=1)
+
+
+class DailyStats:
+    """Tudo que o dashboard precisa numa única passada, bloco a bloco.
+
+    Cada bloco é lido uma vez: somas/contagens, momentos das correlações,
+    somas por dia da semana, histograma e sketches de quantis de passos
+    (common/sketches.py), grade de densidade passos × calorias
+    (common/density.py), somas por usuário e bitmask de dias por usuário.
+    Só os acumuladores ficam em memória; as partes por usuário de cada
+    bloco são juntadas uma única vez, na primeira consulta (`_users`).
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.sums = np.zeros(len(MEAN_COLS))
+        self.counts = np.zeros(len(MEAN_COLS), dtype=np.int64)
+        self.pairs = {name: _PairMoments() for name in CORR_PAIRS}
+        self.weekday_sums = np.zeros((len(WEEKDAY_ORDER), len(WEEKDAY_COLS)))
+        self.weekday_counts = np.zeros((len(WEEKDAY_ORDER), len(WEEKDAY_COLS)), dtype=np.int64)
+        self.hist = StreamingHistogram(resolution=1, max_buckets=HIST_MAX_BUCKETS)
+        self.steps_sketch = QuantileSketch()
+        self.weekday_sketches = {}
+        self.scatter_grid = DensityGrid(SCATTER_STEP)
+        self.days = np.array([], dtype=np.int64)
+        # partes por bloco: (ids, somas | contagens) e (ids, bloco de dias, bitmask)
+        self.user_parts = []
+        self.mask_parts = []
+        self._user_table = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        if chunk.empty:
+            return
+        values = np.column_stack([chunk[c].to_numpy(dtype="float64", na_value=np.nan) for c in MEAN_COLS])
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        col = {c: values[:, i] for i, c in enumerate(MEAN_COLS)}
+
+        # KPIs
+        self.rows += len(chunk)
+        self.sums += filled.sum(axis=0)
+        self.counts += valid.sum(axis=0)
+
+        # correlações
+        for name, (x, y) in CORR_PAIRS.items():
+            self.pairs[name].update(col[x], col[y])
+
+        # dia da semana (códigos 0..6 na ordem de WEEKDAY_ORDER; fora da lista = -1)
+        codes = pd.Categorical(chunk["weekday"], categories=WEEKDAY_ORDER).codes
+        known = codes >= 0
+        n_days = len(WEEKDAY_ORDER)
+        for j, c in enumerate(WEEKDAY_COLS):
+            i = MEAN_COLS.index(c)
+            self.weekday_sums[:, j] += np.bincount(codes[known], filled[known, i], n_days)
+            self.weekday_counts[:, j] += np.bincount(codes[known], valid[known, i], n_days).astype(np.int64)
+
+        # histograma: contagem por bucket, faixas escolhidas só no fim
+        self.hist.update(col[HIST_COL])
+
+        # quantis: sketches somados bloco a bloco (memória limitada)
+        self.steps_sketch.update(col[QUANTILE_COL])
+        self.weekday_sketches = merge_groups(
+            self.weekday_sketches, sketch_groups(chunk[QUANTILE_COL], chunk["weekday"])
+        )
+
+        # densidade passos × calorias (o dashboard usa no lugar da amostra quando há muitas linhas)
+        self.scatter_grid.update(col[SCATTER_COLS[0]], col[SCATTER_COLS[1]])
+
+        # dias distintos (global e por usuário)
+        days = day_ordinal(chunk["ActivityDate"])
+        dated = days != DAY_MISSING
+        self.days = np.union1d(self.days, days[dated])
+
+        ids = chunk["Id"].to_numpy(dtype=np.int64)
+        blocks = days[dated] // DAYS_PER_MASK
+        masks = np.left_shift(np.uint64(1), (days[dated] % DAYS_PER_MASK).astype(np.uint64))
+        self.mask_parts.append(_or_reduce(ids[dated], blocks, masks))
+
+        # somas por usuário: a base vem ordenada por Id, então cada usuário é uma faixa contígua
+        # (só a parte do bloco; o total por usuário sai uma vez em _users)
+        starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        self.user_parts.append((
+            ids[starts],
+            np.hstack([np.add.reduceat(filled, starts), np.add.reduceat(valid.astype(np.int64), starts)]),
+        ))
+        self._user_table = None
+
+    # ==============================
+    # Resultados
+    # ==============================
+    def means(self) -> dict:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return dict(zip(MEAN_COLS, self.sums / self.counts))
+
+    def corr(self, name: str) -> float:
+        return self.pairs[name].corr()
+
+    def weekday_means(self, col: str) -> pd.Series:
+        j = WEEKDAY_COLS.index(col)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = self.weekday_sums[:, j] / self.weekday_counts[:, j]
+        return pd.Series(means, index=WEEKDAY_ORDER).fillna(0)
+
+    def histogram(self, n_bins: int = 15):
+        """Mesmo resultado de np.histogram(coluna inteira, linspace(min, max, n_bins + 1))."""
+        return self.hist.histogram(n_bins)
+
+    def steps_quantiles(self) -> pd.DataFrame:
+        """p50/p90/p99 de passos por dia da semana + linha "Todos" (geral)."""
+        out = weekday_quantiles(self.weekday_sketches)
+        out.loc["Todos"] = quantile_table({"Todos": self.steps_sketch}).loc["Todos"]
+        return out
+
+    def scatter_density(self):
+        """(contagens[ny, nx], bordas x, bordas y) de passos × calorias, todas as linhas."""
+        return self.scatter_grid.grid()
+
+    def _users(self) -> pd.DataFrame:
+        # soma das partes de todos os blocos numa passada só (usuário pode cruzar blocos)
+        if self._user_table is None:
+            columns = MEAN_COLS + [f"n_{c}" for c in MEAN_COLS]
+            if self.user_parts:
+                ids = np.concatenate([p[0] for p in self.user_parts])
+                sums = np.vstack([p[1] for p in self.user_parts])
+            else:
+                ids, sums = np.array([], dtype=np.int64), np.zeros((0, len(columns)))
+            table = pd.DataFrame(sums, index=pd.Index(ids, name="Id"), columns=columns)
+            self._user_table = table.groupby(level=0).sum()
+        return self._user_table
+
+    def _user_masks(self) -> tuple:
+        if not self.mask_parts:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([], dtype=np.uint64)
+        return _or_reduce(*(np.concatenate(parts) for parts in zip(*self.mask_parts)))
+
+    def n_users(self) -> int:
+        return len(self._users())
+
+    def n_days(self) -> int:
+        return len(self.days)
+
+    def user_summary(self, names: dict) -> pd.DataFrame:
+        """Médias por usuário (`names`: coluna de saída → coluna de origem) + dias distintos."""
+        user_sums = self._users()
+        ids, _, masks = self._user_masks()
+        bits = pd.Series(_popcount(masks), index=ids)
+        dias = bits.groupby(level=0).sum().reindex(user_sums.index, fill_value=0)
+
+        out = pd.DataFrame({"dias": dias.astype("int64")}, index=user_sums.index)
+        for name, c in names.items():
+            out[name] = user_sums[c] / user_sums[f"n_{c}"]
+        return out.reset_index()
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+CASE_DIR = Path(__file__).resolve().parents[1]
+SRC = CASE_DIR / "src"
+RAW = CASE_DIR / "data_raw"
+CLEAN = CASE_DIR / "data_clean"
+OUTPUTS = CASE_DIR / "outputs"
+
+sys.path.append(str(CASE_DIR.parent))
+from common.pipeline import Pipeline, Stage, helper_modules
+
+DAILY = CLEAN / "fitbit_daily_clean.csv"
+# índice por usuário e shards por Id (gravados pelo 01_process junto com o CSV)
+DAILY_INDEX = CLEAN / "fitbit_daily_clean.index.json"
+DAILY_SHARDS = CLEAN / "fitbit_daily_clean_shards"
+
+# EDA e dashboard só leem a base diária: rodam ao mesmo tempo
+STAGES = [
+    Stage(
+        SRC / "01_process.py",
+        inputs=[RAW / "dailyActivity_merged.csv", RAW / "minuteSleep_merged.csv"],
+        outputs=[DAILY, DAILY_INDEX, DAILY_SHARDS],
+    ),
+    Stage(
+        SRC / "02_eda.py",
+        inputs=[DAILY, DAILY_INDEX, DAILY_SHARDS],
+        outputs=[OUTPUTS / "steps_vs_calories.png", OUTPUTS / "distribuicao_passos.png"],
+        env=["FITBIT_USERS"],
+    ),
+    Stage(
+        SRC / "03_dashboard.py",
+        inputs=[DAILY, DAILY_SHARDS],
+        outputs=[OUTPUTS / "dashboard_bellabeat.html"],
+        env=["FITBIT_USERS"],
+    ),
+]
+
+
+def main() -> None:
+    # --force: roda todas as etapas mesmo atualizadas
+    pipeline = Pipeline(STAGES, root=CASE_DIR, code=helper_modules(SRC) + [CASE_DIR.parent / "common"])
+    ok = pipeline.run(force="--force" in sys.argv[1:])
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,44 @@
-import pandas as pd
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 RAW_DIR = BASE_DIR / "data_raw"
 OUT_DIR = BASE_DIR / "data_clean"
-OUT_DIR.mkdir(exist_ok=True)
 
-files = sorted(RAW_DIR.glob("*.csv"))
+sys.path.append(str(BASE_DIR))
 
-dfs = []
 
-for f in files:
-    year = f.stem
-    df = pd.read_csv(f, sep=";")
+def build(debug_full: bool = False) -> None:
+    """happiness_final.csv direto dos arquivos por ano; com `debug_full`, só o happiness_full.csv."""
+    # pandas (via happiness_io) só ao rodar, não ao importar o módulo
+    from common.columnar_cache import write_table
+    from happiness_io import finalize, load_years
 
-    df.columns = df.columns.str.lower().str.replace(" ", "_")
+    OUT_DIR.mkdir(exist_ok=True)
 
-    # Padronizar nomes principais
-    if "happiness_score" in df.columns:
-        df.rename(columns={"happiness_score": "score"}, inplace=True)
+    files = sorted(RAW_DIR.glob("*.csv"))
 
-    if "happiness.score" in df.columns:
-        df.rename(columns={"happiness.score": "score"}, inplace=True)
+    # leitura + padronização de cada ano em paralelo (ordem dos arquivos preservada);
+    # arquivo fora do padrão interrompe com a lista de erros
+    if debug_full:
+        all_years = load_years(files, project=False)
+        write_table(all_years, OUT_DIR / "happiness_full.csv")
+        print("✅ Dataset reconstruído corretamente! (modo debug: rode 02_clean_final.py)")
+    else:
+        # cada ano já chega projetado nas colunas finais: gera o happiness_final.csv direto
+        df_final = finalize(load_years(files))
+        out = OUT_DIR / "happiness_final.csv"
+        write_table(df_final, out, schema="happiness", encoding="utf-8")
+        print("✅ happiness_final.csv criado!")
+        print("Linhas:", len(df_final), "| Colunas:", df_final.shape[1])
+        print("Colunas finais:", list(df_final.columns))
+        print("Arquivo:", out)
 
-    if "score" not in df.columns and "score" in df.columns:
-        pass
 
-    if "happiness_rank" in df.columns:
-        df.rename(columns={"happiness_rank": "rank"}, inplace=True)
+def main() -> None:
+    # --debug-full: mantém o fluxo em duas etapas (happiness_full.csv → 02_clean_final.py)
+    build(debug_full="--debug-full" in sys.argv[1:])
 
-    if "happiness.rank" in df.columns:
-        df.rename(columns={"happiness.rank": "rank"}, inplace=True)
 
-    df["year"] = int(year)
-
-    dfs.append(df)
-
-all_years = pd.concat(dfs, ignore_index=True)
-
-all_years.to_csv(OUT_DIR / "happiness_full.csv", index=False)
-
-print("✅ Dataset reconstruído corretamente!")
+if __name__ == "__main__":
+    main()
@@ -1,78 +1,90 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import sys
 from pathlib import Path
 
-# Configuração visual
-sns.set(style="whitegrid")
-plt.rcParams["figure.figsize"] = (10, 6)
-
 BASE_DIR = Path(__file__).resolve().parents[2]
 DATA = BASE_DIR / "data_clean" / "happiness_final.csv"
 OUTPUT = BASE_DIR / "outputs"
-OUTPUT.mkdir(exist_ok=True)
-
-df = pd.read_csv(DATA)
-
-print("\n================ RESUMO GERAL ================")
-print(df.info())
-
-print("\n================ MÉDIA DE FELICIDADE POR ANO ================")
-print(df.groupby("year")["score"].mean())
-
-print("\n================ TOP 5 PAÍSES MAIS FELIZES (MÉDIA GERAL) ================")
-print(
-    df.groupby("country")["score"]
-    .mean()
-    .sort_values(ascending=False)
-    .head()
-)
-
-print("\n================ CORRELAÇÃO COM SCORE ================")
-
-corr = df[[
-    "score",
-    "gdp_per_capita",
-    "social_support",
-    "life_expectancy",
-    "freedom",
-    "corruption",
-    "generosity"
-]].corr()
-
-print(corr["score"].sort_values(ascending=False))
-
-# ========================
-# 📊 HEATMAP DE CORRELAÇÃO
-# ========================
-
-plt.figure()
-sns.heatmap(corr, annot=True, cmap="coolwarm", fmt=".2f")
-plt.title("Correlação entre variáveis")
-plt.tight_layout()
-plt.savefig(OUTPUT / "correlation_heatmap.png")
-plt.close()
-
-# ========================
-# 📊 GDP vs Score
-# ========================
-
-plt.figure()
-sns.scatterplot(data=df, x="gdp_per_capita", y="score", hue="region", alpha=0.6)
-plt.title("GDP per Capita vs Happiness Score")
-plt.tight_layout()
-plt.savefig(OUTPUT / "gdp_vs_score.png")
-plt.close()
-
-# ========================
-# 📊 Social Support vs Score
-# ========================
-
-plt.figure()
-sns.scatterplot(data=df, x="social_support", y="score", hue="region", alpha=0.6)
-plt.title("Social Support vs Happiness Score")
-plt.tight_layout()
-plt.savefig(OUTPUT / "support_vs_score.png")
-plt.close()
-
-print("\n✅ Visualizações salvas em /outputs")
+
+sys.path.append(str(BASE_DIR))
+
+
+def main() -> None:
+    # matplotlib/seaborn só entram se algum gráfico precisar ser redesenhado
+    from common.charts import ChartJob, render_charts
+    from common.columnar_cache import read_table
+    from common.density import use_density
+    from common.schema import apply_schema
+    from happiness_charts import (
+        corr_heatmap_chart,
+        gdp_vs_score_chart,
+        gdp_vs_score_density_chart,
+        region_density_data,
+        support_vs_score_chart,
+        support_vs_score_density_chart,
+    )
+
+    OUTPUT.mkdir(exist_ok=True)
+
+    df = read_table(DATA, columns=[
+        "year", "country", "region", "score",
+        "gdp_per_capita", "social_support", "life_expectancy",
+        "freedom", "corruption", "generosity",
+    ])
+    df = apply_schema(df, "happiness", report=True)
+
+    print("\n================ RESUMO GERAL ================")
+    print(df.info())
+
+    # float32 do schema é só armazenamento: médias e correlações em float64
+    score = df["score"].astype("float64")
+
+    print("\n================ MÉDIA DE FELICIDADE POR ANO ================")
+    print(score.groupby(df["year"]).mean())
+
+    print("\n================ TOP 5 PAÍSES MAIS FELIZES (MÉDIA GERAL) ================")
+    print(
+        score.groupby(df["country"], observed=True)
+        .mean()
+        .sort_values(ascending=False)
+        .head()
+    )
+
+    print("\n================ CORRELAÇÃO COM SCORE ================")
+
+    corr = df[[
+        "score",
+        "gdp_per_capita",
+        "social_support",
+        "life_expectancy",
+        "freedom",
+        "corruption",
+        "generosity"
+    ]].astype("float64").corr()
+
+    print(corr["score"].sort_values(ascending=False))
+
+    # ========================
+    # 📊 Heatmap de correlação, GDP vs Score e Social Support vs Score
+    # (desenho em happiness_charts.py, em paralelo; só os gráficos com dados alterados)
+    # acima de SCATTER_DENSITY_THRESHOLD pontos os scatters viram grade de densidade por região
+    # ========================
+    if use_density(len(df)):
+        gdp = (gdp_vs_score_density_chart, region_density_data(df, "gdp_per_capita"))
+        support = (support_vs_score_density_chart, region_density_data(df, "social_support"))
+    else:
+        gdp = (gdp_vs_score_chart, df[["gdp_per_capita", "score", "region"]])
+        support = (support_vs_score_chart, df[["social_support", "score", "region"]])
+
+    status = render_charts([
+        ChartJob(corr_heatmap_chart, corr, OUTPUT / "correlation_heatmap.png"),
+        ChartJob(*gdp, OUTPUT / "gdp_vs_score.png"),
+        ChartJob(*support, OUTPUT / "support_vs_score.png"),
+    ])
+    for name, st in status.items():
+        print(f"  {name}: {st}")
+
+    print("\n✅ Visualizações salvas em /outputs")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,123 +1,144 @@
-import pandas as pd
-import plotly.express as px
+import sys
 from pathlib import Path
 
 # Caminhos
 BASE_DIR = Path(__file__).resolve().parents[2]
 DATA = BASE_DIR / "data_clean" / "happiness_final.csv"
 OUT = BASE_DIR / "outputs" / "dashboard_happiness.html"
-OUT.parent.mkdir(exist_ok=True)
-
-# Ler dados
-df = pd.read_csv(DATA)
-
-# ==============================
-# 0) KPIs: faixa de felicidade por ano (min / média / max)
-# ==============================
-kpi_year = (
-    df.groupby("year")["score"]
-    .agg(["min", "mean", "max", "count"])
-    .reset_index()
-)
-
-# formatar números
-kpi_year["min"] = kpi_year["min"].round(2)
-kpi_year["mean"] = kpi_year["mean"].round(2)
-kpi_year["max"] = kpi_year["max"].round(2)
-
-# ==============================
-# 1️⃣ MÉDIA DE FELICIDADE POR ANO
-# ==============================
-mean_year = df.groupby("year")["score"].mean().reset_index()
-
-fig1 = px.line(
-    mean_year,
-    x="year",
-    y="score",
-    markers=True,
-    title="Média Global de Felicidade por Ano",
-)
-fig1.update_layout(margin=dict(l=30, r=30, t=60, b=30))
-
-# ==============================
-# 2️⃣ TOP 10 PAÍSES MAIS FELIZES
-# ==============================
-top_countries = (
-    df.groupby("country")["score"]
-    .mean()
-    .sort_values(ascending=False)
-    .head(10)
-    .reset_index()
-)
-
-fig2 = px.bar(
-    top_countries,
-    x="score",
-    y="country",
-    orientation="h",
-    title="Top 10 Países Mais Felizes (Média Geral)",
-)
-fig2.update_layout(margin=dict(l=30, r=30, t=60, b=30))
-
-# ==============================
-# 3️⃣ GDP vs SCORE (dispersão)
-# ==============================
-fig3 = px.scatter(
-    df,
-    x="gdp_per_capita",
-    y="score",
-    color="year",
-    hover_data=["country"],
-    title="GDP per Capita vs Felicidade (cada ponto = país em um ano)",
-)
-fig3.update_layout(margin=dict(l=30, r=30, t=60, b=30))
-
-# ==============================
-# 4️⃣ MATRIZ DE CORRELAÇÃO
-# ==============================
-corr_cols = [
-    "score",
-    "gdp_per_capita",
-    "social_support",
-    "life_expectancy",
-    "freedom",
-    "corruption",
-    "generosity",
-]
-corr = df[corr_cols].corr().round(2)
-
-fig4 = px.imshow(
-    corr,
-    text_auto=True,
-    title="Correlação entre Variáveis (quanto mais perto de 1, mais forte a relação)",
-)
-fig4.update_layout(margin=dict(l=30, r=30, t=60, b=30))
-
-# ==============================
-# HTML: cards + resumos + gráficos
-# ==============================
-
-def build_kpi_cards_html(kpi_df: pd.DataFrame) -> str:
-    cards = []
-    for _, row in kpi_df.iterrows():
-        year = int(row["year"])
-        mn = row["min"]
-        md = row["mean"]
-        mx = row["max"]
-        n = int(row["count"])
-        cards.append(f"""
-        <div class="card">
-            <div class="card-year">{year}</div>
-            <div class="card-range">Faixa: <b>{mn}</b> – <b>{mx}</b></div>
-            <div class="card-mean">Média: <b>{md}</b></div>
-            <div class="card-n">Países no ano: {n}</div>
-        </div>
-        """)
-    return "\n".join(cards)
-
-kpi_cards_html = build_kpi_cards_html(kpi_year)
-
-html_header = """
+
+# HAPPINESS_PLOTLY=cdn (padrão: plotly.js do CDN) ou offline (embutido comprimido, ~1,9 MB, abre sem internet)
+PLOTLY_ENV = "HAPPINESS_PLOTLY"
+
+sys.path.append(str(BASE_DIR))
+
+
+def main() -> None:
+    # plotly/pandas só ao gerar o dashboard (importar o módulo é instantâneo)
+    import plotly.express as px
+
+    from common.columnar_cache import read_table
+    from common.density import DensityGrid, heatmap_trace, use_density
+    from common.plotly_bundle import FigureBundle, mode_from_env
+    from common.schema import apply_schema
+    from happiness_cards import write_cards
+    # células da grade de densidade do GDP vs Score: as mesmas dos gráficos do 03_eda
+    from happiness_charts import DENSITY_STEP
+
+    OUT.parent.mkdir(exist_ok=True)
+
+    # Ler dados (Parquet se atualizado, senão CSV; só as colunas usadas)
+    df = read_table(DATA, columns=[
+        "year", "country", "score",
+        "gdp_per_capita", "social_support", "life_expectancy",
+        "freedom", "corruption", "generosity",
+    ])
+    df = apply_schema(df, "happiness", report=True)
+
+    # ==============================
+    # 0) KPIs: faixa de felicidade por ano (min / média / max)
+    # ==============================
+    # float32 do schema é só armazenamento: médias e correlações são calculadas em float64
+    score = df["score"].astype("float64")
+    kpi_year = (
+        score.groupby(df["year"])
+        .agg(["min", "mean", "max", "count"])
+        .reset_index()
+    )
+
+    # formatar números
+    kpi_year["min"] = kpi_year["min"].round(2)
+    kpi_year["mean"] = kpi_year["mean"].round(2)
+    kpi_year["max"] = kpi_year["max"].round(2)
+
+    # ==============================
+    # 1️⃣ MÉDIA DE FELICIDADE POR ANO
+    # ==============================
+    mean_year = score.groupby(df["year"]).mean().reset_index()
+
+    fig1 = px.line(
+        mean_year,
+        x="year",
+        y="score",
+        markers=True,
+        title="Média Global de Felicidade por Ano",
+    )
+    fig1.update_layout(margin=dict(l=30, r=30, t=60, b=30))
+
+    # ==============================
+    # 2️⃣ TOP 10 PAÍSES MAIS FELIZES
+    # ==============================
+    top_countries = (
+        score.groupby(df["country"], observed=True)
+        .mean()
+        .sort_values(ascending=False)
+        .head(10)
+        .reset_index()
+    )
+
+    fig2 = px.bar(
+        top_countries,
+        x="score",
+        y="country",
+        orientation="h",
+        title="Top 10 Países Mais Felizes (Média Geral)",
+    )
+    fig2.update_layout(margin=dict(l=30, r=30, t=60, b=30))
+
+    # ==============================
+    # 3️⃣ GDP vs SCORE (dispersão)
+    # ==============================
+    # acima de SCATTER_DENSITY_THRESHOLD pontos: Heatmap da grade de densidade (tamanho do
+    # HTML e tempo de desenho no navegador não crescem com o número de linhas)
+    if use_density(len(df)):
+        import plotly.graph_objects as go
+
+        grid = DensityGrid(DENSITY_STEP)
+        grid.update(df["gdp_per_capita"], df["score"])
+        # 200×150 células bastam no navegador (o PNG do 03_eda usa a grade cheia)
+        fig3 = go.Figure(heatmap_trace(*grid.grid((200, 150)), hover="gdp_per_capita: %{x:.2f}<br>score: %{y:.2f}"))
+        fig3.update_layout(
+            title="GDP per Capita vs Felicidade (densidade de países-ano)",
+            xaxis_title="gdp_per_capita",
+            yaxis_title="score",
+        )
+    else:
+        fig3 = px.scatter(
+            df[["gdp_per_capita", "score", "year", "country"]].astype({"gdp_per_capita": "float64", "score": "float64"}),
+            x="gdp_per_capita",
+            y="score",
+            color="year",
+            # casas fixas no hover: o valor guardado em float32 não aparece como 7.586999893
+            hover_data={"gdp_per_capita": ":.3f", "score": ":.3f", "country": True},
+            title="GDP per Capita vs Felicidade (cada ponto = país em um ano)",
+        )
+    fig3.update_layout(margin=dict(l=30, r=30, t=60, b=30))
+
+    # ==============================
+    # 4️⃣ MATRIZ DE CORRELAÇÃO
+    # ==============================
+    corr_cols = [
+        "score",
+        "gdp_per_capita",
+        "social_support",
+        "life_expectancy",
+        "freedom",
+        "corruption",
+        "generosity",
+    ]
+    corr = df[corr_cols].astype("float64").corr().round(2)
+
+    fig4 = px.imshow(
+        corr,
+        text_auto=True,
+        title="Correlação entre Variáveis (quanto mais perto de 1, mais forte a relação)",
+    )
+    fig4.update_layout(margin=dict(l=30, r=30, t=60, b=30))
+
+    # ==============================
+    # HTML: cards + resumos + gráficos
+    # ==============================
+
+    html_header = """
 <!doctype html>
 <html lang="pt-br">
 <head>
@@ -199,7 +220,7 @@ html_header = """
   <div class="container">
 """
 
-html_intro = """
+    html_intro = """
     <h1>🌍 World Happiness Dashboard (2015–2019)</h1>
     <div class="subtitle">
       Este dashboard resume como a felicidade (score) varia ao longo do tempo e como ela se relaciona com fatores socioeconômicos.<br>
@@ -213,16 +234,19 @@ html_intro = """
         Isso ajuda a perceber se o ano teve dispersão alta/baixa e se o nível médio mudou ao longo do tempo.
       </p>
       <div class="cards">
-        {cards}
+        """
+
+    # cards são escritos direto no arquivo, entre html_intro e html_intro_end (happiness_cards.py)
+    html_intro_end = """
       </div>
       <div class="note">Observação: o score do World Happiness normalmente varia de 0 a 10.</div>
     </div>
-""".replace("{cards}", kpi_cards_html)
+"""
 
-sections = []
+    sections = []
 
-# Seção 1
-sections.append(("""
+    # Seção 1
+    sections.append(("""
     <div class="section">
       <h2>1) Média global de felicidade por ano</h2>
       <p>
@@ -232,8 +256,8 @@ sections.append(("""
       </p>
 """, fig1))
 
-# Seção 2
-sections.append(("""
+    # Seção 2
+    sections.append(("""
     <div class="section">
       <h2>2) Top 10 países mais felizes (média geral)</h2>
       <p>
@@ -242,8 +266,8 @@ sections.append(("""
       </p>
 """, fig2))
 
-# Seção 3
-sections.append(("""
+    # Seção 3
+    sections.append(("""
     <div class="section">
       <h2>3) GDP per capita vs Felicidade</h2>
       <p>
@@ -252,8 +276,8 @@ sections.append(("""
       </p>
 """, fig3))
 
-# Seção 4
-sections.append(("""
+    # Seção 4
+    sections.append(("""
     <div class="section">
       <h2>4) Correlação entre variáveis</h2>
       <p>
@@ -263,29 +287,33 @@ sections.append(("""
       </p>
 """, fig4))
 
-html_footer = """
+    html_footer = """
   </div>
 </body>
 </html>
 """
 
-# Exportar HTML
-with open(OUT, "w", encoding="utf-8") as f:
-    f.write(html_header)
-    f.write(html_intro)
-
-    # incluir plotlyjs só no primeiro gráfico
-    first = True
-    for section_html, fig in sections:
-        f.write(section_html)
-        if first:
-            f.write(fig.to_html(full_html=False, include_plotlyjs="cdn"))
-            first = False
-        else:
-            f.write(fig.to_html(full_html=False, include_plotlyjs=False))
-        f.write("</div>")  # fecha .section
-
-    f.write(html_footer)
-
-print("✅ Dashboard criado com sucesso!")
-print("Arquivo:", OUT)
+    # Exportar HTML
+    # plotly.js entra uma vez no fim da página; cada figura vira só um <div> + dados compactos
+    bundle = FigureBundle(mode_from_env(PLOTLY_ENV))
+    with open(OUT, "w", encoding="utf-8") as f:
+        f.write(html_header)
+        f.write(html_intro)
+        write_cards(f, kpi_year)
+        f.write(html_intro_end)
+
+        for section_html, fig in sections:
+            f.write(section_html)
+            f.write(bundle.add(fig))
+            f.write("</div>")  # fecha .section
+
+        f.write(bundle.scripts())
+        f.write(html_footer)
+
+    print("✅ Dashboard criado com sucesso!")
+    print("Arquivo:", OUT)
+    print(f"Plotly: {bundle.mode} | tamanho: {OUT.stat().st_size / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
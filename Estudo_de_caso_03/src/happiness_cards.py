@@ -0,0 +1,58 @@
+from itertools import islice
+from string import Formatter
+
+import numpy as np
+import pandas as pd
+
+# card de KPI por ano (mesmo HTML de sempre); campos = colunas de kpi_df
+KPI_CARD_TEMPLATE = """
+        <div class="card">
+            <div class="card-year">{year}</div>
+            <div class="card-range">Faixa: <b>{min}</b> – <b>{max}</b></div>
+            <div class="card-mean">Média: <b>{mean}</b></div>
+            <div class="card-n">Países no ano: {count}</div>
+        </div>
+        """
+
+# colunas inteiras no card (as demais saem com a repr curta do próprio dtype: 3.01, não 3.009999990463257)
+INT_FIELDS = {"year", "count"}
+
+# cards por escrita no arquivo
+BATCH_SIZE = 1_000
+
+
+def compile_template(template: str):
+    """Troca os campos nomeados por posicionais uma única vez: (str.format, campos na ordem)."""
+    parts = []
+    fields = []
+    for literal, name, _, _ in Formatter().parse(template):
+        parts.append(literal.replace("{", "{{").replace("}", "}}"))
+        if name is not None:
+            parts.append("{}")
+            fields.append(name)
+    return "".join(parts).format, fields
+
+
+def _column_text(col: pd.Series, as_int: bool) -> np.ndarray:
+    # KPIs se repetem muito (anos, contagens, scores com 2 casas): formata só os valores distintos
+    if as_int:
+        col = col.astype("int64")
+    codes, uniques = pd.factorize(col, use_na_sentinel=False)
+    return pd.Series(uniques).astype(str).to_numpy(dtype=object)[codes]
+
+
+def iter_cards(df: pd.DataFrame, template: str = KPI_CARD_TEMPLATE):
+    """Um card por linha, a partir das colunas (sem iterrows / Series por linha)."""
+    fmt, fields = compile_template(template)
+    return map(fmt, *(_column_text(df[c], c in INT_FIELDS) for c in fields))
+
+
+def write_cards(f, df: pd.DataFrame, template: str = KPI_CARD_TEMPLATE, sep: str = "\n",
+                batch_size: int = BATCH_SIZE) -> int:
+    """Escreve os cards direto no arquivo, em lotes; devolve quantos foram escritos."""
+    cards = iter_cards(df, template)
+    for start in range(0, len(df), batch_size):
+        if start:
+            f.write(sep)
+        f.write(sep.join(islice(cards, batch_size)))
+    return len(df)
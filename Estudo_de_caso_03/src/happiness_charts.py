@@ -0,0 +1,69 @@
+from common.charts import pyplot
+from common.density import category_grids, draw_category_density, stack_grids
+
+# células da grade de densidade (indicadores em 0–2, score em 0–10)
+DENSITY_STEP = (0.01, 0.01)
+
+
+def _pyplot():
+    # pyplot + seaborn (import lento) só quando um gráfico é desenhado, com a
+    # configuração visual do EDA aplicada no processo que desenha (também nos do common/charts.py)
+    import seaborn as sns
+
+    plt = pyplot()
+    sns.set(style="whitegrid")
+    plt.rcParams["figure.figsize"] = (10, 6)
+    return plt, sns
+
+
+# ==============================
+# Desenho: recebem só os dados já calculados no 03_eda.py
+# ==============================
+def corr_heatmap_chart(corr):
+    plt, sns = _pyplot()
+    fig, ax = plt.subplots()
+    sns.heatmap(corr, annot=True, cmap="coolwarm", fmt=".2f", ax=ax)
+    ax.set_title("Correlação entre variáveis")
+    return fig
+
+
+def _region_scatter(df, x: str, title: str):
+    plt, sns = _pyplot()
+    fig, ax = plt.subplots()
+    sns.scatterplot(data=df, x=x, y="score", hue="region", alpha=0.6, ax=ax)
+    ax.set_title(title)
+    return fig
+
+
+def region_density_data(df, x: str):
+    """Grade de densidade por região de (x, score): o que os gráficos *_density desenham."""
+    return stack_grids(category_grids(df[x], df["score"], df["region"], DENSITY_STEP)), x
+
+
+def _region_density(data, title: str):
+    # uma imagem com a cor média das regiões em cada célula (legenda fixa, sem um artista por ponto)
+    (counts, regions, x_edges, y_edges), x = data
+    plt, sns = _pyplot()
+    fig, ax = plt.subplots()
+    draw_category_density(ax, counts, regions, x_edges, y_edges, sns.color_palette(n_colors=len(regions)), "region")
+    ax.grid(False)
+    ax.set_xlabel(x)
+    ax.set_ylabel("score")
+    ax.set_title(title)
+    return fig
+
+
+def gdp_vs_score_chart(df):
+    return _region_scatter(df, "gdp_per_capita", "GDP per Capita vs Happiness Score")
+
+
+def support_vs_score_chart(df):
+    return _region_scatter(df, "social_support", "Social Support vs Happiness Score")
+
+
+def gdp_vs_score_density_chart(data):
+    return _region_density(data, "GDP per Capita vs Happiness Score (densidade)")
+
+
+def support_vs_score_density_chart(data):
+    return _region_density(data, "Social Support vs Happiness Score (densidade)")
@@ -0,0 +1,191 @@
+import sys
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.append(str(BASE_DIR))
+
+from common.parallel import default_workers, ordered_map
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# processos para ler os arquivos de cada ano (HAPPINESS_WORKERS=1 força modo serial)
+WORKERS = default_workers("HAPPINESS_WORKERS")
+
+
+class DatasetError(ValueError):
+    """Arquivo bruto que não segue o padrão esperado (nome = ano, colunas reconhecíveis)."""
+
+
+# ==============================
+# Tabela de sinônimos (mesmo conceito com nomes diferentes ao longo dos anos)
+# nome canônico → nomes aceitos, em ordem de prioridade (primeiro valor não nulo vence)
+# ==============================
+ALIASES = {
+    # 2019 usa country_or_region
+    "country": ["country", "country_or_region"],
+    # 2015/2016: happiness_rank; 2017: happiness.rank; 2019: overall_rank
+    "rank": ["rank", "happiness_rank", "happiness.rank", "overall_rank"],
+    # 2015/2016: happiness_score; 2017: happiness.score
+    "score": ["score", "happiness_score", "happiness.score"],
+    # 2015/2016: economy_(gdp_per_capita); 2017: economy..gdp.per.capita.
+    "gdp_per_capita": ["gdp_per_capita", "economy_(gdp_per_capita)", "economy..gdp.per.capita."],
+    # 2015/2016 chamava family
+    "social_support": ["social_support", "family"],
+    # 2015/2016: health_(life_expectancy); 2017: health..life.expectancy.; 2019: healthy_life_expectancy
+    "life_expectancy": [
+        "life_expectancy", "health_(life_expectancy)",
+        "healthy_life_expectancy", "health..life.expectancy.",
+    ],
+    # 2019: freedom_to_make_life_choices
+    "freedom": ["freedom", "freedom_to_make_life_choices"],
+    # 2015/2016: trust_(government_corruption); 2017: trust..government.corruption.; 2019: perceptions_of_corruption
+    "corruption": [
+        "corruption", "trust_(government_corruption)",
+        "perceptions_of_corruption", "trust..government.corruption.",
+    ],
+}
+
+
+# colunas do dataset final (happiness_final.csv)
+FINAL_COLS = [
+    "year", "country", "region",
+    "rank", "score",
+    "gdp_per_capita", "social_support", "life_expectancy",
+    "freedom", "corruption", "generosity",
+]
+
+# tipagem numérica (pra correlação/gráficos)
+NUM_COLS = [
+    "score", "rank", "gdp_per_capita", "social_support",
+    "life_expectancy", "freedom", "corruption", "generosity",
+]
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    df.columns = (
+        df.columns.astype(str)
+        .str.strip()
+        .str.lower()
+        .str.replace(" ", "_")
+    )
+    return df
+
+
+def _coalesce(df: pd.DataFrame, cols: list) -> pd.Series:
+    if len(cols) == 1:
+        return df[cols[0]]
+    # matriz (linhas × sinônimos): pega a primeira coluna não nula de cada linha
+    values = df[cols].to_numpy()
+    first = pd.notna(values).argmax(axis=1)
+    picked = values[np.arange(len(values)), first]
+    return pd.Series(picked, index=df.index).infer_objects()
+
+
+def resolve_aliases(df: pd.DataFrame) -> pd.DataFrame:
+    """Troca cada grupo de sinônimos de ALIASES por uma única coluna canônica."""
+    resolved = {}
+    used = set()
+    for canonical, names in ALIASES.items():
+        present = [c for c in names if c in df.columns]
+        if present:
+            resolved[canonical] = _coalesce(df, present)
+            used.update(present)
+
+    rest = df.drop(columns=list(used))
+    return pd.concat([pd.DataFrame(resolved, index=df.index), rest], axis=1)
+
+
+def to_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    for c in NUM_COLS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+    return df
+
+
+def finalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Tipagem, seleção das colunas finais e sanity checks (dataset enxuto)."""
+    df = to_numeric(df)
+
+    if "year" in df.columns:
+        df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int64")
+
+    final_cols = [c for c in FINAL_COLS if c in df.columns]
+    df_final = df[final_cols].copy()
+
+    # Sanity checks (pegar erros tipo score=71 ou 18)
+    # Score do World Happiness é normalmente entre 0 e 10
+    df_final.loc[(df_final["score"] < 0) | (df_final["score"] > 10), "score"] = pd.NA
+
+    # Rank normalmente positivo
+    df_final.loc[(df_final["rank"] <= 0) | (df_final["rank"] > 300), "rank"] = pd.NA
+
+    return df_final
+
+
+# ==============================
+# Leitura + normalização de um arquivo (roda no worker)
+# ==============================
+def read_year(path: Path, project: bool = True) -> pd.DataFrame:
+    """Lê um ano; com `project`, já devolve só as colunas canônicas (FINAL_COLS) tipadas."""
+    try:
+        year = int(path.stem)
+    except ValueError:
+        raise DatasetError(f"{path.name}: nome do arquivo deveria ser o ano (ex.: 2015.csv)") from None
+
+    df = pd.read_csv(path, sep=";")
+
+    # nomes padronizados já na leitura: a união dos anos não carrega colunas sinônimas
+    df = resolve_aliases(normalize_columns(df))
+
+    if "score" not in df.columns:
+        raise DatasetError(f"{path.name}: coluna de score não encontrada em {list(df.columns)}")
+
+    df["year"] = year
+    if project:
+        # projeção no esquema final antes do concat: nada de união larga cheia de NaN
+        df = df[[c for c in FINAL_COLS if c in df.columns]]
+    # numéricas já tipadas em cada ano: um valor solto (ex.: "n.a.") vira NaN, não uma coluna de texto
+    return to_numeric(df)
+
+
+def _read_year_table(path: Path, project: bool):
+    # tabela Arrow: volta do worker sem pickle linha a linha e concatena sem cópia
+    return pa.Table.from_pandas(read_year(path, project), preserve_index=False)
+
+
+def _read_safe(reader, project: bool, path: Path):
+    try:
+        return reader(path, project), None
+    except Exception as e:  # erro vira relatório, não derruba os outros anos
+        return None, str(e) if isinstance(e, DatasetError) else f"{path.name}: {e}"
+
+
+# ==============================
+# Todos os anos (paralelo, ordem preservada)
+# ==============================
+def load_years(files: list, workers: int = WORKERS, project: bool = True) -> pd.DataFrame:
+    reader = partial(_read_safe, _read_year_table if pa is not None else read_year, project)
+    results = ordered_map(reader, files, workers)
+
+    errors = [err for _, err in results if err is not None]
+    if errors:
+        raise DatasetError("Arquivos fora do padrão:\n  - " + "\n  - ".join(errors))
+
+    parts = [part for part, _ in results]
+    if pa is None:
+        return pd.concat(parts, ignore_index=True)
+
+    # união das colunas de todos os anos; tipos diferentes são promovidos (int → float etc.)
+    try:
+        table = pa.concat_tables(parts, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # coluna fora de NUM_COLS com número num ano e texto em outro (só no modo --debug-full)
+        return pd.concat([part.to_pandas() for part in parts], ignore_index=True)
+    return table.to_pandas()
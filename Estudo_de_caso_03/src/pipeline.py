@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+# mesmos caminhos dos scripts (data_raw/, data_clean/ e outputs/ na raiz)
+BASE_DIR = Path(__file__).resolve().parents[2]
+SRC = Path(__file__).resolve().parent
+FINAL = BASE_DIR / "data_clean" / "happiness_final.csv"
+OUTPUTS = BASE_DIR / "outputs"
+
+sys.path.append(str(BASE_DIR))
+from common.pipeline import Pipeline, Stage, helper_modules
+
+# 01_build_dataset já gera o happiness_final.csv; 02_clean_final.py só entra
+# no fluxo --debug-full e fica fora do pipeline. EDA e dashboard rodam ao mesmo tempo.
+STAGES = [
+    Stage(SRC / "01_build_dataset.py", inputs=[BASE_DIR / "data_raw"], outputs=[FINAL]),
+    Stage(
+        SRC / "03_eda.py",
+        inputs=[FINAL],
+        outputs=[OUTPUTS / name for name in ["correlation_heatmap.png", "gdp_vs_score.png", "support_vs_score.png"]],
+    ),
+    Stage(
+        SRC / "04_dashboard.py",
+        inputs=[FINAL],
+        outputs=[OUTPUTS / "dashboard_happiness.html"],
+        env=["HAPPINESS_PLOTLY"],
+    ),
+]
+
+
+def main() -> None:
+    # --force: roda todas as etapas mesmo atualizadas
+    pipeline = Pipeline(STAGES, root=BASE_DIR, code=helper_modules(SRC) + [BASE_DIR / "common"])
+    ok = pipeline.run(force="--force" in sys.argv[1:])
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark: desenho de gráficos em paralelo com common/charts.py.
+
+Monta N scatterplots do seaborn com hue="region" (o gráfico mais lento dos
+EDAs) sobre uma base sintética e compara:
+
+- serial (CHART_WORKERS=1, como os scripts faziam antes)
+- pool de processos (um gráfico por processo, até `workers`)
+- segunda execução com os mesmos dados (nenhum PNG é redesenhado)
+
+Com núcleos suficientes o tempo do pool fica perto do gráfico mais lento.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_charts.py [graficos] [linhas] [workers]
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "Estudo_de_caso_03" / "src"))
+
+from common.charts import ChartJob, render_charts, render_png
+from happiness_charts import gdp_vs_score_chart
+
+
+def timed(label: str, fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    dt = time.perf_counter() - t0
+    print(f"{label:<44} {dt:8.2f} s")
+    return dt
+
+
+def main() -> None:
+    n_charts = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    n_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+    rng = np.random.default_rng(0)
+    regions = [f"Region {i}" for i in range(10)]
+    frames = [
+        pd.DataFrame({
+            "gdp_per_capita": rng.uniform(0, 2, n_rows),
+            "score": rng.uniform(2, 8, n_rows),
+            "region": pd.Categorical(rng.choice(regions, n_rows), categories=regions),
+        })
+        for _ in range(n_charts)
+    ]
+    print(f"Gráficos: {n_charts} | linhas por gráfico: {n_rows:,} | workers: {workers} | núcleos: {os.cpu_count()}\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        serial_dir, pool_dir = Path(tmp) / "serial", Path(tmp) / "pool"
+        serial_dir.mkdir()
+        pool_dir.mkdir()
+
+        def jobs(out_dir: Path) -> list:
+            return [ChartJob(gdp_vs_score_chart, df, out_dir / f"chart_{i}.png") for i, df in enumerate(frames)]
+
+        slowest = max(
+            timed(f"  gráfico {i} sozinho", lambda job=job: render_png(job))
+            for i, job in enumerate(jobs(serial_dir))
+        )
+        print()
+        timed("serial (1 processo)", lambda: render_charts(jobs(serial_dir), workers=1))
+        timed(f"pool ({workers} processos)", lambda: render_charts(jobs(pool_dir), workers=workers))
+        timed("pool, dados sem mudança (só hash)", lambda: render_charts(jobs(pool_dir), workers=workers))
+        print(f"\nGráfico mais lento sozinho: {slowest:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark: scatter ponto a ponto vs grade de densidade (common/density.py).
+
+Para N pontos sintéticos (passos × calorias) compara:
+
+- sns.scatterplot de todas as linhas (como o 02_eda fazia) → PNG e SVG
+- DensityGrid (em blocos) + imshow → PNG e SVG
+- px.scatter vs Heatmap da grade → tamanho do JSON da figura Plotly
+
+O tempo e o tamanho da versão em grade quase não mudam com N.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_density.py [pontos ...]
+"""
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "Estudo_de_Caso_02" / "src"))
+
+from common.charts import ChartJob, render_png
+from common.density import DensityGrid, heatmap_trace
+from fitbit_charts import steps_vs_calories_chart, steps_vs_calories_density_chart
+from fitbit_stats import SCATTER_STEP
+
+import matplotlib.pyplot as plt
+import plotly.express as px
+import plotly.graph_objects as go
+
+CHUNK = 500_000
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def svg_size(job: ChartJob) -> int:
+    fig = job.plot(job.data)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="svg")
+    plt.close(fig)
+    return len(buf.getvalue())
+
+
+def density(df: pd.DataFrame):
+    grid = DensityGrid(SCATTER_STEP)
+    for start in range(0, len(df), CHUNK):
+        part = df.iloc[start:start + CHUNK]
+        grid.update(part["TotalSteps"], part["Calories"])
+    return grid.grid()
+
+
+def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    rng = np.random.default_rng(0)
+    print(f"{'pontos':>10} {'modo':<10} {'tempo':>9} {'PNG':>9} {'SVG':>11} {'Plotly JSON':>12}")
+    for n in sizes:
+        steps = rng.gamma(2.5, 3000, n).round()
+        df = pd.DataFrame({
+            "TotalSteps": steps,
+            "Calories": (1500 + 0.06 * steps + rng.normal(0, 350, n)).round(),
+        })
+
+        scatter = ChartJob(steps_vs_calories_chart, df)
+        png, t_scatter = timed(lambda: render_png(scatter))
+        svg = svg_size(scatter)
+        plotly_json = len(px.scatter(df, x="TotalSteps", y="Calories").to_json())
+        print(f"{n:>10,} {'pontos':<10} {t_scatter:>8.2f}s {len(png) / 1024:>7.0f}KB {svg / 1024:>9.0f}KB {plotly_json / 1024:>10.0f}KB")
+
+        def grid_png():
+            return render_png(ChartJob(steps_vs_calories_density_chart, density(df)))
+
+        png, t_grid = timed(grid_png)
+        grid_job = ChartJob(steps_vs_calories_density_chart, density(df))
+        svg = svg_size(grid_job)
+        plotly_json = len(go.Figure(heatmap_trace(*grid_job.data)).to_json())
+        print(f"{'':>10} {'densidade':<10} {t_grid:>8.2f}s {len(png) / 1024:>7.0f}KB {svg / 1024:>9.0f}KB {plotly_json / 1024:>10.0f}KB")
+        print(f"{'':>10} {'ganho':<10} {t_scatter / t_grid:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: ler poucos usuários da base diária do Fitbit (Case 02).
+
+Gera uma base sintética com muitos usuários, grava CSV + cache Parquet
+(write_table) e os shards por hash do Id (write_shards), e compara o tempo
+para carregar um recorte de poucos usuários:
+
+- CSV inteiro + filtro
+- cache Parquet inteiro + filtro
+- só os shards dos usuários pedidos (fitbit_shards.load_daily)
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_fitbit_shards.py [usuarios] [recorte]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "Estudo_de_Caso_02" / "src"))
+
+from common.columnar_cache import read_table, write_table
+from common.shards import write_shards
+from fitbit_shards import load_daily, shards_dir
+
+
+def timed(label: str, fn, repeat: int = 5):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    print(f"{label:<40} {best * 1000:10.1f} ms")
+    return out, best
+
+
+def synthetic_daily(users: int, days: int = 31) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    ids = np.sort(rng.choice(9_000_000_000, users, replace=False) + 1_000_000_000)
+    n = users * days
+    return pd.DataFrame({
+        "Id": np.repeat(ids, days),
+        "ActivityDate": np.tile(pd.date_range("2016-04-12", periods=days), users),
+        "TotalSteps": rng.integers(0, 20_000, n),
+        "Calories": rng.integers(1_200, 4_000, n),
+        "TotalMinutesAsleep": rng.integers(0, 600, n).astype(float),
+    })
+
+
+def main() -> None:
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    wanted = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    df = synthetic_daily(users)
+    pick = df["Id"].drop_duplicates().sample(wanted, random_state=1).tolist()
+    cols = ["Id", "TotalSteps", "Calories"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = Path(tmp) / "fitbit_daily_clean.csv"
+        t0 = time.perf_counter()
+        write_table(df, csv)
+        manifest = write_shards(df, shards_dir(csv), key="Id", source_path=csv)
+        print(f"Usuários: {users:,} | linhas: {len(df):,} | shards: {manifest['n_shards']}")
+        print(f"Escrita (CSV + Parquet + shards): {time.perf_counter() - t0:.1f} s\n")
+
+        full_csv, _ = timed("CSV inteiro + filtro", lambda: (
+            lambda d: d[d["Id"].isin(pick)])(pd.read_csv(csv, usecols=cols)), repeat=1)
+        full_pq, _ = timed("Parquet inteiro + filtro", lambda: (
+            lambda d: d[d["Id"].isin(pick)])(read_table(csv, columns=cols)))
+        sharded, _ = timed(f"shards ({wanted} usuários)", lambda: load_daily(csv, cols, users=pick))
+
+    key = ["Id", "TotalSteps"]
+    expected = full_pq.sort_values(key).reset_index(drop=True)
+    assert sharded.sort_values(key).reset_index(drop=True).equals(expected), "resultados diferentes!"
+    assert len(full_csv) == len(sharded)
+
+
+if __name__ == "__main__":
+    main()
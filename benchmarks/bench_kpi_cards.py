@@ -0,0 +1,90 @@
+"""Benchmark: cards de KPI do dashboard de felicidade (Case 03) com muitos cards.
+
+Gera uma tabela de KPIs sintética (ex.: um card por país/região × ano) e
+compara o tempo para escrever os cards num arquivo HTML:
+
+- iterrows + f-string por linha + "\\n".join (caminho antigo)
+- happiness_cards.write_cards (colunas → strings vetorizadas, escrita em lotes)
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_kpi_cards.py [cards]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "Estudo_de_caso_03" / "src"))
+
+from happiness_cards import write_cards
+
+
+def iterrows_cards(kpi_df: pd.DataFrame) -> str:
+    # caminho antigo do 04_dashboard.py
+    cards = []
+    for _, row in kpi_df.iterrows():
+        year = int(row["year"])
+        mn = row["min"]
+        md = row["mean"]
+        mx = row["max"]
+        n = int(row["count"])
+        cards.append(f"""
+        <div class="card">
+            <div class="card-year">{year}</div>
+            <div class="card-range">Faixa: <b>{mn}</b> – <b>{mx}</b></div>
+            <div class="card-mean">Média: <b>{md}</b></div>
+            <div class="card-n">Países no ano: {n}</div>
+        </div>
+        """)
+    return "\n".join(cards)
+
+
+def timed(label: str, fn, repeat: int = 3) -> float:
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    print(f"{label:<40} {best * 1000:10.1f} ms")
+    return best
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rng = np.random.default_rng(0)
+    # float64 (mesma saída nos dois caminhos: repr curta do float)
+    lo = rng.uniform(2, 5, n).round(2)
+    kpi_df = pd.DataFrame({
+        "year": rng.integers(2015, 2020, n),
+        "min": lo,
+        "mean": (lo + rng.uniform(0, 2, n)).round(2),
+        "max": (lo + rng.uniform(2, 4, n)).round(2),
+        "count": rng.integers(1, 200, n),
+    })
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path, new_path = Path(tmp) / "old.html", Path(tmp) / "new.html"
+
+        def old():
+            with open(old_path, "w", encoding="utf-8") as f:
+                f.write(iterrows_cards(kpi_df))
+
+        def new():
+            with open(new_path, "w", encoding="utf-8") as f:
+                write_cards(f, kpi_df)
+
+        print(f"Cards: {n:,}\n")
+        t_old = timed("iterrows + f-string", old)
+        t_new = timed("write_cards (colunas, em lotes)", new)
+        same = old_path.read_bytes() == new_path.read_bytes()
+        print(f"\nGanho: {t_old / t_new:.1f}x | HTML idêntico: {'sim' if same else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
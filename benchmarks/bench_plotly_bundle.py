@@ -0,0 +1,79 @@
+"""Benchmark: tamanho do HTML do dashboard de felicidade (Case 03) com Plotly.
+
+Gera uma base sintética (países × anos), monta as mesmas 4 figuras do
+04_dashboard.py e compara o tamanho da página:
+
+- fig.to_html por figura (caminho antigo: JSON inline + template repetido), CDN
+- fig.to_html com plotly.js inline (offline "ingênuo")
+- FigureBundle cdn / offline (plotly.js comprimido uma vez, dados compactos)
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_plotly_bundle.py [paises] [anos]
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from common.plotly_bundle import FigureBundle
+
+
+def make_figures(n_countries: int, n_years: int) -> list:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "year": np.repeat(np.arange(2015, 2015 + n_years), n_countries).astype("int16"),
+        "country": np.tile([f"Country{i}" for i in range(n_countries)], n_years),
+        "score": rng.uniform(2, 8, n_countries * n_years).astype("float32"),
+        "gdp_per_capita": rng.uniform(0, 2, n_countries * n_years).astype("float32"),
+        "freedom": rng.uniform(0, 1, n_countries * n_years).astype("float32"),
+    })
+    mean_year = df.groupby("year")["score"].mean().reset_index()
+    top = df.groupby("country")["score"].mean().nlargest(10).reset_index()
+    return [
+        px.line(mean_year, x="year", y="score", markers=True),
+        px.bar(top, x="score", y="country", orientation="h"),
+        px.scatter(df, x="gdp_per_capita", y="score", color="year", hover_data=["country"]),
+        px.imshow(df[["score", "gdp_per_capita", "freedom"]].corr().round(2), text_auto=True),
+    ]
+
+
+def old_html(figs: list, include_plotlyjs) -> str:
+    parts = [figs[0].to_html(full_html=False, include_plotlyjs=include_plotlyjs)]
+    parts += [fig.to_html(full_html=False, include_plotlyjs=False) for fig in figs[1:]]
+    return "".join(parts)
+
+
+def bundle_html(figs: list, mode: str) -> str:
+    bundle = FigureBundle(mode)
+    divs = [bundle.add(fig) for fig in figs]
+    return "".join(divs) + bundle.scripts()
+
+
+def main() -> None:
+    n_countries = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    n_years = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    figs = make_figures(n_countries, n_years)
+    print(f"Países: {n_countries} | anos: {n_years} | pontos no scatter: {n_countries * n_years:,}\n")
+
+    cases = {
+        "to_html por figura (CDN)": lambda: old_html(figs, "cdn"),
+        "FigureBundle cdn": lambda: bundle_html(figs, "cdn"),
+        "to_html + plotly.js inline": lambda: old_html(figs, True),
+        "FigureBundle offline (gzip)": lambda: bundle_html(figs, "offline"),
+    }
+    bundle_html(figs, "offline")  # aquece o cache do plotly.js comprimido
+    for label, fn in cases.items():
+        t0 = time.perf_counter()
+        html = fn()
+        dt = time.perf_counter() - t0
+        print(f"{label:<32} {len(html.encode('utf-8')) / 1024:10.0f} KB {dt * 1000:9.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
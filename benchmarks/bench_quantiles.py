@@ -0,0 +1,85 @@
+"""Benchmark: erro e custo do QuantileSketch (common/sketches.py).
+
+Preenche o sketch em blocos (como nas agregações em streaming), com e sem
+merge entre "processos", e compara p50/p90/p99 com os quantis exatos
+(np.quantile sobre a coluna inteira). O erro é medido em rank: a fração
+real de valores abaixo do quantil estimado menos o q pedido. Termina com
+código 1 se o maior erro passar do limite documentado (~1% com k=200).
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_quantiles.py [linhas] [k]
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from common.sketches import QuantileSketch
+
+QS = [0.5, 0.9, 0.99]
+
+# limite de erro de rank documentado no QuantileSketch (k=200)
+RANK_ERROR_BOUND = 0.01
+
+
+def sketch_of(data: np.ndarray, k: int, parts: int, seed: int, chunk: int = 500_000) -> QuantileSketch:
+    # `parts` sketches independentes (um por processo, cada um com sua semente) somados no fim
+    sketches = []
+    for i, part in enumerate(np.array_split(data, parts)):
+        s = QuantileSketch(k, seed=seed * parts + i)
+        for i in range(0, len(part), chunk):
+            s.update(part[i:i + chunk])
+        sketches.append(s)
+    out = sketches[0]
+    for s in sketches[1:]:
+        out = out.merge(s)
+    return out
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    rng = np.random.default_rng(0)
+    datasets = {
+        # formato parecido com ride_length_sec (cauda longa) e TotalSteps
+        "lognormal (duração)": rng.lognormal(6.5, 1.0, n),
+        "gamma (passos)": rng.gamma(2.0, 4000.0, n).round(),
+    }
+
+    print(f"Linhas: {n:,} | k = {k}\n")
+    print(f"{'dados':<22} {'merge':>5} {'tempo':>8} {'itens':>6}  erro de rank p50 / p90 / p99")
+    worst = 0.0
+    for name, data in datasets.items():
+        exact = np.sort(data)
+        for parts in (1, 12):
+            for seed in range(5):
+                t0 = time.perf_counter()
+                sketch = sketch_of(data, k, parts, seed)
+                dt = time.perf_counter() - t0
+                est = sketch.quantiles(QS)
+                err = np.searchsorted(exact, est, side="right") / n - QS
+                worst = max(worst, float(np.abs(err).max()))
+                if seed == 0:
+                    items = sum(len(buf) for buf in sketch.levels)
+                    errs = " / ".join(f"{e:+.4f}" for e in err)
+                    print(f"{name:<22} {parts:>5} {dt:7.3f}s {items:>6}  {errs}")
+
+        t0 = time.perf_counter()
+        np.quantile(data, QS)
+        print(f"{'':<22} np.quantile exato: {time.perf_counter() - t0:.3f}s (coluna inteira em memória)")
+
+    print(f"\nMaior erro de rank (5 seeds × 2 modos × {len(datasets)} conjuntos): {worst:.4f}")
+    if k < 200:
+        return  # o limite documentado vale para k >= 200
+    if worst > RANK_ERROR_BOUND:
+        print(f"⚠️ Acima do limite documentado ({RANK_ERROR_BOUND:.0%})")
+        sys.exit(1)
+    print(f"✅ Dentro do limite documentado ({RANK_ERROR_BOUND:.0%})")
+
+
+if __name__ == "__main__":
+    main()
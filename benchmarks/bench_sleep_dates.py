@@ -0,0 +1,65 @@
+"""Benchmark: dia de cada linha do minuteSleep (Case 02).
+
+Compara o caminho antigo (pd.to_datetime sem formato + .dt.date +
+pd.to_datetime de novo) com o parser de formato fixo + normalize e com
+fitbit_sleep.sleep_day (um parse por dia distinto + factorize).
+
+O caminho antigo infere o formato linha a linha e leva minutos com poucos
+milhões de linhas: roda uma vez só.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_sleep_dates.py [linhas]
+"""
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "Estudo_de_Caso_02" / "src"))
+
+from fitbit_sleep import parse_sleep_dates, sleep_day
+
+
+def timed(label: str, fn, repeat: int = 3):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    print(f"{label:<45} {best:8.3f} s")
+    return out, best
+
+
+def old_day(s: pd.Series) -> pd.Series:
+    with warnings.catch_warnings():
+        # sem formato o pandas avisa que vai inferir linha a linha
+        warnings.simplefilter("ignore", UserWarning)
+        date = pd.to_datetime(s, errors="coerce")
+    return pd.to_datetime(date.dt.date)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    rng = np.random.default_rng(42)
+    # minutos consecutivos como no arquivo real, no formato 4/12/2016 11:33:00 PM
+    ts = pd.Timestamp("2016-03-12") + pd.to_timedelta(np.sort(rng.integers(0, 60 * 86400, n)), unit="s")
+    date = pd.Series(ts.strftime("%-m/%-d/%Y %-I:%M:%S %p"), name="date")
+
+    print(f"Linhas: {n:,}")
+    old, t_old = timed("to_datetime (inferência) + .dt.date", lambda: old_day(date), repeat=1)
+    fixed, t_fixed = timed("formato fixo + .dt.normalize", lambda: parse_sleep_dates(date).dt.normalize())
+    new, t_new = timed("fitbit_sleep.sleep_day (factorize)", lambda: sleep_day(date))
+    assert (old.to_numpy() == fixed.to_numpy()).all(), "resultados diferentes!"
+    assert (old.to_numpy() == new.to_numpy()).all(), "resultados diferentes!"
+
+    print(f"\nSpeedup formato fixo: {t_old / t_fixed:.1f}x")
+    print(f"Speedup sleep_day:    {t_old / t_new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
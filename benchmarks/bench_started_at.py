@@ -0,0 +1,60 @@
+"""Benchmark: extração da hora de `started_at` (Case 01).
+
+Compara o caminho antigo (pd.to_datetime sem formato + .dt.hour) com o parser
+de formato fixo (divvy_time.parse_hour) e com a leitura da coluna `hour` já
+gravada no cache Parquet.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_started_at.py [linhas]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "Estudo_de_Caso_01" / "src"))
+
+from divvy_time import parse_hour
+
+
+def timed(label: str, fn, repeat: int = 3):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    print(f"{label:<40} {best:8.3f} s")
+    return out, best
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    rng = np.random.default_rng(42)
+    ts = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365 * 86400, n), unit="s")
+    started_at = pd.Series(ts.strftime("%Y-%m-%d %H:%M:%S"), name="started_at")
+
+    print(f"Linhas: {n:,}")
+    old, t_old = timed("pd.to_datetime (inferência) + .dt.hour", lambda: pd.to_datetime(started_at).dt.hour)
+    new, t_new = timed("divvy_time.parse_hour (formato fixo)", lambda: parse_hour(started_at))
+    assert (old.to_numpy() == new.to_numpy()).all(), "resultados diferentes!"
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("pyarrow não instalado: pulando leitura do cache")
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "hour.parquet"
+            new.to_frame().to_parquet(path)
+            timed("cache Parquet (coluna hour pronta)", lambda: pd.read_parquet(path, columns=["hour"]))
+
+    print(f"\nSpeedup parse_hour: {t_old / t_new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark: tempo de inicialização dos scripts (python -X importtime).
+
+Duas medições, cada uma num processo novo:
+
+1. importar cada script de entrada (sem rodar o main()): quanto custa e
+   quais bibliotecas pesadas (pandas, matplotlib, seaborn, plotly) carrega;
+2. o caminho com agregados em cache do Case 01: 05_report.py numa pasta
+   temporária com viagens sintéticas, depois da primeira execução
+   (relatório atualizado → só lê o artefato JSON e compara o hash).
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_startup.py [viagens]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+
+ENTRY_POINTS = [
+    "Estudo_de_Caso_01/src/03_eda.py",
+    "Estudo_de_Caso_01/src/04_visualization.py",
+    "Estudo_de_Caso_01/src/05_report.py",
+    "Estudo_de_Caso_01/src/pipeline.py",
+    "Estudo_de_Caso_02/src/01_process.py",
+    "Estudo_de_Caso_02/src/02_eda.py",
+    "Estudo_de_Caso_02/src/03_dashboard.py",
+    "Estudo_de_Caso_02/src/pipeline.py",
+    "Estudo_de_caso_03/src/01_build_dataset.py",
+    "Estudo_de_caso_03/src/02_clean_final.py",
+    "Estudo_de_caso_03/src/03_eda.py",
+    "Estudo_de_caso_03/src/04_dashboard.py",
+    "Estudo_de_caso_03/src/pipeline.py",
+]
+HEAVY = ["pandas", "matplotlib", "seaborn", "plotly"]
+
+# meta para o caminho em cache (relatório sem mudanças)
+TARGET_SECONDS = 1.0
+
+# importa o script como módulo (o main() não roda: __name__ != "__main__")
+IMPORT_ONLY = """
+import importlib.util, sys
+path = sys.argv[1]
+sys.path.insert(0, str(__import__("pathlib").Path(path).parent))
+spec = importlib.util.spec_from_file_location("entry_point", path)
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+"""
+
+
+def import_profile(stderr: str) -> tuple:
+    """(ms somando os imports de nível superior, bibliotecas pesadas carregadas) da saída do -X importtime."""
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.add(name.strip())
+        if not name[1:].startswith(" "):  # nível superior: sem indentação extra
+            total_us += int(cumulative)
+    heavy = [m for m in HEAVY if m in modules]
+    return total_us / 1000, heavy
+
+
+def run(args: list, cwd: Path = ROOT) -> tuple:
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], cwd=cwd, capture_output=True, text=True,
+        env={**os.environ, "PYTHONIOENCODING": "utf-8", "MPLBACKEND": "Agg"},
+    )
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    return wall, *import_profile(proc.stderr)
+
+
+def synthetic_trips(path: Path, n: int) -> None:
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365 * 86400, n), unit="s")
+    duration = rng.gamma(2.0, 450.0, n).round()
+    pd.DataFrame({
+        "ride_id": np.arange(n),
+        "started_at": start.strftime("%Y-%m-%d %H:%M:%S"),
+        "member_casual": rng.choice(["member", "casual"], n, p=[0.65, 0.35]),
+        "ride_length_sec": duration,
+        "day_of_week": start.day_name(),
+    }).to_csv(path, index=False)
+
+
+def main() -> None:
+    n_trips = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    print("1) Importar cada script (sem rodar main)\n")
+    print(f"{'script':<44} {'imports':>9} {'processo':>9}  bibliotecas pesadas")
+    for script in ENTRY_POINTS:
+        wall, imports_ms, heavy = run(["-c", IMPORT_ONLY, str(ROOT / script)])
+        print(f"{script:<44} {imports_ms:>7.0f}ms {wall * 1000:>7.0f}ms  {', '.join(heavy) or '—'}")
+
+    print(f"\n2) Case 01 com agregados em cache ({n_trips:,} viagens sintéticas)\n")
+    report = ROOT / "Estudo_de_Caso_01" / "src" / "05_report.py"
+    with tempfile.TemporaryDirectory() as tmp:
+        case_dir = Path(tmp)
+        (case_dir / "outputs").mkdir()
+        synthetic_trips(case_dir / "outputs" / "trips_2025_clean.csv", n_trips)
+
+        wall, imports_ms, heavy = run([str(report)], cwd=case_dir)
+        print(f"{'05_report (1ª vez: agregados + gráficos)':<44} {imports_ms:>7.0f}ms {wall * 1000:>7.0f}ms  {', '.join(heavy)}")
+        wall, imports_ms, heavy = run([str(report)], cwd=case_dir)
+        print(f"{'05_report (relatório atualizado)':<44} {imports_ms:>7.0f}ms {wall * 1000:>7.0f}ms  {', '.join(heavy) or '—'}")
+
+    mark = "✅" if wall < TARGET_SECONDS else "⚠️"
+    print(f"\n{mark} Caminho em cache: {wall * 1000:.0f} ms (meta: < {TARGET_SECONDS * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import hashlib
+import importlib
+import inspect
+import io
+import os
+import pickle
+from functools import lru_cache
+from importlib.metadata import version
+from pathlib import Path
+
+from common.parallel import default_workers, ordered_map
+
+# processos para desenhar gráficos (CHART_WORKERS=1 força modo serial)
+WORKERS = default_workers("CHART_WORKERS")
+
+# hash dos dados de cada PNG já gerado, num arquivo ao lado dele (<nome>.png.sha256)
+HASH_SUFFIX = ".sha256"
+
+# módulos com código de desenho usado por todos os gráficos (entram no hash de cada um)
+CHART_DEPS = ("common.charts", "common.density")
+
+
+def pyplot():
+    """matplotlib.pyplot com backend Agg, importado só quando algum gráfico é desenhado.
+
+    Sem gráficos para refazer (hashes iguais), o script nem carrega o matplotlib.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")  # só gera arquivos (também nos processos do pool)
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+@lru_cache(maxsize=None)
+def _matplotlib_version() -> str:
+    # metadados do pacote: não importa o matplotlib
+    return version("matplotlib")
+
+
+@lru_cache(maxsize=None)
+def _module_source(name: str) -> bytes:
+    # arquivo inteiro: helpers e estilo (_pyplot) chamados pela função de desenho também contam
+    return Path(inspect.getsourcefile(importlib.import_module(name))).read_bytes()
+
+
+class ChartJob:
+    """Um gráfico: função de desenho importável + dados já calculados + arquivo de saída.
+
+    `plot(data)` recebe só `data` (DataFrame/Series/tupla) e devolve a
+    figura; precisa ser uma função de módulo (não do script principal)
+    para ir a outro processo. `deps`: nomes de outros módulos cujo código
+    também desenha o gráfico (entram no hash, além do módulo de `plot`).
+    """
+
+    def __init__(self, plot, data, path: Path | None = None, deps: tuple = ()):
+        self.plot = plot
+        self.data = data
+        self.path = None if path is None else Path(path)
+        self.deps = tuple(deps)
+
+    def data_hash(self) -> str:
+        # dados + código do módulo da função de desenho (e dos módulos de que ele depende)
+        # + versão do matplotlib: mudar um helper ou o estilo também redesenha o gráfico
+        h = hashlib.sha256(pickle.dumps(self.data, protocol=5))
+        h.update(f"{self.plot.__module__}.{self.plot.__qualname__}".encode("utf-8"))
+        for name in (self.plot.__module__, *CHART_DEPS, *self.deps):
+            h.update(_module_source(name))
+        h.update(_matplotlib_version().encode("ascii"))
+        return h.hexdigest()
+
+
+def render_png(job: ChartJob) -> bytes:
+    """Desenha o gráfico e devolve os bytes do PNG (roda no worker)."""
+    plt = pyplot()
+    fig = job.plot(job.data)
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def render_pngs(jobs: list, workers: int = WORKERS) -> list:
+    """PNG de cada job, em paralelo (um processo por gráfico até `workers`); ordem preservada."""
+    return ordered_map(render_png, jobs, workers)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Grava `data` num temporário da mesma pasta e troca pelo arquivo final (os.replace).
+
+    Interrompido no meio, sobra só o temporário: `path` nunca fica truncado.
+    """
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _save(job: ChartJob) -> None:
+    write_atomic(job.path, render_png(job))
+
+
+def hash_path(png: Path) -> Path:
+    return png.with_name(png.name + HASH_SUFFIX)
+
+
+def _stored_hash(png: Path) -> str | None:
+    path = hash_path(png)
+    return path.read_text(encoding="ascii").strip() if path.exists() and png.exists() else None
+
+
+def _write_hash(png: Path, digest: str) -> None:
+    # um arquivo por PNG (etapas do pipeline na mesma pasta não disputam o mesmo arquivo);
+    # gravado só depois do PNG já estar completo no lugar (ver _save)
+    write_atomic(hash_path(png), digest.encode("ascii"))
+
+
+def render_charts(jobs: list, workers: int = WORKERS) -> dict:
+    """Grava o PNG de cada job em job.path, pulando os que têm os mesmos dados da última vez.
+
+    Devolve {arquivo: "gerado" | "sem mudança"}. O tempo total fica perto do
+    gráfico mais lento (todos rodam ao mesmo tempo, até `workers` processos).
+    """
+    hashes = {job.path: job.data_hash() for job in jobs}
+    todo = [job for job in jobs if _stored_hash(job.path) != hashes[job.path]]
+    ordered_map(_save, todo, workers)
+    for job in todo:
+        _write_hash(job.path, hashes[job.path])
+
+    done = {job.path for job in todo}
+    return {job.path.name: "gerado" if job.path in done else "sem mudança" for job in jobs}
@@ -0,0 +1,149 @@
+from pathlib import Path
+
+import pandas as pd
+
+from common.schema import apply_schema
+
+# pyarrow é opcional: sem ele tudo continua funcionando só com CSV
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# chaves gravadas nos metadados do Parquet para detectar cache desatualizado
+META_SIZE = b"source_csv_size"
+META_MTIME = b"source_csv_mtime_ns"
+
+
+def cache_path(csv_path: Path) -> Path:
+    return Path(csv_path).with_suffix(".parquet")
+
+
+def _cache(csv_path: Path, cache: Path | None) -> Path:
+    # `cache`: arquivo de uma projeção do CSV (ex.: colunas derivadas), fora do cache completo
+    return cache_path(csv_path) if cache is None else Path(cache)
+
+
+def _source_meta(csv_path: Path) -> dict:
+    stat = Path(csv_path).stat()
+    return {META_SIZE: str(stat.st_size).encode(), META_MTIME: str(stat.st_mtime_ns).encode()}
+
+
+def is_fresh(csv_path: Path, cache: Path | None = None) -> bool:
+    """Cache existe e foi gerado a partir da versão atual do CSV."""
+    cache = _cache(csv_path, cache)
+    if pq is None or not cache.exists():
+        return False
+    if not Path(csv_path).exists():
+        return True  # só o cache está disponível
+
+    meta = pq.read_schema(cache).metadata or {}
+    expected = _source_meta(csv_path)
+    return all(meta.get(k) == v for k, v in expected.items())
+
+
+def cache_columns(csv_path: Path, cache: Path | None = None) -> list:
+    cache = _cache(csv_path, cache)
+    if pq is None or not cache.exists():
+        return []
+    return pq.read_schema(cache).names
+
+
+def has_columns(csv_path: Path, columns: list | None, cache: Path | None = None) -> bool:
+    """Cache atualizado e com todas as `columns` (None: o arquivo inteiro serve)."""
+    if not is_fresh(csv_path, cache):
+        return False
+    return columns is None or set(columns) <= set(cache_columns(csv_path, cache))
+
+
+# ==============================
+# Escrita
+# ==============================
+def _to_arrow(df: pd.DataFrame, csv_path: Path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta.update(_source_meta(csv_path))
+    return table.replace_schema_metadata(meta)
+
+
+def write_table(df: pd.DataFrame, csv_path: Path, schema: str | None = None, **to_csv_kwargs) -> None:
+    """Salva o CSV (formato de entrega) e, se possível, o cache Parquet tipado ao lado.
+
+    Com `schema`, só o cache recebe os tipos compactos de common/schema.py;
+    o CSV continua igual ao de antes.
+    """
+    to_csv_kwargs.setdefault("index", False)
+    df.to_csv(csv_path, **to_csv_kwargs)
+    write_cache(apply_schema(df, schema, report=True) if schema else df, csv_path)
+
+
+def write_cache(df: pd.DataFrame, csv_path: Path) -> None:
+    cache = cache_path(csv_path)
+    if pa is None:
+        return
+    try:
+        pq.write_table(_to_arrow(df, csv_path), cache)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        # coluna com tipos misturados: segue só com o CSV
+        cache.unlink(missing_ok=True)
+        print(f"⚠️ Cache colunar não gerado para {csv_path}: {e}")
+
+
+class CacheWriter:
+    """Gera o cache bloco a bloco enquanto um CSV grande é lido em streaming."""
+
+    def __init__(self, csv_path: Path, cache: Path | None = None):
+        self.csv_path = Path(csv_path)
+        self.cache = _cache(csv_path, cache)
+        self.tmp_path = self.cache.with_suffix(".parquet.tmp")
+        self.writer = None
+        self.failed = pa is None
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if self.failed:
+            return
+        try:
+            table = _to_arrow(chunk, self.csv_path)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.tmp_path, table.schema)
+            self.writer.write_table(table.cast(self.writer.schema))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            print(f"⚠️ Cache colunar não gerado para {self.csv_path}: {e}")
+            self.abort()
+
+    def close(self) -> None:
+        if self.failed:
+            return
+        if self.writer is not None:
+            self.writer.close()
+            self.tmp_path.replace(self.cache)
+
+    def abort(self) -> None:
+        self.failed = True
+        if self.writer is not None:
+            self.writer.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+# ==============================
+# Leitura (cache se atualizado e com as colunas pedidas, senão CSV)
+# ==============================
+def read_table(csv_path: Path, columns: list | None = None, cache: Path | None = None,
+               **read_csv_kwargs) -> pd.DataFrame:
+    if has_columns(csv_path, columns, cache):
+        return pd.read_parquet(_cache(csv_path, cache), columns=columns)
+    return pd.read_csv(csv_path, usecols=columns, **read_csv_kwargs)
+
+
+def iter_chunks(csv_path: Path, columns: list | None = None, chunksize: int = 500_000,
+                cache: Path | None = None, **read_csv_kwargs):
+    """Lê em blocos de `chunksize` linhas (Parquet via iter_batches, CSV via chunksize)."""
+    if has_columns(csv_path, columns, cache):
+        parquet = pq.ParquetFile(_cache(csv_path, cache))
+        for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    yield from pd.read_csv(csv_path, usecols=columns, chunksize=chunksize, **read_csv_kwargs)
@@ -0,0 +1,225 @@
+import os
+
+import numpy as np
+
+# acima de N pontos o scatter vira grade de densidade (SCATTER_DENSITY_THRESHOLD=0 força sempre)
+DENSITY_ENV = "SCATTER_DENSITY_THRESHOLD"
+DEFAULT_THRESHOLD = 50_000
+
+# células no eixo da imagem final (a grade acumulada é reagrupada até caber)
+MAX_BINS = (400, 300)
+
+# chave da célula: kx nos 32 bits altos, ky (deslocado para ficar >= 0) nos 32 baixos
+_KY_OFFSET = 1 << 31
+_KY_MASK = (1 << 32) - 1
+
+
+def density_threshold() -> int:
+    return int(os.environ.get(DENSITY_ENV, DEFAULT_THRESHOLD))
+
+
+def use_density(n_points: int, threshold: int | None = None) -> bool:
+    """True se o scatter deve ser desenhado como grade de densidade."""
+    return n_points > (density_threshold() if threshold is None else threshold)
+
+
+class DensityGrid:
+    """Contagem de pontos (x, y) em células de tamanho fixo, preenchida bloco a bloco.
+
+    Mesma ideia do StreamingHistogram em 2D: guarda só as células ocupadas
+    (memória independente do número de pontos) e pode ser somada entre
+    blocos/processos. Passando de `max_cells` células, o tamanho dobra nos
+    dois eixos. A imagem final sai de `grid`.
+    """
+
+    def __init__(self, step: tuple = (1.0, 1.0), max_cells: int = 250_000):
+        self.step = (float(step[0]), float(step[1]))
+        self.max_cells = max_cells
+        self.keys = np.array([], dtype=np.int64)
+        self.counts = np.array([], dtype=np.int64)
+        self.n = 0
+
+    def update(self, x, y) -> None:
+        x = np.asarray(x, dtype="float64")
+        y = np.asarray(y, dtype="float64")
+        ok = ~(np.isnan(x) | np.isnan(y))
+        if not ok.any():
+            return
+        kx = np.floor(x[ok] / self.step[0]).astype(np.int64)
+        ky = np.floor(y[ok] / self.step[1]).astype(np.int64)
+        self.n += int(ok.sum())
+        keys, counts = np.unique(self._key(kx, ky), return_counts=True)
+        self._add(keys, counts)
+
+    @staticmethod
+    def _key(kx: np.ndarray, ky: np.ndarray) -> np.ndarray:
+        return (kx << 32) | (ky + _KY_OFFSET)
+
+    def cells(self) -> tuple:
+        """(kx, ky) de cada célula ocupada."""
+        ky = (self.keys & _KY_MASK) - _KY_OFFSET
+        return self.keys >> 32, ky
+
+    def _add(self, keys: np.ndarray, counts: np.ndarray) -> None:
+        keys, inverse = np.unique(np.r_[self.keys, keys], return_inverse=True)
+        self.keys = keys
+        self.counts = np.bincount(inverse, np.r_[self.counts, counts]).astype(np.int64)
+        while len(self.keys) > self.max_cells:
+            self._coarsen()
+
+    def _coarsen(self) -> None:
+        self.step = (self.step[0] * 2, self.step[1] * 2)
+        kx, ky = self.cells()
+        keys, inverse = np.unique(self._key(kx // 2, ky // 2), return_inverse=True)
+        self.keys = keys
+        self.counts = np.bincount(inverse, self.counts).astype(np.int64)
+
+    def merge(self, other: "DensityGrid") -> "DensityGrid":
+        """Nova grade com os pontos das duas (tamanhos de célula precisam diferir por potência de 2)."""
+        a, b = self.copy(), other.copy()
+        while a.step[0] < b.step[0]:
+            a._coarsen()
+        while b.step[0] < a.step[0]:
+            b._coarsen()
+        if a.step != b.step:
+            raise ValueError(f"Células incompatíveis: {self.step} e {other.step}")
+        a.max_cells = max(a.max_cells, b.max_cells)
+        a.n += b.n
+        a._add(b.keys, b.counts)
+        return a
+
+    def copy(self) -> "DensityGrid":
+        out = DensityGrid(self.step, self.max_cells)
+        out.keys, out.counts, out.n = self.keys.copy(), self.counts.copy(), self.n
+        return out
+
+    def extent(self) -> tuple:
+        """(kx_min, kx_max, ky_min, ky_max) das células ocupadas."""
+        kx, ky = self.cells()
+        return int(kx.min()), int(kx.max()), int(ky.min()), int(ky.max())
+
+    def grid(self, max_bins: tuple = MAX_BINS, extent: tuple | None = None):
+        """(contagens[ny, nx], bordas x, bordas y), com no máximo `max_bins` células por eixo.
+
+        `extent` (em índices de célula, ver `extent()`) alinha várias grades
+        na mesma área, ex.: uma por categoria.
+        """
+        if self.n == 0 and extent is None:
+            return np.zeros((1, 1), dtype=np.int64), np.array([0.0, 1.0]), np.array([0.0, 1.0])
+        x0, x1, y0, y1 = self.extent() if extent is None else extent
+        # fator inteiro de agrupamento por eixo para caber em max_bins
+        fx = max(1, -(-(x1 - x0 + 1) // max_bins[0]))
+        fy = max(1, -(-(y1 - y0 + 1) // max_bins[1]))
+        nx = -(-(x1 - x0 + 1) // fx)
+        ny = -(-(y1 - y0 + 1) // fy)
+
+        kx, ky = self.cells()
+        inside = (kx >= x0) & (kx <= x1) & (ky >= y0) & (ky <= y1)
+        ix = (kx[inside] - x0) // fx
+        iy = (ky[inside] - y0) // fy
+        counts = np.bincount(iy * nx + ix, self.counts[inside], nx * ny).astype(np.int64).reshape(ny, nx)
+        x_edges = (x0 + np.arange(nx + 1) * fx) * self.step[0]
+        y_edges = (y0 + np.arange(ny + 1) * fy) * self.step[1]
+        return counts, x_edges, y_edges
+
+
+def stack_grids(grids: dict, max_bins: tuple = MAX_BINS):
+    """Grades por categoria na mesma área: (contagens[categoria, ny, nx], categorias, bordas x, bordas y)."""
+    grids = {k: g for k, g in grids.items() if g.n}
+    if not grids:
+        return np.zeros((0, 1, 1), dtype=np.int64), [], np.array([0.0, 1.0]), np.array([0.0, 1.0])
+    steps = {g.step for g in grids.values()}
+    if len(steps) != 1:
+        raise ValueError(f"Grades com células diferentes: {steps}")
+    ext = np.array([g.extent() for g in grids.values()])
+    extent = (ext[:, 0].min(), ext[:, 1].max(), ext[:, 2].min(), ext[:, 3].max())
+    parts = [g.grid(max_bins, extent) for g in grids.values()]
+    return np.stack([p[0] for p in parts]), list(grids), parts[0][1], parts[0][2]
+
+
+def category_grids(x, y, categories, step: tuple, max_cells: int = 250_000) -> dict:
+    """Uma DensityGrid por categoria (ex.: region), todas com o mesmo tamanho de célula."""
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    codes, labels = _factorize(categories)
+    out = {}
+    for i, label in enumerate(labels):
+        g = DensityGrid(step, max_cells)
+        g.update(x[codes == i], y[codes == i])
+        out[label] = g
+    # coarsen de uma categoria vale para todas (mesma grade na imagem)
+    coarsest = max(g.step for g in out.values()) if out else step
+    for g in out.values():
+        while g.step < coarsest:
+            g._coarsen()
+    return out
+
+
+def _factorize(categories):
+    import pandas as pd
+
+    codes, labels = pd.factorize(pd.Series(categories), sort=True)
+    return codes, list(labels)
+
+
+# ==============================
+# Imagem (matplotlib: imshow da grade, não um marcador por ponto)
+# ==============================
+def draw_density(ax, counts: np.ndarray, x_edges: np.ndarray, y_edges: np.ndarray, cmap: str = "viridis"):
+    """Grade de contagens como imagem (escala log: áreas esparsas continuam visíveis)."""
+    from matplotlib.colors import LogNorm
+
+    masked = np.ma.masked_equal(counts, 0)
+    image = ax.imshow(
+        masked, origin="lower", aspect="auto", interpolation="nearest", cmap=cmap,
+        extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]),
+        norm=LogNorm(vmin=1, vmax=max(int(counts.max()), 2)),
+    )
+    ax.figure.colorbar(image, ax=ax, label="Pontos por célula", format="%d")
+    return image
+
+
+def draw_category_density(ax, counts: np.ndarray, labels: list, x_edges: np.ndarray, y_edges: np.ndarray,
+                          palette=None, legend_title: str | None = None):
+    """Grades por categoria numa imagem só: cor = média das cores das categorias na célula, opacidade = densidade."""
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import to_rgb
+    from matplotlib.patches import Patch
+
+    colors = np.array([to_rgb(c) for c in (palette or plt.rcParams["axes.prop_cycle"].by_key()["color"])])
+    colors = colors[np.arange(len(labels)) % len(colors)]
+    total = counts.sum(axis=0)
+    rgb = np.einsum("cyx,ck->yxk", counts, colors) / np.maximum(total, 1)[..., None]
+    alpha = np.log1p(total) / np.log1p(max(int(total.max()), 1))
+    # mínimo de opacidade: célula com um ponto só não some
+    alpha = np.where(total > 0, 0.35 + 0.65 * alpha, 0.0)
+    ax.imshow(
+        np.dstack([rgb, alpha]), origin="lower", aspect="auto", interpolation="nearest",
+        extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]),
+    )
+    handles = [Patch(color=colors[i], label=str(label)) for i, label in enumerate(labels)]
+    ax.legend(handles=handles, title=legend_title)
+
+
+# ==============================
+# Imagem (plotly: um Heatmap no lugar de um marcador por ponto)
+# ==============================
+def heatmap_trace(counts: np.ndarray, x_edges: np.ndarray, y_edges: np.ndarray,
+                  colorscale: str = "Viridis", hover: str = "x: %{x}<br>y: %{y}"):
+    """go.Heatmap da grade em escala log10 (células vazias transparentes; contagem real no hover)."""
+    import plotly.graph_objects as go
+
+    with np.errstate(divide="ignore"):
+        # float32: metade dos bytes no HTML, precisão de sobra para a cor
+        z = np.where(counts > 0, np.log10(np.maximum(counts, 1)), np.nan).astype("float32")
+    top = max(int(np.ceil(np.nanmax(z))) if counts.any() else 0, 1)
+    return go.Heatmap(
+        z=z, customdata=counts,
+        x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2,
+        colorscale=colorscale, zmin=0, zmax=top,
+        colorbar=dict(
+            title="Pontos", tickvals=list(range(top + 1)),
+            ticktext=[f"{10 ** i:,}".replace(",", ".") for i in range(top + 1)],
+        ),
+        hovertemplate=hover + "<br>pontos: %{customdata}<extra></extra>",
+    )
@@ -0,0 +1,28 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def default_workers(env_var: str) -> int:
+    """Número de processos: variável de ambiente (ex.: CYCLISTIC_WORKERS=1) ou todos os núcleos."""
+    return int(os.environ.get(env_var, os.cpu_count() or 1))
+
+
+def _context():
+    # workers partem de um processo limpo, nunca de um fork do script com threads
+    # (pyarrow/OpenBLAS) já rodando; os scripts só executam dentro de main()
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def ordered_map(fn, items: list, workers: int) -> list:
+    """Aplica `fn` em paralelo e devolve os resultados na ordem de `items` (saída determinística).
+
+    `fn` precisa ser importável (função de módulo ou functools.partial dela).
+    """
+    workers = min(workers, len(items))
+    if workers <= 1:
+        return [fn(item) for item in items]
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_context()) as pool:
+        return list(pool.map(fn, items))
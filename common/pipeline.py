@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from common.parallel import default_workers
+
+# estado das execuções (hash de entradas/saídas por etapa), na pasta do estudo de caso
+STATE_FILE = ".pipeline_state.json"
+# etapas independentes rodando ao mesmo tempo (PIPELINE_WORKERS=1 força modo serial)
+WORKERS_ENV = "PIPELINE_WORKERS"
+
+HASH_BLOCK = 1 << 20
+
+
+class Stage:
+    """Um script numerado do estudo de caso, com entradas e saídas declaradas (arquivos ou pastas).
+
+    `env`: variáveis de ambiente que mudam o resultado (ex.: FITBIT_USERS)
+    entram no fingerprint junto com o conteúdo do script e das entradas.
+    """
+
+    def __init__(self, script: Path, inputs=(), outputs=(), args=(), env=()):
+        self.script = Path(script)
+        self.name = self.script.stem
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.args = list(args)
+        self.env = list(env)
+
+
+def helper_modules(src_dir: Path) -> list:
+    """Módulos auxiliares da pasta src/ (tudo que não é script numerado nem o próprio pipeline)."""
+    return sorted(
+        p for p in Path(src_dir).glob("*.py")
+        if not p.name[0].isdigit() and p.name != "pipeline.py"
+    )
+
+
+def _inside(path: Path, other: Path) -> bool:
+    return path == other or other in path.parents or path in other.parents
+
+
+class Pipeline:
+    """Roda as etapas em ordem de dependência, pulando as que estão atualizadas.
+
+    Uma etapa depende de outra quando alguma entrada dela é (ou está dentro
+    de) uma saída da outra. Está atualizada quando o fingerprint (hash do
+    script, do código compartilhado `code`, das entradas, args e env) é o
+    mesmo da última execução bem-sucedida e as saídas continuam iguais.
+    Hashes de arquivo são reaproveitados enquanto tamanho e mtime não mudam.
+    """
+
+    def __init__(self, stages: list, root: Path, code=()):
+        self.stages = {stage.name: stage for stage in stages}
+        self.root = Path(root)
+        self.code = [Path(p) for p in code]
+        self.state_path = self.root / STATE_FILE
+        self.state = self._load_state()
+        self.deps = {
+            stage.name: {
+                other.name for other in stages
+                if other is not stage and any(_inside(i, o) for i in stage.inputs for o in other.outputs)
+            }
+            for stage in stages
+        }
+
+    # ==============================
+    # Hash por conteúdo (com cache por tamanho + mtime)
+    # ==============================
+    def _load_state(self) -> dict:
+        if self.state_path.exists():
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            return {"stages": state.get("stages", {}), "files": state.get("files", {})}
+        return {"stages": {}, "files": {}}
+
+    def _save_state(self) -> None:
+        # hashes de arquivos que não existem mais não servem para nada
+        self.state["files"] = {k: v for k, v in self.state["files"].items() if Path(k).exists()}
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.state, indent=2), encoding="utf-8")
+        tmp.replace(self.state_path)
+
+    def _file_hash(self, path: Path) -> str:
+        stat = path.stat()
+        key = str(path.resolve())
+        cached = self.state["files"].get(key)
+        if cached is not None and cached[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return cached[2]
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            while block := f.read(HASH_BLOCK):
+                h.update(block)
+        self.state["files"][key] = [stat.st_size, stat.st_mtime_ns, h.hexdigest()]
+        return h.hexdigest()
+
+    def path_hash(self, path: Path) -> str | None:
+        """Hash do arquivo, ou da pasta inteira (nomes relativos + conteúdo); None se não existir."""
+        if path.is_file():
+            return self._file_hash(path)
+        if not path.is_dir():
+            return None
+        h = hashlib.sha256()
+        for f in sorted(p for p in path.rglob("*") if p.is_file() and "__pycache__" not in p.parts):
+            h.update(f.relative_to(path).as_posix().encode("utf-8"))
+            h.update(self._file_hash(f).encode("ascii"))
+        return h.hexdigest()
+
+    def fingerprint(self, stage: Stage) -> str:
+        parts = {
+            "script": self.path_hash(stage.script),
+            "code": {str(p): self.path_hash(p) for p in self.code},
+            "inputs": {str(p): self.path_hash(p) for p in stage.inputs},
+            "args": stage.args,
+            "env": {name: os.environ.get(name) for name in stage.env},
+        }
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _outputs(self, stage: Stage) -> dict:
+        return {str(p): self.path_hash(p) for p in stage.outputs}
+
+    def is_current(self, stage: Stage, fingerprint: str) -> bool:
+        last = self.state["stages"].get(stage.name)
+        if last is None or last["fingerprint"] != fingerprint:
+            return False
+        outputs = self._outputs(stage)
+        return None not in outputs.values() and outputs == last["outputs"]
+
+    # ==============================
+    # Execução
+    # ==============================
+    def _run_script(self, stage: Stage):
+        env = {**os.environ, "PYTHONIOENCODING": "utf-8"}
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, str(stage.script), *stage.args],
+            cwd=self.root, env=env, capture_output=True, text=True, encoding="utf-8",
+        )
+        return proc, time.perf_counter() - t0
+
+    def run(self, force: bool = False, workers: int | None = None) -> bool:
+        """Executa o pipeline; devolve True se nenhuma etapa falhou."""
+        workers = workers or default_workers(WORKERS_ENV)
+        pending = dict(self.stages)
+        status = {}
+        timings = {}
+        running = {}
+        t_start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            while pending or running:
+                progressed = False
+                for name in list(pending):
+                    deps = self.deps[name]
+                    if any(status.get(d) in ("falhou", "pulada") for d in deps):
+                        status[name], timings[name] = "pulada", 0.0
+                        del pending[name]
+                        progressed = True
+                    elif all(d in status for d in deps):
+                        stage = pending.pop(name)
+                        progressed = True
+                        fingerprint = self.fingerprint(stage)
+                        if not force and self.is_current(stage, fingerprint):
+                            status[name], timings[name] = "atualizada", 0.0
+                        else:
+                            running[pool.submit(self._run_script, stage)] = (stage, fingerprint)
+
+                if not running:
+                    if not progressed:  # só sobraram etapas esperando umas pelas outras
+                        raise ValueError(f"Dependência circular entre as etapas: {sorted(pending)}")
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, fingerprint = running.pop(future)
+                    proc, elapsed = future.result()
+                    timings[stage.name] = elapsed
+                    print(f"\n── {stage.name} ──")
+                    print(proc.stdout.rstrip())
+                    if proc.returncode != 0:
+                        status[stage.name] = "falhou"
+                        print(proc.stderr.rstrip())
+                        continue
+                    status[stage.name] = "executada"
+                    self.state["stages"][stage.name] = {
+                        "fingerprint": fingerprint,
+                        "outputs": self._outputs(stage),
+                    }
+                    self._save_state()
+
+        self._save_state()
+        print_timings(list(self.stages), status, timings, time.perf_counter() - t_start)
+        return "falhou" not in status.values()
+
+
+def print_timings(names: list, status: dict, timings: dict, wall: float) -> None:
+    width = max(len(n) for n in names + ["Etapa"])
+    print(f"\n{'Etapa':<{width}}  {'Status':<10}  {'Tempo':>8}")
+    print("-" * (width + 22))
+    for name in names:
+        print(f"{name:<{width}}  {status.get(name, '-'):<10}  {timings.get(name, 0.0):7.2f}s")
+    print("-" * (width + 22))
+    total = sum(timings.values())
+    print(f"{'Total':<{width}}  {'':<10}  {wall:7.2f}s  (soma das etapas: {total:.2f}s)")
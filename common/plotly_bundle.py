@@ -0,0 +1,169 @@
+import base64
+import gzip
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+import plotly.io as pio
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+# "cdn": só a tag <script src=...> (padrão, como antes); "offline": plotly.js embutido uma vez (gzip + base64)
+MODES = ("cdn", "offline")
+
+# listas de texto com pelo menos N itens viram dicionário (categorias + códigos inteiros)
+MIN_ENCODED_STRINGS = 16
+
+
+def mode_from_env(env_var: str, default: str = "cdn") -> str:
+    """Modo de embutir o plotly.js (ex.: HAPPINESS_PLOTLY=offline para abrir sem internet)."""
+    mode = os.environ.get(env_var, default).strip().lower()
+    if mode not in MODES:
+        raise ValueError(f"{env_var}={mode!r}: use um de {MODES}")
+    return mode
+
+
+@lru_cache(maxsize=1)
+def compressed_plotlyjs() -> str:
+    # plotly.min.js (~4.8 MB) → gzip (~1.5 MB) → base64; descompactado no navegador (DecompressionStream)
+    # mtime=0: o mesmo HTML byte a byte a cada execução
+    return base64.b64encode(gzip.compress(get_plotlyjs().encode("utf-8"), 9, mtime=0)).decode("ascii")
+
+
+# ==============================
+# Dados das figuras: arrays numéricos em binário, textos repetidos como códigos
+# ==============================
+def _typed_array(values: np.ndarray) -> dict:
+    return {"dtype": values.dtype.str.lstrip("<|="), "bdata": base64.b64encode(values.tobytes()).decode("ascii")}
+
+
+def _code_dtype(n_categories: int):
+    return np.uint8 if n_categories <= 255 else np.uint16 if n_categories <= 65_535 else np.uint32
+
+
+def _encode_strings(value: list):
+    # ["A", "B", ...] ou [["A"], ["B"], ...] (customdata com uma coluna por campo do hover)
+    flat = value
+    shape = [len(value)]
+    if all(isinstance(row, list) for row in value):
+        widths = {len(row) for row in value}
+        if len(widths) != 1:
+            return None
+        shape.append(widths.pop())
+        flat = [item for row in value for item in row]
+    if len(flat) < MIN_ENCODED_STRINGS or not all(isinstance(item, str) for item in flat):
+        return None
+
+    categories, codes = np.unique(np.asarray(flat, dtype=object), return_inverse=True)
+    return {
+        "categories": categories.tolist(),
+        "codes": _typed_array(codes.astype(_code_dtype(len(categories)))),
+        "shape": shape,
+    }
+
+
+def _compact(value):
+    """Percorre o JSON da figura trocando listas de texto por {categories, codes, shape}."""
+    if isinstance(value, dict):
+        return {k: _compact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        encoded = _encode_strings(value) if value else None
+        return encoded if encoded is not None else [_compact(v) for v in value]
+    return value
+
+
+class FigureBundle:
+    """Várias figuras Plotly numa página: plotly.js uma vez, dados em JSON compacto único.
+
+    Cada `add` devolve só o <div> da figura; `scripts` devolve o plotly.js
+    (CDN ou embutido comprimido), o JSON de todas as figuras e o carregador
+    que as desenha. O template de layout (~7 KB, igual em todas) é gravado
+    uma vez; arrays numéricos vão como typed arrays base64 ("bdata", lidos
+    pelo próprio plotly.js) e listas de texto repetido como categorias +
+    códigos inteiros.
+    """
+
+    def __init__(self, mode: str = "cdn", config: dict | None = None):
+        if mode not in MODES:
+            raise ValueError(f"Modo desconhecido: {mode!r} (use um de {MODES})")
+        self.mode = mode
+        self.config = {"responsive": True} if config is None else config
+        self.figures = []
+        self.templates = []
+
+    def add(self, fig) -> str:
+        """Registra a figura e devolve o <div> onde ela será desenhada."""
+        # pio.to_json já serializa arrays numpy como {"dtype", "bdata"}
+        spec = json.loads(pio.to_json(fig, validate=False))
+        layout = spec.get("layout", {})
+        template = layout.pop("template", None)
+        if template is not None and template not in self.templates:
+            self.templates.append(template)
+
+        div_id = f"plotly-fig-{len(self.figures)}"
+        self.figures.append({
+            "id": div_id,
+            "data": _compact(spec.get("data", [])),
+            "layout": layout,
+            "template": None if template is None else self.templates.index(template),
+        })
+        return f'<div id="{div_id}" class="plotly-graph-div" style="height:100%; width:100%;"></div>'
+
+    def payload(self) -> str:
+        data = {"config": self.config, "templates": self.templates, "figures": self.figures}
+        # "</" escapado: o JSON fica dentro de <script>
+        return json.dumps(data, separators=(",", ":")).replace("</", "<\\/")
+
+    def scripts(self) -> str:
+        """<script>s do plotly.js + dados + carregador (escrever depois de todos os <div>)."""
+        if self.mode == "cdn":
+            loader = f'<script charset="utf-8" src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>'
+            start = "drawFigures();"
+        else:
+            loader = f'<script id="plotly-js-gz" type="application/octet-stream">{compressed_plotlyjs()}</script>'
+            start = "loadPlotly().then(drawFigures);"
+        return f"""
+{loader}
+<script id="plotly-figures" type="application/json">{self.payload()}</script>
+<script>
+  // plotly.js embutido (gzip + base64): descompacta no navegador e executa uma vez
+  async function loadPlotly() {{
+    const b64 = document.getElementById("plotly-js-gz").textContent;
+    const bytes = Uint8Array.from(atob(b64), c => c.charCodeAt(0));
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+    const script = document.createElement("script");
+    script.text = await new Response(stream).text();
+    document.head.appendChild(script);
+  }}
+
+  // {{categories, codes, shape}} → lista de textos (ou de linhas, no customdata)
+  function decodeTyped(t) {{
+    const raw = Uint8Array.from(atob(t.bdata), c => c.charCodeAt(0)).buffer;
+    const types = {{u1: Uint8Array, u2: Uint16Array, u4: Uint32Array}};
+    return new types[t.dtype](raw);
+  }}
+  function expand(v) {{
+    if (Array.isArray(v)) return v.map(expand);
+    if (v === null || typeof v !== "object") return v;
+    if (v.categories && v.codes) {{
+      const items = Array.from(decodeTyped(v.codes), i => v.categories[i]);
+      if (v.shape.length === 1) return items;
+      const w = v.shape[1];
+      return Array.from({{length: v.shape[0]}}, (_, r) => items.slice(r * w, (r + 1) * w));
+    }}
+    const out = {{}};
+    for (const k in v) out[k] = expand(v[k]);
+    return out;
+  }}
+
+  function drawFigures() {{
+    const P = JSON.parse(document.getElementById("plotly-figures").textContent);
+    for (const fig of P.figures) {{
+      const layout = fig.template === null ? fig.layout : {{...fig.layout, template: P.templates[fig.template]}};
+      Plotly.newPlot(fig.id, expand(fig.data), layout, P.config);
+    }}
+  }}
+
+  {start}
+</script>
+"""
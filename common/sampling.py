@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+
+class ReservoirSampler:
+    """Amostra uniforme de `k` linhas de um fluxo de blocos, sem guardar o fluxo.
+
+    Cada linha recebe uma chave aleatória (gerador com `seed`) e ficam as `k`
+    menores chaves. A sequência de chaves não depende do tamanho dos blocos,
+    então o resultado é o mesmo lendo em blocos ou de uma vez. Memória: O(k).
+    """
+
+    def __init__(self, k: int, seed: int = 42):
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self.seen = 0
+        self.keys = np.array([])
+        self.positions = np.array([], dtype=np.int64)
+        self.rows = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        n = len(chunk)
+        keys = self.rng.random(n)
+        positions = np.arange(self.seen, self.seen + n)
+        self.seen += n
+
+        # reservatório cheio: só entra quem tem chave menor que a maior guardada
+        if len(self.keys) == self.k:
+            take = keys < self.keys.max()
+            chunk, keys, positions = chunk[take], keys[take], positions[take]
+            if len(keys) == 0:
+                return
+
+        rows = chunk.reset_index(drop=True)
+        if self.rows is not None:
+            rows = pd.concat([self.rows, rows], ignore_index=True)
+            keys = np.r_[self.keys, keys]
+            positions = np.r_[self.positions, positions]
+
+        if len(keys) > self.k:
+            keep = np.argpartition(keys, self.k - 1)[:self.k]
+            rows, keys, positions = rows.iloc[keep].reset_index(drop=True), keys[keep], positions[keep]
+        self.rows, self.keys, self.positions = rows, keys, positions
+
+    def result(self) -> pd.DataFrame:
+        """Linhas sorteadas na ordem em que apareceram no fluxo."""
+        if self.rows is None:
+            return pd.DataFrame()
+        return self.rows.iloc[np.argsort(self.positions)].reset_index(drop=True)
@@ -0,0 +1,98 @@
+import pandas as pd
+
+# ordem de exibição dos dias (antes repetida em 04_visualization.py e 03_dashboard.py)
+WEEKDAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+class Ordered:
+    """Coluna categórica ordenada; sem `categories`, usa os valores vistos em ordem alfabética."""
+
+    def __init__(self, categories: list | None = None):
+        self.categories = categories
+
+
+# ==============================
+# Esquemas por dataset (colunas ausentes são ignoradas)
+# ==============================
+SCHEMAS = {
+    # Case 01 — trips_2025_clean
+    "trips": {
+        "member_casual": Ordered(["casual", "member"]),
+        "day_of_week": Ordered(WEEKDAY_ORDER),
+        "ride_length_sec": "float32",
+        "hour": "int8",
+    },
+    # Case 02 — fitbit_daily_clean
+    "fitbit_daily": {
+        "weekday": Ordered(WEEKDAY_ORDER),
+        "month": Ordered(),
+        "TotalSteps": "int32",
+        "TotalDistance": "float32",
+        "VeryActiveMinutes": "int16",
+        "FairlyActiveMinutes": "int16",
+        "LightlyActiveMinutes": "int16",
+        "SedentaryMinutes": "int16",
+        "Calories": "int32",
+        "TotalMinutesAsleep": "int16",
+    },
+    # Case 03 — happiness_final
+    "happiness": {
+        "country": Ordered(),
+        "region": Ordered(),
+        "year": "Int16",
+        "rank": "float32",
+        "score": "float32",
+        "gdp_per_capita": "float32",
+        "social_support": "float32",
+        "life_expectancy": "float32",
+        "freedom": "float32",
+        "corruption": "float32",
+        "generosity": "float32",
+    },
+}
+
+
+def _categorical(s: pd.Series, spec: Ordered) -> pd.Series:
+    seen = set(s.dropna().unique())
+    if spec.categories is None:
+        cats = sorted(seen)
+    else:
+        # valores fora da lista declarada não viram NaN: entram no fim
+        cats = list(spec.categories) + sorted(seen - set(spec.categories))
+    return s.astype(pd.CategoricalDtype(cats, ordered=True))
+
+
+def _numeric(s: pd.Series, dtype: str) -> pd.Series:
+    # inteiro com valores ausentes precisa do tipo anulável (Int32, Int16...)
+    if dtype[0] in "iu" and s.isna().any():
+        dtype = dtype.capitalize()
+    return s.astype(dtype)
+
+
+def memory_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True).sum())
+
+
+def print_memory_report(name: str, before: int, after: int) -> None:
+    saved = 1 - after / before if before else 0.0
+    print(f"💾 Schema '{name}': {before / 1e6:.2f} MB → {after / 1e6:.2f} MB (-{saved:.0%})")
+
+
+def apply_schema(df: pd.DataFrame, name: str, report: bool = False) -> pd.DataFrame:
+    """Converte as colunas do dataset `name` para categóricas ordenadas / tipos numéricos menores."""
+    before = memory_bytes(df) if report else 0
+
+    out = df.copy(deep=False)
+    for col, spec in SCHEMAS[name].items():
+        if col not in out.columns:
+            continue
+        if isinstance(spec, Ordered):
+            out[col] = _categorical(out[col], spec)
+        else:
+            out[col] = _numeric(out[col], spec)
+
+    if report:
+        after = memory_bytes(out)
+        if after != before:  # dados vindos do cache Parquet já estão no formato compacto
+            print_memory_report(name, before, after)
+    return out
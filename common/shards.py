@@ -0,0 +1,130 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# pyarrow é opcional: sem ele os shards são gravados em CSV
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pc = None
+    pq = None
+
+MANIFEST = "manifest.json"
+
+
+def shard_of(keys, n_shards: int) -> np.ndarray:
+    """Shard de cada chave (hash estável do pandas, igual entre execuções e máquinas)."""
+    return (pd.util.hash_array(np.asarray(keys)) % np.uint64(n_shards)).astype(np.int64)
+
+
+def shard_count(n_keys: int, keys_per_shard: int = 500) -> int:
+    # potência de 2 com ~keys_per_shard chaves por arquivo
+    return 1 << max(0, int(np.ceil(np.log2(max(n_keys / keys_per_shard, 1)))))
+
+
+def _shard_name(shard: int, fmt: str) -> str:
+    return f"shard_{shard:04d}.{fmt}"
+
+
+# ==============================
+# Escrita
+# ==============================
+def write_shards(df: pd.DataFrame, out_dir: Path, key: str, source_path: Path,
+                 keys_per_shard: int = 500) -> dict:
+    """Particiona `df` por hash de `key` em out_dir/ + manifesto ligado ao arquivo de origem.
+
+    A ordem das linhas dentro de cada shard é a mesma de `df`.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for old in out_dir.glob("shard_*"):
+        old.unlink()
+
+    fmt = "parquet" if pa is not None else "csv"
+    n_shards = shard_count(df[key].nunique(), keys_per_shard)
+    shard = shard_of(df[key], n_shards)
+
+    # uma ordenação estável e fatias contíguas, em vez de um filtro por shard
+    order = np.argsort(shard, kind="stable")
+    bounds = np.searchsorted(shard[order], np.arange(n_shards + 1))
+
+    shards = {}
+    for s in range(n_shards):
+        rows = order[bounds[s]:bounds[s + 1]]
+        if len(rows) == 0:
+            continue
+        part = df.iloc[rows]
+        name = _shard_name(s, fmt)
+        if fmt == "parquet":
+            pq.write_table(pa.Table.from_pandas(part, preserve_index=False), out_dir / name)
+        else:
+            part.to_csv(out_dir / name, index=False)
+        shards[str(s)] = {"file": name, "rows": int(len(part))}
+
+    stat = Path(source_path).stat()
+    manifest = {
+        "key": key,
+        "n_shards": n_shards,
+        "format": fmt,
+        "rows": int(len(df)),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "shards": shards,
+    }
+    (out_dir / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+# ==============================
+# Leitura
+# ==============================
+def load_manifest(out_dir: Path, source_path: Path | None = None) -> dict | None:
+    """Manifesto dos shards; None se não existe ou se a origem mudou depois da partição."""
+    path = Path(out_dir) / MANIFEST
+    if not path.exists():
+        return None
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if manifest["format"] == "parquet" and pq is None:
+        return None
+
+    if source_path is not None and Path(source_path).exists():
+        stat = Path(source_path).stat()
+        if (manifest["source_size"], manifest["source_mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+            return None
+    return manifest
+
+
+def read_shards(out_dir: Path, manifest: dict, keys: list, columns: list | None = None) -> pd.DataFrame:
+    """Só as linhas de `keys`, abrindo apenas os shards onde essas chaves caem."""
+    out_dir = Path(out_dir)
+    key = manifest["key"]
+    if columns is not None and key not in columns:
+        columns = [key] + list(columns)
+
+    wanted = sorted({int(s) for s in shard_of(keys, manifest["n_shards"])})
+    # shards sem linhas não entram no manifesto
+    paths = [out_dir / manifest["shards"][str(s)]["file"] for s in wanted if str(s) in manifest["shards"]]
+
+    if manifest["format"] == "parquet":
+        tables = []
+        for path in paths:
+            table = pq.ParquetFile(path).read(columns=columns)
+            value_set = pa.array(list(keys), type=table.schema.field(key).type)
+            tables.append(table.filter(pc.is_in(table[key], value_set=value_set)))
+        if tables:
+            # uma conversão para pandas só, no fim
+            return pa.concat_tables(tables).to_pandas()
+        return pd.DataFrame(columns=columns or [key])
+
+    parts = []
+    for path in paths:
+        part = pd.read_csv(path, usecols=columns)
+        parts.append(part[part[key].isin(keys)])
+    if not parts:
+        return pd.DataFrame(columns=columns or [key])
+    return pd.concat(parts, ignore_index=True)
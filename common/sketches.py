@@ -0,0 +1,294 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# percentis exibidos nos EDAs e dashboards
+PERCENTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+
+def data_seed(values, *salt) -> int:
+    """Semente determinística tirada dos próprios valores (+ `salt`, ex.: a chave do grupo).
+
+    Sketches de blocos/grupos diferentes sorteiam moedas diferentes (erros
+    independentes ao somar), e a mesma entrada dá sempre o mesmo resultado.
+    """
+    h = hashlib.blake2b(np.ascontiguousarray(values, dtype="float64").tobytes(), digest_size=8)
+    for s in salt:
+        h.update(repr(s).encode("utf-8"))
+    return int.from_bytes(h.digest(), "little")
+
+
+class StreamingHistogram:
+    """Histograma que pode ser preenchido bloco a bloco e somado entre processos.
+
+    Guarda contagens por bucket de largura `resolution` (só os buckets
+    ocupados) + mínimo/máximo exatos; as faixas finais são escolhidas só no
+    fim (`histogram`). Com dados inteiros e resolution=1 o resultado é igual
+    ao np.histogram da coluna inteira. Passando de `max_buckets`, a largura
+    dobra (buckets vizinhos se juntam) e a memória fica limitada.
+    """
+
+    def __init__(self, resolution: float = 1.0, max_buckets: int = 4096):
+        self.resolution = float(resolution)
+        self.base_resolution = self.resolution
+        self.max_buckets = max_buckets
+        self.keys = np.array([], dtype=np.int64)
+        self.counts = np.array([], dtype=np.int64)
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values) -> None:
+        v = np.asarray(values, dtype="float64")
+        v = v[~np.isnan(v)]
+        if len(v) == 0:
+            return
+        self.count += len(v)
+        self.min = min(self.min, float(v.min()))
+        self.max = max(self.max, float(v.max()))
+        keys, counts = np.unique(np.floor(v / self.resolution).astype(np.int64), return_counts=True)
+        self._add(keys, counts)
+
+    def _add(self, keys: np.ndarray, counts: np.ndarray) -> None:
+        keys, inverse = np.unique(np.r_[self.keys, keys], return_inverse=True)
+        self.keys = keys
+        self.counts = np.bincount(inverse, np.r_[self.counts, counts]).astype(np.int64)
+        while len(self.keys) > self.max_buckets:
+            self._coarsen()
+
+    def _coarsen(self) -> None:
+        # dobra a largura: buckets 2k e 2k+1 viram o bucket k
+        self.resolution *= 2
+        keys, inverse = np.unique(np.floor_divide(self.keys, 2), return_inverse=True)
+        self.keys = keys
+        self.counts = np.bincount(inverse, self.counts).astype(np.int64)
+
+    def merge(self, other: "StreamingHistogram") -> "StreamingHistogram":
+        """Novo histograma com as contagens dos dois (resoluções precisam diferir por potência de 2)."""
+        a, b = self.copy(), other.copy()
+        while a.resolution < b.resolution:
+            a._coarsen()
+        while b.resolution < a.resolution:
+            b._coarsen()
+        if a.resolution != b.resolution:
+            raise ValueError(f"Resoluções incompatíveis: {self.resolution} e {other.resolution}")
+
+        a.max_buckets = max(a.max_buckets, b.max_buckets)
+        a.base_resolution = min(a.base_resolution, b.base_resolution)
+        a.count += b.count
+        a.min = min(a.min, b.min)
+        a.max = max(a.max, b.max)
+        a._add(b.keys, b.counts)
+        return a
+
+    def copy(self) -> "StreamingHistogram":
+        out = StreamingHistogram(self.resolution, self.max_buckets)
+        out.base_resolution = self.base_resolution
+        out.keys, out.counts = self.keys.copy(), self.counts.copy()
+        out.count, out.min, out.max = self.count, self.min, self.max
+        return out
+
+    def histogram(self, bins=15, range: tuple | None = None):
+        """(contagens, bordas) como np.histogram: `bins` = número de faixas iguais ou bordas explícitas."""
+        if np.ndim(bins) == 0:
+            lo, hi = range if range is not None else (self.min, self.max)
+            if self.count == 0 and range is None:
+                lo, hi = 0.0, 1.0
+            edges = np.linspace(lo, hi, int(bins) + 1)
+        else:
+            edges = np.asarray(bins, dtype="float64")
+        if self.resolution == self.base_resolution:
+            # valor representativo do bucket, sem sair do intervalo realmente observado
+            values = np.clip(self.keys * self.resolution, self.min, self.max)
+            counts, edges = np.histogram(values, bins=edges, weights=self.counts)
+            return counts.astype(np.int64), edges
+
+        # buckets já foram juntados: cada um é espalhado por igual na sua largura
+        lo = np.clip(self.keys * self.resolution, self.min, self.max)
+        hi = np.clip((self.keys + 1) * self.resolution, self.min, self.max)
+        width = np.maximum(hi - lo, np.finfo("float64").tiny)
+        cdf = np.clip((edges[:, None] - lo) / width, 0, 1) @ self.counts
+        return np.round(np.diff(cdf)).astype(np.int64), edges
+
+    # ==============================
+    # Serialização (artefatos JSON / parciais por mês)
+    # ==============================
+    def to_dict(self) -> dict:
+        return {
+            "resolution": self.resolution,
+            "base_resolution": self.base_resolution,
+            "max_buckets": self.max_buckets,
+            "count": int(self.count),
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "keys": self.keys.tolist(),
+            "counts": self.counts.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StreamingHistogram":
+        out = cls(data["resolution"], data["max_buckets"])
+        out.base_resolution = data["base_resolution"]
+        out.keys = np.asarray(data["keys"], dtype=np.int64)
+        out.counts = np.asarray(data["counts"], dtype=np.int64)
+        out.count = data["count"]
+        out.min = data["min"] if data["min"] is not None else np.inf
+        out.max = data["max"] if data["max"] is not None else -np.inf
+        return out
+
+
+class QuantileSketch:
+    """Sketch de quantis estilo KLL: memória limitada, pode ser somado entre blocos/processos.
+
+    Os valores entram no nível 0; quando um nível passa da capacidade, ele é
+    ordenado e metade dos itens (posições pares ou ímpares, sorteadas) sobe
+    para o nível seguinte valendo o dobro. Guarda O(k · log(n/k)) valores.
+
+    Erro: com k=200 o rank de um quantil fica a ~1% do rank verdadeiro
+    (ex.: o "p90" está entre os ranks 89% e 91%); medido em
+    benchmarks/bench_quantiles.py. Mínimo e máximo são exatos.
+
+    Sem `seed`, a semente sai dos valores do primeiro update (data_seed):
+    sketches de blocos diferentes não repetem os mesmos sorteios.
+    """
+
+    def __init__(self, k: int = 200, seed: int | None = None):
+        self.k = k
+        self.seed = seed
+        self.rng = None if seed is None else np.random.default_rng(seed)
+        self.levels = [np.array([])]
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _capacity(self, level: int) -> int:
+        # níveis mais baixos (itens de peso menor) ficam com buffers menores
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values) -> None:
+        v = np.asarray(values, dtype="float64")
+        v = v[~np.isnan(v)]
+        if len(v) == 0:
+            return
+        if self.rng is None:
+            self.seed = data_seed(v)
+            self.rng = np.random.default_rng(self.seed)
+        self.n += len(v)
+        self.min = min(self.min, float(v.min()))
+        self.max = max(self.max, float(v.max()))
+        self.levels[0] = np.r_[self.levels[0], v]
+        self._compress()
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            buf = self.levels[level]
+            if len(buf) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.array([]))
+
+            buf = np.sort(buf)
+            # com tamanho ímpar, um item fica no nível (não é compactado)
+            stay, buf = (buf[-1:], buf[:-1]) if len(buf) % 2 else (buf[:0], buf)
+            promoted = buf[self.rng.integers(2)::2]
+            self.levels[level] = stay
+            self.levels[level + 1] = np.r_[self.levels[level + 1], promoted]
+            # capacidades mudam quando surge um nível novo: recomeça do início
+            level = 0
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if self.rng is None:  # vazio: nada a juntar deste lado
+            return other.copy()
+        out = self.copy()
+        out.k = max(self.k, other.k)
+        while len(out.levels) < len(other.levels):
+            out.levels.append(np.array([]))
+        for h, buf in enumerate(other.levels):
+            out.levels[h] = np.r_[out.levels[h], buf]
+        out.n += other.n
+        out.min = min(out.min, other.min)
+        out.max = max(out.max, other.max)
+        out._compress()
+        return out
+
+    def copy(self) -> "QuantileSketch":
+        out = QuantileSketch(self.k, self.seed)
+        if self.rng is not None:
+            out.rng.bit_generator.state = self.rng.bit_generator.state
+        out.levels = [buf.copy() for buf in self.levels]
+        out.n, out.min, out.max = self.n, self.min, self.max
+        return out
+
+    def quantiles(self, qs) -> np.ndarray:
+        """Quantis aproximados (qs em [0, 1]); NaN se o sketch estiver vazio."""
+        qs = np.atleast_1d(np.asarray(qs, dtype="float64"))
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(buf), 2.0 ** h) for h, buf in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, cum = values[order], np.cumsum(weights[order])
+
+        pos = np.searchsorted(cum, qs * cum[-1], side="left").clip(0, len(values) - 1)
+        out = values[pos]
+        out[qs <= 0] = self.min
+        out[qs >= 1] = self.max
+        return out
+
+    def quantile(self, q: float) -> float:
+        return float(self.quantiles([q])[0])
+
+    # ==============================
+    # Serialização (artefatos JSON / parciais por mês)
+    # ==============================
+    def to_dict(self) -> dict:
+        return {
+            "k": self.k,
+            "seed": self.seed,
+            "n": int(self.n),
+            "min": self.min if self.n else None,
+            "max": self.max if self.n else None,
+            "levels": [buf.tolist() for buf in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        out = cls(data["k"], data["seed"])
+        out.levels = [np.asarray(buf, dtype="float64") for buf in data["levels"]]
+        out.n = data["n"]
+        out.min = data["min"] if data["min"] is not None else np.inf
+        out.max = data["max"] if data["max"] is not None else -np.inf
+        return out
+
+
+# ==============================
+# Sketches por grupo (ex.: um por member_casual ou por dia da semana)
+# ==============================
+def sketch_groups(values: pd.Series, groups: pd.Series, k: int = 200) -> dict:
+    """Um QuantileSketch por valor de `groups` (grupos vazios/ausentes ficam de fora).
+
+    Cada grupo de cada bloco tem semente própria (valores + chave do grupo).
+    """
+    out = {}
+    for key, part in values.groupby(groups, observed=True):
+        v = part.to_numpy(dtype="float64", na_value=np.nan)
+        sketch = QuantileSketch(k, seed=data_seed(v, key))
+        sketch.update(v)
+        out[key] = sketch
+    return out
+
+
+def merge_groups(a: dict, b: dict) -> dict:
+    """Soma dois dicionários grupo → sketch/histograma (qualquer objeto com .merge)."""
+    return {key: a[key].merge(b[key]) if key in a and key in b else a.get(key, b.get(key))
+            for key in a.keys() | b.keys()}
+
+
+def quantile_table(sketches: dict, percentiles: dict = PERCENTILES) -> pd.DataFrame:
+    """DataFrame grupo × percentil (colunas p50/p90/p99)."""
+    rows = {key: sketch.quantiles(list(percentiles.values())) for key, sketch in sketches.items()}
+    return pd.DataFrame.from_dict(rows, orient="index", columns=list(percentiles))
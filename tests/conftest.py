@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+# raiz (pasta common/) e os src/ dos estudos de caso, como os scripts fazem com sys.path
+ROOT = Path(__file__).resolve().parents[1]
+for case in ["Estudo_de_Caso_01", "Estudo_de_Caso_02", "Estudo_de_caso_03"]:
+    sys.path.insert(0, str(ROOT / case / "src"))
+sys.path.insert(0, str(ROOT))
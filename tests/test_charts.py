@@ -0,0 +1,30 @@
+import pytest
+
+from common.charts import ChartJob, hash_path, render_charts
+
+
+def bar_chart(values):
+    from common.charts import pyplot
+
+    fig, ax = pyplot().subplots(figsize=(2, 2))
+    ax.bar(range(len(values)), values)
+    return fig
+
+
+def broken_chart(values):
+    raise RuntimeError("desenho interrompido")
+
+
+def test_unchanged_chart_is_skipped(tmp_path):
+    job = ChartJob(bar_chart, [1, 2, 3], tmp_path / "bars.png")
+    assert render_charts([job], workers=1) == {"bars.png": "gerado"}
+    assert hash_path(job.path).exists()
+    assert render_charts([job], workers=1) == {"bars.png": "sem mudança"}
+    assert render_charts([ChartJob(bar_chart, [3, 2, 1], job.path)], workers=1) == {"bars.png": "gerado"}
+
+
+def test_failed_render_leaves_no_png_or_hash(tmp_path):
+    job = ChartJob(broken_chart, [1, 2, 3], tmp_path / "bars.png")
+    with pytest.raises(RuntimeError):
+        render_charts([job], workers=1)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from common.columnar_cache import cache_path, has_columns, is_fresh, iter_chunks, read_table, write_table
+
+# sem pyarrow não há cache: tudo vem do CSV
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def csv(tmp_path):
+    path = tmp_path / "daily.csv"
+    write_table(pd.DataFrame({"Id": [1, 1, 2], "TotalSteps": [100, 200, 300]}), path)
+    return path
+
+
+def test_fresh_cache_is_used(csv):
+    assert cache_path(csv).exists() and is_fresh(csv)
+    # CSV apagado: o cache é a única fonte
+    csv.unlink()
+    assert read_table(csv)["TotalSteps"].tolist() == [100, 200, 300]
+
+
+def test_stale_cache_falls_back_to_csv(csv):
+    pd.DataFrame({"Id": [3], "TotalSteps": [12345]}).to_csv(csv, index=False)
+    assert not is_fresh(csv)
+    assert read_table(csv)["TotalSteps"].tolist() == [12345]
+    assert [len(c) for c in iter_chunks(csv, chunksize=2)] == [1]
+
+
+def test_cache_without_source_meta_is_stale(csv):
+    pd.read_csv(csv).to_parquet(cache_path(csv))
+    assert not is_fresh(csv)
+
+
+def test_missing_columns_fall_back_to_csv(csv):
+    import pyarrow.parquet as pq
+
+    # cache atualizado, mas sem uma das colunas do CSV
+    write_table(pd.read_csv(csv).assign(Calories=[1, 2, 3]), csv)
+    pq.write_table(pq.read_table(cache_path(csv)).drop(["Calories"]), cache_path(csv))
+    assert has_columns(csv, ["Id", "TotalSteps"])
+    assert not has_columns(csv, ["Calories"])
+    assert read_table(csv, columns=["Calories"])["Calories"].tolist() == [1, 2, 3]
+
+
+def test_projected_cache(csv, tmp_path):
+    projected = tmp_path / "daily_ids.parquet"
+    assert not has_columns(csv, ["Id"], projected)
+    assert read_table(csv, columns=["Id"], cache=projected)["Id"].tolist() == [1, 1, 2]
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fitbit_index import (
+    build_user_index,
+    index_path,
+    merge_join,
+    save_user_index,
+    user_day_rows,
+    user_rows,
+)
+from fitbit_shards import load_daily
+
+
+@pytest.fixture
+def daily() -> pd.DataFrame:
+    # ordenado por (Id, dia), como o 01_process grava
+    rng = np.random.default_rng(0)
+    ids = np.repeat([11, 22, 33, 44], 10)
+    dates = np.tile(pd.date_range("2016-04-12", periods=10), 4)
+    return pd.DataFrame({"Id": ids, "ActivityDate": dates, "TotalSteps": rng.integers(0, 20_000, len(ids))})
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_merge_join_matches_pandas(seed):
+    rng = np.random.default_rng(seed)
+    left = np.sort(rng.integers(0, 500, 2000))
+    right = np.unique(rng.integers(0, 500, 300))
+    values = rng.normal(size=len(right))
+
+    expected = pd.merge(
+        pd.DataFrame({"key": left}), pd.DataFrame({"key": right, "value": values}), on="key", how="left",
+    )["value"].to_numpy()
+    np.testing.assert_array_equal(merge_join(left, right, values), expected)
+
+
+def test_merge_join_empty_sides():
+    assert np.isnan(merge_join(np.array([1, 2]), np.array([], dtype=np.int64), np.array([]))).all()
+    assert len(merge_join(np.array([], dtype=np.int64), np.array([1]), np.array([1.0]))) == 0
+
+
+def test_merge_join_rejects_unsorted_keys():
+    with pytest.raises(ValueError):
+        merge_join(np.array([2, 1]), np.array([1, 2]), np.array([1.0, 2.0]))
+    with pytest.raises(ValueError):
+        merge_join(np.array([1, 2]), np.array([1, 1]), np.array([1.0, 2.0]))
+
+
+def test_user_rows_match_isin(daily):
+    index = build_user_index(daily)
+    rows = user_rows(index, [33, 11, 99])
+    np.testing.assert_array_equal(rows, np.flatnonzero(daily["Id"].isin([11, 33])))
+    assert len(user_rows(index, [99])) == 0
+
+
+def test_user_day_rows(daily):
+    index = build_user_index(daily)
+    rows = user_day_rows(daily, index, 22, "2016-04-15")
+    expected = (daily["Id"] == 22) & (daily["ActivityDate"] == "2016-04-15")
+    np.testing.assert_array_equal(rows, np.flatnonzero(expected))
+    assert len(user_day_rows(daily, index, 22, "2017-01-01")) == 0
+
+
+def test_load_daily_uses_index_without_shards(daily, tmp_path):
+    csv = tmp_path / "fitbit_daily_clean.csv"
+    daily.to_csv(csv, index=False)
+    save_user_index(build_user_index(daily), csv)
+    assert index_path(csv).exists()
+
+    out = load_daily(csv, users=[44, 22])
+    assert out["Id"].unique().tolist() == [22, 44]
+    assert out["TotalSteps"].tolist() == daily.loc[daily["Id"].isin([22, 44]), "TotalSteps"].tolist()
@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+from happiness_io import DatasetError, load_years
+
+
+def write_year(path, rows: dict) -> None:
+    pd.DataFrame(rows).to_csv(path, sep=";", index=False)
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    write_year(tmp_path / "2015.csv", {
+        "Country": ["A", "B"], "Happiness Score": [7.5, 6.1], "Trust (Government Corruption)": [0.4, 0.2],
+        "Standard Error": [0.03, 0.04],
+    })
+    # um valor solto numa coluna numérica e uma coluna extra de texto em outro ano
+    write_year(tmp_path / "2016.csv", {
+        "Country": ["A", "B"], "Happiness Score": [7.4, 6.0], "Trust (Government Corruption)": ["0.41", "n.a."],
+        "Standard Error": ["0.02", "n.a."],
+    })
+    return tmp_path
+
+
+@pytest.mark.parametrize("project", [True, False])
+def test_bad_numeric_cell_becomes_nan(raw_dir, project):
+    df = load_years(sorted(raw_dir.glob("*.csv")), workers=1, project=project)
+    assert df["year"].tolist() == [2015, 2015, 2016, 2016]
+    assert df["corruption"].tolist()[:3] == [0.4, 0.2, 0.41]
+    assert pd.isna(df["corruption"].iloc[3])
+
+
+def test_bad_file_name_is_reported(raw_dir):
+    write_year(raw_dir / "extra.csv", {"Country": ["A"], "Happiness Score": [7.0]})
+    with pytest.raises(DatasetError, match="extra.csv"):
+        load_years(sorted(raw_dir.glob("*.csv")), workers=1)
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from agg_store import load_aggregates
+
+# campos que só dizem de onde o artefato veio
+SOURCE_KEYS = ["source", "source_size", "source_mtime_ns", "months"]
+DIVVY_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@pytest.fixture
+def case_dir(tmp_path, monkeypatch):
+    """Um mês da Divvy em data_raw/ e o mesmo mês já limpo em outputs/trips_2025_clean.csv."""
+    rng = np.random.default_rng(0)
+    n = 5000
+    start = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 31 * 86400, n), unit="s")
+    end = start + pd.to_timedelta(rng.gamma(2.0, 450.0, n).round(), unit="s")
+    raw = pd.DataFrame({
+        "ride_id": np.arange(n),
+        "rideable_type": "classic_bike",
+        "started_at": start.strftime(DIVVY_FORMAT),
+        "ended_at": end.strftime(DIVVY_FORMAT) + ".000",
+        "member_casual": rng.choice(["member", "casual"], n, p=[0.65, 0.35]),
+    })
+    (tmp_path / "data_raw").mkdir()
+    raw.to_csv(tmp_path / "data_raw" / "202501-divvy-tripdata.csv", index=False)
+
+    clean = raw.assign(ride_length_sec=(end - start).total_seconds(), day_of_week=start.day_name())
+    (tmp_path / "outputs").mkdir()
+    clean.to_csv(tmp_path / "outputs" / "trips_2025_clean.csv", index=False)
+
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def without_source(agg: dict) -> dict:
+    return {key: value for key, value in agg.items() if key not in SOURCE_KEYS and key != "duration_sum"}
+
+
+def test_clean_and_monthly_sources_agree(case_dir):
+    clean = load_aggregates(mode="clean")
+    monthly = load_aggregates(mode="monthly")
+
+    assert clean["source"] != monthly["source"]
+    assert without_source(monthly) == without_source(clean)
+    for member, total in clean["duration_sum"].items():
+        assert monthly["duration_sum"][member] == pytest.approx(total)
+
+
+def test_monthly_without_files_fails(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        load_aggregates(mode="monthly")
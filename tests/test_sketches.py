@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from common.density import DensityGrid
+from common.sketches import QuantileSketch, StreamingHistogram
+
+# percentis dos relatórios e erro de rank aceito com k=200 (os mesmos do benchmarks/bench_quantiles.py)
+QS = [0.5, 0.9, 0.99]
+RANK_ERROR_BOUND = 0.01
+
+
+def chunks(values, parts: int):
+    return np.array_split(values, parts)
+
+
+def rank_error(sketch: QuantileSketch, exact: np.ndarray, qs) -> float:
+    ranks = np.searchsorted(exact, sketch.quantiles(qs), side="right") / len(exact)
+    return float(np.max(np.abs(ranks - np.asarray(qs))))
+
+
+# ==============================
+# StreamingHistogram
+# ==============================
+@pytest.mark.parametrize("max_buckets", [4096, 64])
+def test_histogram_merge_matches_single_pass(max_buckets):
+    values = np.random.default_rng(0).integers(0, 3000, 50_000).astype("float64")
+    single = StreamingHistogram(1.0, max_buckets)
+    single.update(values)
+
+    merged = StreamingHistogram(1.0, max_buckets)
+    for part in chunks(values, 7):
+        hist = StreamingHistogram(1.0, max_buckets)
+        hist.update(part)
+        merged = merged.merge(hist)
+
+    assert merged.resolution == single.resolution
+    np.testing.assert_array_equal(merged.keys, single.keys)
+    np.testing.assert_array_equal(merged.counts, single.counts)
+    assert (merged.count, merged.min, merged.max) == (single.count, single.min, single.max)
+
+
+def test_histogram_matches_numpy_on_integers():
+    values = np.random.default_rng(1).integers(0, 500, 10_000).astype("float64")
+    hist = StreamingHistogram(1.0)
+    for part in chunks(values, 4):
+        hist.update(part)
+
+    counts, edges = hist.histogram(15)
+    expected, expected_edges = np.histogram(values, bins=15)
+    np.testing.assert_array_equal(counts, expected)
+    np.testing.assert_allclose(edges, expected_edges)
+
+
+def test_histogram_round_trip():
+    hist = StreamingHistogram(1.0, 32)
+    hist.update(np.arange(1000.0))
+    again = StreamingHistogram.from_dict(hist.to_dict())
+    np.testing.assert_array_equal(again.histogram(10)[0], hist.histogram(10)[0])
+
+
+# ==============================
+# QuantileSketch
+# ==============================
+def test_quantile_merge_within_error_bound():
+    values = np.random.default_rng(2).lognormal(6, 1, 200_000)
+
+    merged = QuantileSketch()
+    for part in chunks(values, 16):
+        sketch = QuantileSketch()
+        sketch.update(part)
+        merged = merged.merge(sketch)
+
+    exact = np.sort(values)
+    assert merged.n == len(values)
+    assert (merged.min, merged.max) == (exact[0], exact[-1])
+    assert rank_error(merged, exact, QS) <= RANK_ERROR_BOUND
+    assert merged.quantile(0) == exact[0] and merged.quantile(1) == exact[-1]
+
+
+def test_quantile_sketch_is_deterministic():
+    values = np.random.default_rng(3).normal(size=20_000)
+    a, b = QuantileSketch(), QuantileSketch()
+    a.update(values)
+    b.update(values)
+    np.testing.assert_array_equal(a.quantiles([0.5, 0.9]), b.quantiles([0.5, 0.9]))
+
+
+def test_quantile_round_trip_and_empty():
+    sketch = QuantileSketch()
+    sketch.update(np.arange(5000.0))
+    again = QuantileSketch.from_dict(sketch.to_dict())
+    np.testing.assert_array_equal(again.quantiles([0.1, 0.5]), sketch.quantiles([0.1, 0.5]))
+    assert np.isnan(QuantileSketch().quantile(0.5))
+    assert QuantileSketch().merge(sketch).n == sketch.n
+
+
+# ==============================
+# DensityGrid
+# ==============================
+@pytest.mark.parametrize("max_cells", [250_000, 500])
+def test_density_merge_matches_single_pass(max_cells):
+    rng = np.random.default_rng(4)
+    x = rng.gamma(2.5, 3000, 40_000)
+    y = 1500 + 0.06 * x + rng.normal(0, 350, 40_000)
+    single = DensityGrid((100, 50), max_cells)
+    single.update(x, y)
+
+    merged = DensityGrid((100, 50), max_cells)
+    for px, py in zip(chunks(x, 5), chunks(y, 5)):
+        grid = DensityGrid((100, 50), max_cells)
+        grid.update(px, py)
+        merged = merged.merge(grid)
+
+    assert merged.step == single.step
+    np.testing.assert_array_equal(merged.keys, single.keys)
+    np.testing.assert_array_equal(merged.counts, single.counts)
+    assert merged.n == single.n == int(single.grid()[0].sum())
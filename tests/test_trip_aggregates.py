@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from common.schema import WEEKDAY_ORDER
+from trip_aggregates import QUANTILE_GROUPS, aggregate_frames, merge_aggregates
+
+# campos somados exatamente (os sketches de quantis têm sorteio e são checados à parte)
+EXACT_KEYS = ["rows", "rides", "duration_count", "hour_member", "weekday_member", "duration_hist"]
+
+
+@pytest.fixture
+def trips() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 30_000
+    return pd.DataFrame({
+        "member_casual": rng.choice(["member", "casual"], n, p=[0.65, 0.35]),
+        "ride_length_sec": rng.gamma(2.0, 450.0, n).round().astype("float32"),
+        "day_of_week": rng.choice(WEEKDAY_ORDER, n),
+        "hour": rng.integers(0, 24, n).astype("int8"),
+    })
+
+
+def split(df: pd.DataFrame, parts: int) -> list:
+    bounds = np.linspace(0, len(df), parts + 1).astype(int)
+    return [df.iloc[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def normalized(agg: dict) -> dict:
+    # a ordem dos registros depende da ordem em que as chaves apareceram nos blocos
+    out = {key: agg[key] for key in EXACT_KEYS}
+    out["hour_member"] = sorted(agg["hour_member"])
+    out["weekday_member"] = sorted(agg["weekday_member"])
+    return out
+
+
+def test_fold_matches_single_pass(trips):
+    single = aggregate_frames([trips])
+    folded = aggregate_frames(split(trips, 6))
+
+    assert normalized(folded) == normalized(single)
+    for member, total in single["duration_sum"].items():
+        assert folded["duration_sum"][member] == pytest.approx(total)
+    for by in QUANTILE_GROUPS:
+        for key, sketch in single["duration_sketch"][by].items():
+            part = folded["duration_sketch"][by][key]
+            assert (part["n"], part["min"], part["max"]) == (sketch["n"], sketch["min"], sketch["max"])
+
+
+def test_merge_aggregates_matches_fold(trips):
+    parts = split(trips, 3)
+    merged = merge_aggregates([aggregate_frames([part]) for part in parts])
+    assert normalized(merged) == normalized(aggregate_frames(parts))
+
+
+def test_empty_input():
+    agg = aggregate_frames([])
+    assert agg["rows"] == 0 and agg["rides"] == {}